@@ -0,0 +1,118 @@
+"""
+    `benchmarks/bench_columnar.py`
+
+    Loading, aggregation and retrieval time of `ColumnarList` against `List` on a
+    synthetic anime list, with the cached counters, summaries, groupings,
+    membership sets, status counts and row masks cleared before every run. The
+    objects `ColumnarList` materializes on its first retrieval are kept, their
+    cost is measured on its own by `first get_list`.
+    Run from the repository root:
+
+        python -m benchmarks.bench_columnar [--size 50000] [--repeat 5]
+"""
+
+from contextlib import redirect_stdout
+from io import StringIO
+from tempfile import TemporaryDirectory
+
+from benchmarks.synthetic import write_exports
+from src.classes.columnar_list import ColumnarList
+from src.classes.list import List
+from src.loader import XMLStreamLoader
+
+import argparse
+import time
+import tracemalloc
+
+
+def get_anime_list(data_dir: str, list_class: type) -> tuple:
+    """ Load a synthetic anime list into a list class, with the load time and the traced peak memory of a first untimed load """
+    loader = XMLStreamLoader(data_dir)
+    loader.list_class = list_class
+    loader.create_document()
+
+    with redirect_stdout(StringIO()):
+        tracemalloc.start()
+        loader.get_anime_list_object(include_current=True, include_dropped=True)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+        start = time.perf_counter()
+        entry_list = loader.get_anime_list_object(include_current=True, include_dropped=True)
+        elapsed = time.perf_counter() - start
+
+    return entry_list, elapsed, peak
+
+
+def clear(entry_list: List) -> None:
+    """ Clear the cached statistics of a list """
+    entry_list.counters.clear()
+    entry_list.summaries.clear()
+    entry_list.groupings.clear()
+    entry_list.members.clear()
+    if isinstance(entry_list, ColumnarList):
+        entry_list.masks.clear()
+        entry_list.status_counts = None
+
+
+def first_get_list(entry_list: List) -> list:
+    """ Get the anime list, dropping the objects a columnar list materialized before """
+    if isinstance(entry_list, ColumnarList):
+        entry_list.rows = None
+    return entry_list.get_list()
+
+
+def measure(entry_list: List, function, repeat: int) -> float:
+    """ Measure the best time of an operation, clearing the cached statistics before every run """
+    elapsed = list()
+
+    for _ in range(repeat):
+        clear(entry_list)
+        start = time.perf_counter()
+        function(entry_list)
+        elapsed.append(time.perf_counter() - start)
+
+    return min(elapsed)
+
+
+OPERATIONS = {
+    'count': lambda i: i.count('completed'),
+    'first get_list': first_get_list,
+    'get_list': lambda i: i.get_list(),
+    'get_scores': lambda i: i.get_scores(),
+    'get_counts': lambda i: i.get_counts('series_type'),
+    'summary': lambda i: i.summary(),
+    'get_grouped_list': lambda i: i.get_grouped_list(),
+    'get_grouped_list (disassembled)': lambda i: i.get_grouped_list(disassemble_key=['my_score', 'series_title'])
+}
+
+
+def main() -> None:
+    """ Main function """
+    parser = argparse.ArgumentParser(description='Benchmark ColumnarList against List.')
+    parser.add_argument('--size', type=int, default=50000, help='anime entry count')
+    parser.add_argument('--repeat', type=int, default=5, help='timed runs per operation, the best is kept')
+    args = parser.parse_args()
+
+    with TemporaryDirectory() as directory:
+        with redirect_stdout(StringIO()):
+            data_dir = write_exports(directory, args.size, manga_count=0)['data_dir']
+        entry_list, list_load, list_peak = get_anime_list(data_dir, List)
+        columnar_list, columnar_load, columnar_peak = get_anime_list(data_dir, ColumnarList)
+
+    print('{:<34}{:>12}{:>16}{:>10}'.format('Operation', 'List (ms)', 'Columnar (ms)', 'Speedup'))
+    print('{:<34}{:>12.2f}{:>16.2f}{:>9.1f}x'.format('load', 1000 * list_load, 1000 * columnar_load, list_load / columnar_load))
+    print('{:<34}{:>12.0f}{:>16.0f}{:>9.1f}x'.format('load peak memory (KB)', list_peak / 1024, columnar_peak / 1024, list_peak / columnar_peak))
+    for name, function in OPERATIONS.items():
+        list_elapsed = measure(entry_list, function, args.repeat)
+        columnar_elapsed = measure(columnar_list, function, args.repeat)
+        print('{:<34}{:>12.2f}{:>16.2f}{:>9.1f}x'.format(
+            name,
+            1000 * list_elapsed,
+            1000 * columnar_elapsed,
+            list_elapsed / columnar_elapsed if columnar_elapsed > 0 else 0
+        ))
+
+
+if __name__ == '__main__':
+    main()
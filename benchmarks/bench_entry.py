@@ -0,0 +1,131 @@
+"""
+    `benchmarks/bench_entry.py`
+
+    Per-entry memory and construction time of the slotted entry classes against
+    the former dictionary-backed ones. Run from the repository root:
+
+        python -m benchmarks.bench_entry [entry_count]
+"""
+
+from src.classes.entry import Anime
+
+from timeit import timeit
+
+import sys
+import tracemalloc
+
+
+class LegacyEntry:
+    """ Dictionary-backed entry class, as before the slotted entry classes """
+    def __init__(
+        self,
+        my_id=None,
+        my_start_date=None,
+        my_finish_date=None,
+        my_score=None,
+        my_storage=None,
+        my_status=None,
+        my_comments=None,
+        my_tags=None,
+        update_on_import=None
+    ):
+        self.my_id = my_id
+        self.my_start_date = my_start_date
+        self.my_finish_date = my_finish_date
+        self.my_score = my_score
+        self.my_storage = my_storage
+        self.my_status = my_status
+        self.my_comments = my_comments
+        self.my_tags = my_tags
+        self.update_on_import = update_on_import
+
+
+class LegacyAnime(LegacyEntry):
+    """ Dictionary-backed anime class, as before the slotted entry classes """
+    def __init__(
+        self,
+        series_animedb_id=None,
+        series_title=None,
+        series_type=None,
+        series_episodes=None,
+        my_id=None,
+        my_watched_episodes=None,
+        my_start_date=None,
+        my_finish_date=None,
+        my_rated=None,
+        my_score=None,
+        my_dvd=None,
+        my_storage=None,
+        my_status=None,
+        my_comments=None,
+        my_times_watched=None,
+        my_rewatch_value=None,
+        my_tags=None,
+        my_rewatching=None,
+        my_rewatching_ep=None,
+        update_on_import=None
+    ):
+        super().__init__(
+            my_id=my_id,
+            my_start_date=my_start_date,
+            my_finish_date=my_finish_date,
+            my_score=my_score,
+            my_storage=my_storage,
+            my_status=my_status,
+            my_comments=my_comments,
+            my_tags=my_tags,
+            update_on_import=update_on_import
+        )
+        self.series_animedb_id = series_animedb_id
+        self.series_title = series_title
+        self.series_type = series_type
+        self.series_episodes = series_episodes
+        self.my_watched_episodes = my_watched_episodes
+        self.my_rated = my_rated
+        self.my_dvd = my_dvd
+        self.my_times_watched = my_times_watched
+        self.my_rewatch_value = my_rewatch_value
+        self.my_rewatching = my_rewatching
+        self.my_rewatching_ep = my_rewatching_ep
+
+
+def get_values(i: int) -> tuple:
+    """ Get plausible anime values in `Anime.FIELDS` order """
+    return (
+        i, 'Title {}'.format(i), 'TV', 12, i, 12, '2020-01-01', '2020-03-31', None, i % 11,
+        None, None, 'Completed', None, 0, None, 'action, drama', 0, 0, 0
+    )
+
+
+def measure(construct, rows: list) -> tuple:
+    """ Measure bytes per entry and microseconds per construction """
+    tracemalloc.start()
+    entries = [construct(i) for i in rows]
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    del entries
+    seconds = timeit(lambda: [construct(i) for i in rows], number=5) / 5
+
+    return size / len(rows), seconds / len(rows) * 10 ** 6
+
+
+def main() -> None:
+    """ Main function """
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    rows = [get_values(i) for i in range(count)]
+    keyword_rows = [dict(zip(Anime.FIELDS, i)) for i in rows]
+
+    print('{:<14}{:>16}{:>20}'.format('Class', 'Bytes/Entry', 'Construction (us)'))
+
+    # Legacy: Keyword construction, as the loaders used
+    size, duration = measure(lambda i: LegacyAnime(**i), keyword_rows)
+    print('{:<14}{:>16.1f}{:>20.3f}'.format('Before (dict)', size, duration))
+
+    # Slotted: Positional construction
+    size, duration = measure(Anime.from_values, rows)
+    print('{:<14}{:>16.1f}{:>20.3f}'.format('After (slots)', size, duration))
+
+
+if __name__ == '__main__':
+    main()
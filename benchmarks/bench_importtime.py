@@ -0,0 +1,62 @@
+"""
+    `benchmarks/bench_importtime.py`
+
+    Cold-start import time of the entry points, measured with `python -X importtime`
+    in fresh interpreters, and a check that the heavy modules stay lazily imported.
+    Run from the repository root:
+
+        python -m benchmarks.bench_importtime [max_ms]
+
+    Exits with a non-zero status when a heavy module is imported eagerly, or when
+    the median import time of an entry point exceeds `max_ms`.
+"""
+
+from statistics import median
+
+import subprocess
+import sys
+
+
+ENTRY_POINTS = ('main', 'script_batch', 'script_server')
+LAZY_MODULES = ('pygal', 'requests', 'xml.dom.minidom')
+RUNS = 5
+
+
+def get_import_times(module: str) -> dict:
+    """ Get cumulative import time in microseconds of every module imported by a fresh interpreter """
+    process = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', 'import {}'.format(module)],
+        stderr=subprocess.PIPE,
+        universal_newlines=True,
+        check=True
+    )
+    times = dict()
+
+    for line in process.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        times[name.strip()] = int(cumulative)
+
+    return times
+
+
+def main() -> None:
+    """ Main function """
+    max_ms = float(sys.argv[1]) if len(sys.argv) > 1 else None
+    failed = False
+
+    print('{:<16}{:>14}{:>14}  {}'.format('Entry Point', 'Median (ms)', 'Max (ms)', 'Eager Heavy Modules'))
+    for entry_point in ENTRY_POINTS:
+        runs = [get_import_times(entry_point) for _ in range(RUNS)]
+        elapsed = [i[entry_point] / 1000 for i in runs]
+        eager = [i for i in LAZY_MODULES if i in runs[0]]
+
+        print('{:<16}{:>14.1f}{:>14.1f}  {}'.format(entry_point, median(elapsed), max(elapsed), ', '.join(eager) or '-'))
+        failed = failed or len(eager) > 0 or (max_ms is not None and median(elapsed) > max_ms)
+
+    sys.exit(int(failed))
+
+
+if __name__ == '__main__':
+    main()
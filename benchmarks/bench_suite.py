@@ -0,0 +1,176 @@
+"""
+    `benchmarks/bench_suite.py`
+
+    Time and peak memory of every stage, from parsing to rendering, on synthetic
+    exports of increasing size. Results are written as JSON so that runs of two
+    revisions can be compared. Run from the repository root:
+
+        python -m benchmarks.bench_suite [--sizes 100 1000 ...] [--output PATH] [--compare PATH]
+"""
+
+from contextlib import redirect_stdout
+from functools import partial
+from io import StringIO
+from tempfile import TemporaryDirectory
+
+from benchmarks.synthetic import compress_exports, write_exports
+from main import get_improper_tagged
+from settings import MANUAL_SORT_ANIME
+from src.loader import XMLLoader, XMLStreamLoader, APILoader
+from src.render import RenderMachine
+from src.stream import CHUNK_SIZE
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+
+
+class PageFileLoader(APILoader):
+    """ API loader reading `load.json` pages written by `benchmarks.synthetic` instead of fetching them """
+    def __init__(self, page_dir: str):
+        """ Constructor """
+        super().__init__('benchmark')
+        self.page_dir = page_dir
+
+    def fetch_page(self, list_type: str, offset: int) -> list:
+        """ Read a single page of the list, pages past the end are empty like the API's """
+        try:
+            with open(os.path.join(self.page_dir, '{}_{}.json'.format(list_type, offset)), 'rb') as file:
+                return self.decode_page(list_type, iter(partial(file.read, CHUNK_SIZE), b''))
+        except FileNotFoundError:
+            return list()
+
+
+def measure(function, repeat: int=1) -> dict:
+    """ Measure the peak traced memory of a stage in a first run, which also warms it up, then its best time over the runs """
+    elapsed = list()
+
+    with redirect_stdout(StringIO()):
+        tracemalloc.start()
+        function()
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+        for _ in range(repeat):
+            start = time.perf_counter()
+            function()
+            elapsed.append(time.perf_counter() - start)
+
+    return {'seconds': min(elapsed), 'peak_bytes': peak}
+
+
+def run_size(size: int, repeat: int=1, max_dom_entries: int=20000) -> dict:
+    """ Run every stage on synthetic exports of a size """
+    results = dict()
+
+    with TemporaryDirectory() as directory:
+        exports = write_exports(directory, size)
+        include = {'include_current': True, 'include_onhold': True, 'include_dropped': True, 'include_planned': True}
+
+        # Parsing: The DOM loader holds the whole document in memory, so it is skipped for large exports
+        if size <= max_dom_entries:
+            dom_loader = XMLLoader(exports['data_dir'])
+            results['xml_parse'] = measure(dom_loader.create_document, repeat=repeat)
+            results['xml_get_user_object'] = measure(lambda: dom_loader.get_user_object(**include), repeat=repeat)
+            del dom_loader
+
+        stream_loader = XMLStreamLoader(exports['data_dir'])
+        stream_loader.create_document()
+        results['stream_get_user_object'] = measure(lambda: stream_loader.get_user_object(**include), repeat=repeat)
+
+        gzip_loader = XMLStreamLoader(compress_exports(exports['data_dir'], os.path.join(directory, 'gzip', '')))
+        gzip_loader.create_document()
+        results['stream_gzip_get_user_object'] = measure(lambda: gzip_loader.get_user_object(**include), repeat=repeat)
+
+        api_loader = PageFileLoader(exports['page_dir'])
+        results['api_parse'] = measure(api_loader.create_document, repeat=repeat)
+        results['api_get_user_object'] = measure(lambda: api_loader.get_user_object(**include), repeat=repeat)
+
+        # Computing
+        with redirect_stdout(StringIO()):
+            user = stream_loader.get_user_object(**include)
+        grouped = user.anime_list.get_grouped_list(
+            group_by='series_type',
+            manual_sort=MANUAL_SORT_ANIME,
+            disassemble_key=['my_score', 'series_title']
+        )
+
+        def summary():
+            user.anime_list.counters.clear()
+            user.anime_list.summaries.clear()
+            user.anime_list.summary()
+
+        results['get_grouped_list'] = measure(lambda: user.anime_list.get_grouped_list(
+            group_by='series_type',
+            manual_sort=MANUAL_SORT_ANIME,
+            disassemble_key=['my_score', 'series_title']
+        ), repeat=repeat)
+        results['summary'] = measure(summary, repeat=repeat)
+        results['get_improper_tagged'] = measure(lambda: get_improper_tagged(user, list_type='anime'), repeat=repeat)
+
+        # Rendering
+        render_machine = RenderMachine(os.path.join(directory, 'charts'), show_notice=False)
+        os.makedirs(render_machine.chart_dir, exist_ok=True)
+        results['render_pie_chart'] = measure(lambda: render_machine.render_pie_chart(grouped, file_name='pie'), repeat=repeat)
+        results['render_bar_chart'] = measure(lambda: render_machine.render_bar_chart(user.anime_list.get_summed_scores(), file_name='bar'), repeat=repeat)
+        results['render_treemap'] = measure(lambda: render_machine.render_treemap(grouped, file_name='treemap', node_budget=500), repeat=repeat)
+
+    return results
+
+
+def get_revision() -> str:
+    """ Get the current git revision, None outside of a repository """
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, universal_newlines=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main() -> None:
+    """ Main function """
+    parser = argparse.ArgumentParser(description='Benchmark every stage on synthetic exports.')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100, 1000, 10000, 100000], help='anime entry counts, manga entry counts are a third')
+    parser.add_argument('--repeat', type=int, default=3, help='timed runs per stage, the best is kept')
+    parser.add_argument('--max-dom-entries', type=int, default=20000, help='largest size also parsed with the DOM loader')
+    parser.add_argument('--output', default='cache/benchmarks/results.json', help='JSON results path')
+    parser.add_argument('--compare', help='JSON results of an earlier run to compare against')
+    args = parser.parse_args()
+
+    report = {
+        'revision': get_revision(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'repeat': args.repeat,
+        'sizes': dict()
+    }
+    baseline = None
+    if args.compare is not None:
+        with open(args.compare, 'r') as file:
+            baseline = json.load(file)['sizes']
+
+    print('{:>8}  {:<30}{:>12}{:>14}{:>10}'.format('Entries', 'Stage', 'Time (ms)', 'Peak (KB)', 'Change'))
+    for size in args.sizes:
+        results = run_size(size, repeat=max(args.repeat, 1), max_dom_entries=args.max_dom_entries)
+        report['sizes'][str(size)] = results
+
+        for stage, result in results.items():
+            previous = (baseline or dict()).get(str(size), dict()).get(stage)
+            change = '{:+.1%}'.format(result['seconds'] / previous['seconds'] - 1) if previous else '-'
+            print('{:>8}  {:<30}{:>12.2f}{:>14.1f}{:>10}'.format(size, stage, 1000 * result['seconds'], result['peak_bytes'] / 1024, change))
+        sys.stdout.flush()
+
+    os.makedirs(os.path.dirname(args.output) or '.', exist_ok=True)
+    with open(args.output, 'w') as file:
+        json.dump(report, file, indent=4)
+    print('Results written to {}.'.format(args.output))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,57 @@
+"""
+    `benchmarks/bench_treemap.py`
+
+    SVG size and render time of the treemap against the entry count, with and
+    without a node budget. Run from the repository root:
+
+        python -m benchmarks.bench_treemap [node_budget]
+"""
+
+from src.render import RenderMachine
+
+from tempfile import TemporaryDirectory
+
+import os
+import random
+import sys
+import time
+
+
+ENTRY_COUNTS = (100, 1000, 5000, 20000)
+SERIES_TYPES = ('TV', 'Movie', 'OVA', 'ONA', 'Special', 'Music')
+
+
+def get_grouped_data(count: int) -> dict:
+    """ Get grouped [score, title] pairs shaped like `get_grouped_list` output """
+    random.seed(count)
+    data = {i: list() for i in SERIES_TYPES}
+
+    for i in range(count):
+        data[random.choice(SERIES_TYPES)].append([random.randint(1, 10), 'Title {}'.format(i)])
+
+    return data
+
+
+def main() -> None:
+    """ Main function """
+    node_budget = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+
+    print('{:>8}{:>14}{:>14}{:>14}{:>14}'.format('Entries', 'Full (KB)', 'Full (s)', 'Budget (KB)', 'Budget (s)'))
+    with TemporaryDirectory() as chart_dir:
+        render_machine = RenderMachine(chart_dir, show_notice=False)
+
+        for count in ENTRY_COUNTS:
+            data = get_grouped_data(count)
+            row = [count]
+
+            for file_name, budget in (('full', None), ('budget', node_budget)):
+                start = time.perf_counter()
+                render_machine.render_treemap(data, file_name=file_name, node_budget=budget)
+                elapsed = time.perf_counter() - start
+                row += [os.path.getsize(render_machine.get_file_path(file_name)) / 1024, elapsed]
+
+            print('{:>8}{:>14.1f}{:>14.3f}{:>14.1f}{:>14.3f}'.format(*row))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,176 @@
+"""
+    `benchmarks/synthetic.py`
+
+    Synthetic anime list and manga list exports, as XML exports and as `load.json`
+    page sets, reproducible from a seed. Run from the repository root:
+
+        python -m benchmarks.synthetic <directory> <anime_count> [manga_count]
+"""
+
+from src.constants import ANIMELIST, MANGALIST, ANIME_STATUS_LIST, MANGA_STATUS_LIST
+
+import gzip
+import json
+import os
+import random
+import shutil
+import sys
+
+
+SERIES_TYPES = ('TV', 'Movie', 'OVA', 'ONA', 'Special', 'Music')
+TAGS = (str(), 'action', 'action, drama', 'comedy', 'drama, romance', 'romance, slice of life')
+PAGE_SIZE = 300
+USER_ID = 1
+USER_NAME = 'benchmark'
+
+
+def get_entries(list_type: str, count: int, seed: int=0) -> list:
+    """ Get synthetic entries as dictionaries of the fields shared by both export formats """
+    generator = random.Random('{}-{}'.format(list_type, seed))
+    status_list = ANIME_STATUS_LIST if list_type == ANIMELIST else MANGA_STATUS_LIST
+    entries = list()
+
+    for i in range(count):
+        status = generator.choice(list(status_list))
+        finished = status == 2 or generator.random() < 0.2
+        entries.append({
+            'id': i + 1,
+            'title': '{} Title {}'.format(list_type.replace('list', str()).title(), i + 1),
+            'type': generator.choice(SERIES_TYPES),
+            'episodes': generator.randint(1, 52),
+            'progress': generator.randint(0, 12),
+            'start_date': (generator.randint(2005, 2023), generator.randint(1, 12), generator.randint(1, 28)),
+            'finish_date': (generator.randint(2005, 2023), generator.randint(1, 12), generator.randint(1, 28)) if finished else None,
+            'score': generator.randint(1, 10) if status != 6 and generator.random() < 0.8 else 0,
+            'status': status,
+            'tags': generator.choice(TAGS)
+        })
+
+    return entries
+
+
+def write_xml_export(data_dir: str, list_type: str, entries: list) -> str:
+    """ Write an XML export named like the ones downloaded from MyAnimeList.net """
+    path = os.path.join(data_dir, '{}_1600000000_-_{}.xml'.format(list_type, USER_ID))
+    status_list = ANIME_STATUS_LIST if list_type == ANIMELIST else MANGA_STATUS_LIST
+
+    with open(path, 'w', encoding='utf-8') as file:
+        file.write('<?xml version="1.0" encoding="UTF-8" ?>\n<myanimelist>\n')
+        file.write('\t<myinfo><user_id>{}</user_id><user_name>{}</user_name><user_export_type>{}</user_export_type></myinfo>\n'.format(
+            USER_ID, USER_NAME, 1 if list_type == ANIMELIST else 2
+        ))
+
+        for i in entries:
+            start_date = '{:04}-{:02}-{:02}'.format(*i['start_date'])
+            finish_date = '{:04}-{:02}-{:02}'.format(*i['finish_date']) if i['finish_date'] is not None else '0000-00-00'
+
+            if list_type == ANIMELIST:
+                file.write(
+                    '\t<anime><series_animedb_id>{}</series_animedb_id><series_title><![CDATA[{}]]></series_title>'
+                    '<series_type>{}</series_type><series_episodes>{}</series_episodes><my_id>0</my_id>'
+                    '<my_watched_episodes>{}</my_watched_episodes><my_start_date>{}</my_start_date>'
+                    '<my_finish_date>{}</my_finish_date><my_rated></my_rated><my_score>{}</my_score><my_dvd></my_dvd>'
+                    '<my_storage></my_storage><my_status>{}</my_status><my_comments><![CDATA[]]></my_comments>'
+                    '<my_times_watched>0</my_times_watched><my_rewatch_value></my_rewatch_value>'
+                    '<my_tags><![CDATA[{}]]></my_tags><my_rewatching>0</my_rewatching><my_rewatching_ep>0</my_rewatching_ep>'
+                    '<update_on_import>0</update_on_import></anime>\n'.format(
+                        i['id'], i['title'], i['type'], i['episodes'], i['progress'],
+                        start_date, finish_date, i['score'], status_list[i['status']], i['tags']
+                    )
+                )
+            else:
+                file.write(
+                    '\t<manga><manga_mangadb_id>{}</manga_mangadb_id><manga_title><![CDATA[{}]]></manga_title>'
+                    '<manga_volumes>{}</manga_volumes><manga_chapters>{}</manga_chapters><my_id>0</my_id>'
+                    '<my_read_volumes>0</my_read_volumes><my_read_chapters>{}</my_read_chapters>'
+                    '<my_start_date>{}</my_start_date><my_finish_date>{}</my_finish_date>'
+                    '<my_scanalation_group><![CDATA[]]></my_scanalation_group><my_score>{}</my_score>'
+                    '<my_storage></my_storage><my_status>{}</my_status><my_comments><![CDATA[]]></my_comments>'
+                    '<my_times_read>0</my_times_read><my_tags><![CDATA[{}]]></my_tags><my_reread_value></my_reread_value>'
+                    '<update_on_import>0</update_on_import></manga>\n'.format(
+                        i['id'], i['title'], i['episodes'] // 4 + 1, i['episodes'], i['progress'],
+                        start_date, finish_date, i['score'], status_list[i['status']], i['tags']
+                    )
+                )
+
+        file.write('</myanimelist>\n')
+
+    return path
+
+
+def write_api_pages(page_dir: str, list_type: str, entries: list, page_size: int=PAGE_SIZE) -> list:
+    """ Write `load.json` pages as `<list_type>_<offset>.json`, ending with an empty page """
+    paths = list()
+
+    for offset in list(range(0, len(entries), page_size)) + [len(entries)]:
+        page = list()
+
+        for i in entries[offset:offset + page_size]:
+            start_date = '{:02}-{:02}-{:02}'.format(i['start_date'][1], i['start_date'][2], i['start_date'][0] % 100)
+            finish_date = '{:02}-{:02}-{:02}'.format(i['finish_date'][1], i['finish_date'][2], i['finish_date'][0] % 100) if i['finish_date'] is not None else None
+
+            if list_type == ANIMELIST:
+                page.append({
+                    'status': i['status'], 'score': i['score'], 'tags': i['tags'], 'is_rewatching': 0,
+                    'num_watched_episodes': i['progress'], 'anime_title': i['title'], 'anime_num_episodes': i['episodes'],
+                    'anime_id': i['id'], 'anime_media_type_string': i['type'], 'storage_string': str(),
+                    'start_date_string': start_date, 'finish_date_string': finish_date
+                })
+            else:
+                page.append({
+                    'id': i['id'], 'status': i['status'], 'score': i['score'], 'tags': i['tags'],
+                    'num_read_chapters': i['progress'], 'num_read_volumes': 0, 'manga_title': i['title'],
+                    'manga_num_chapters': i['episodes'], 'manga_num_volumes': i['episodes'] // 4 + 1, 'manga_id': i['id'],
+                    'start_date_string': start_date, 'finish_date_string': finish_date
+                })
+
+        path = os.path.join(page_dir, '{}_{}.json'.format(list_type, offset))
+        with open(path, 'w', encoding='utf-8') as file:
+            json.dump(page, file)
+        paths.append(path)
+
+    return paths
+
+
+def write_exports(directory: str, anime_count: int, manga_count: int=None, seed: int=0) -> dict:
+    """ Write XML exports to `<directory>/data/` and `load.json` pages to `<directory>/api/` """
+    manga_count = anime_count // 3 if manga_count is None else manga_count
+    data_dir = os.path.join(directory, 'data', '')
+    page_dir = os.path.join(directory, 'api', '')
+    os.makedirs(data_dir, exist_ok=True)
+    os.makedirs(page_dir, exist_ok=True)
+
+    for list_type, count in ((ANIMELIST, anime_count), (MANGALIST, manga_count)):
+        entries = get_entries(list_type, count, seed=seed)
+        write_xml_export(data_dir, list_type, entries)
+        write_api_pages(page_dir, list_type, entries)
+
+    return {'data_dir': data_dir, 'page_dir': page_dir, 'anime_count': anime_count, 'manga_count': manga_count}
+
+
+def compress_exports(data_dir: str, target_dir: str) -> str:
+    """ Write gzip compressed copies of the XML exports of a directory to another, returns the other """
+    os.makedirs(target_dir, exist_ok=True)
+
+    for i in os.listdir(data_dir):
+        if i.endswith('.xml'):
+            with open(os.path.join(data_dir, i), 'rb') as source, gzip.open(os.path.join(target_dir, i + '.gz'), 'wb') as target:
+                shutil.copyfileobj(source, target)
+
+    return target_dir
+
+
+def main() -> None:
+    """ Main function """
+    if len(sys.argv) < 3:
+        print(__doc__)
+        sys.exit(1)
+
+    result = write_exports(sys.argv[1], int(sys.argv[2]), int(sys.argv[3]) if len(sys.argv) > 3 else None)
+    print('Wrote {} anime and {} manga entries to {} and {}.'.format(
+        result['anime_count'], result['manga_count'], result['data_dir'], result['page_dir']
+    ))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,5 @@
+"""
+    `conftest.py`
+
+    Places the repository root on the import path, so `pytest` runs from the root as well as through `python -m pytest`.
+"""
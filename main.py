@@ -2,56 +2,185 @@
     script_chart.py
 """
 
+from copy import copy
 from json.decoder import JSONDecodeError
 
-from settings import USE_API, MAL_USERNAME, DISPLAY_ANIME_STATS, DISPLAY_MANGA_STATS
+from settings import USE_API, MAL_USERNAME, API_MAX_WORKERS, API_PREFETCH_PAGES, USE_XML_STREAMING
+from settings import USE_SNAPSHOTS, SNAPSHOT_DIR, USE_SNAPSHOT_REFRESH, USE_COLUMNAR_LIST
+from settings import USE_API_CACHE, API_CACHE_DIR, API_CACHE_TTL, API_CACHE_MAX_SIZE
+from settings import DISPLAY_ANIME_STATS, DISPLAY_MANGA_STATS
 from settings import ENABLE_TAG_VALIDATIONS, MUST_BE_TAGGED, MUST_BE_UNTAGGED, APPLY_TAG_RULES
-from settings import CHART_STYLE, MANUAL_SORT_ANIME, ENABLE_AUTO_CHART_OPEN
-from src.loader import XMLLoader, APILoader
-from src.render import RenderMachine
+from settings import CHART_STYLE, MANUAL_SORT_ANIME, RENDER_WORKERS, ENABLE_INCREMENTAL_RENDER, ENABLE_AUTO_CHART_OPEN
+from settings import TREEMAP_NODE_BUDGET, TREEMAP_AGGREGATE, TREEMAP_DRILL_DOWN
+from src.cache import ResponseCache
+from src.classes.columnar_list import ColumnarList
+from src.classes.user import User
+from src.constants import ANIMELIST, MANGALIST
+from src.diff import refresh_user
+from src.loader import XMLLoader, XMLStreamLoader, APILoader
+from src.profiler import profiler
+from src.render import ChartJob, RenderMachine
+from src.snapshot import SnapshotStore
+from src.tags import TagValidator, load_tag_rules
 from src.utils import notice, error
 
+import argparse
 import os
 import platform
-import sys
 
 
 def main() -> None:
     """ Main function """
+    parser = argparse.ArgumentParser(description='Display list statistics and render charts of a MyAnimeList.net user.')
+    parser.add_argument('username', nargs='?', default=str(), help='username fetched through the API, defaults to the set username')
+    parser.add_argument('--stats-only', action='store_true', help='display statistics only, skipping chart rendering')
+    parser.add_argument('--profile', nargs='?', const=str(), metavar='PATH', help='display a stage time breakdown, or write a Chrome trace to PATH')
+    args = parser.parse_args()
+    if args.profile is not None:
+        profiler.enable()
+
     # Verify API usage settings
     print()
     notice('Program started.')
     if not USE_API:
-        loader = XMLLoader('data/')
+        loader = get_xml_loader('data/')
         notice('Started file fetching.')
     else:
-        if len(sys.argv) > 1 and len(sys.argv[1]) > 0:
-            loader = APILoader(sys.argv[1])
-            notice('Fetching API with input username \'{}\'.'.format(sys.argv[1]))
+        if len(args.username) > 0:
+            loader = get_api_loader(args.username)
+            notice('Fetching API with input username \'{}\'.'.format(args.username))
         else:
-            loader = APILoader(MAL_USERNAME)
+            loader = get_api_loader(MAL_USERNAME)
             notice('Fetching API with set username \'{}\'.'.format(MAL_USERNAME))
 
+    # Load data
+    with profiler.timer('main.load_user'):
+        user = load_user(loader)
+    if user is None:
+        return
+    print()
+
+    # User data displaying
+    with profiler.timer('main.display_user'):
+        display_user(user)
+
+    # Render charts, unless displaying stats only
+    if not args.stats_only:
+        with profiler.timer('main.render'):
+            render_machine = RenderMachine('charts/', style=CHART_STYLE, incremental=ENABLE_INCREMENTAL_RENDER)
+            render_machine.render_batch(get_chart_jobs(user), workers=RENDER_WORKERS)
+            render_machine.report()
+
+    # Auto-open charts
+    if ENABLE_AUTO_CHART_OPEN and not args.stats_only:
+        try:
+            if platform.system() == 'Windows':
+                notice('Opening chart files automatically is unsupported on Windows.')
+            else:
+                os.system('open charts/*')
+                notice('Opening chart files.')
+        except (FileNotFoundError, OSError, PermissionError):
+            error('Something unexpected happened, please try again.')
+
+    # Profile reporting
+    if args.profile is not None:
+        if not args.stats_only:
+            print()
+        if len(args.profile) > 0:
+            profiler.write_trace(args.profile)
+            notice('Profile trace written to \'{}\'.'.format(args.profile))
+        else:
+            profiler.report()
+
+    # Windows' cmd line fix
+    if platform.system() != 'Windows':
+        print()
+
+
+def get_xml_loader(data_dir: str) -> XMLLoader:
+    """ Get XML loader of the export files in a directory """
+    loader = XMLStreamLoader(data_dir) if USE_XML_STREAMING else XMLLoader(data_dir)
+    if USE_COLUMNAR_LIST:
+        loader.list_class = ColumnarList
+
+    return loader
+
+
+def get_api_loader(username: str) -> APILoader:
+    """ Get API loader of a user """
+    cache = ResponseCache(API_CACHE_DIR, ttl=API_CACHE_TTL, max_size=API_CACHE_MAX_SIZE) if USE_API_CACHE else None
+    loader = APILoader(username, max_workers=API_MAX_WORKERS, prefetch_pages=API_PREFETCH_PAGES, cache=cache)
+    if USE_COLUMNAR_LIST:
+        loader.list_class = ColumnarList
+
+    return loader
+
+
+def load_user(loader) -> User:
+    """ Load user object from a loader, from snapshot when the XML exports are unchanged """
+    use_snapshots = USE_SNAPSHOTS and isinstance(loader, XMLLoader)
+
+    # Load snapshot of unchanged exports
+    if use_snapshots:
+        snapshot_store = SnapshotStore(SNAPSHOT_DIR)
+        user = snapshot_store.load(loader.get_source_files(), options=loader.get_options())
+        if user is not None:
+            notice('Data loaded from snapshot.')
+            return user
+
     # Create document on loader
     try:
         loader.create_document()
     except JSONDecodeError:
-        if not USE_API:
+        if isinstance(loader, XMLLoader):
             error('XML reading error. Try exporting XML from myanimelist.net again.')
         else:
             error('API fetching error. The specified user may not exist.')
-        return
+        return None
 
-    # Load data
-    user = loader.get_user_object(
-        include_current=True,
-        include_onhold=True,
-        include_dropped=True,
-        include_planned=True
-    )
-    notice('Data retrieved successfully.')
-    print()
+    # Refresh snapshot of the previous exports by the differences, otherwise load data
+    user = load_previous_snapshot(loader, snapshot_store) if use_snapshots and USE_SNAPSHOT_REFRESH else None
+    if user is not None:
+        anime_diff, manga_diff = refresh_user(user, loader)
+        notice('Data refreshed from snapshot of the previous exports, {} anime and {} manga changed.'.format(len(anime_diff), len(manga_diff)))
+    else:
+        user = loader.get_user_object(
+            include_current=True,
+            include_onhold=True,
+            include_dropped=True,
+            include_planned=True
+        )
+        notice('Data retrieved successfully.')
+
+    # Save snapshot, carrying the cached statistics for the next refresh
+    if use_snapshots:
+        warm_user(user)
+        snapshot_store.save(user, loader.get_source_files(), options=loader.get_options())
+
+    return user
+
+
+def load_previous_snapshot(loader: XMLLoader, snapshot_store: SnapshotStore) -> User:
+    """ Load user object snapshot of the exports before the loader's, None if missing or stale """
+    previous_loader = copy(loader)
+    previous_loader.target = loader.target - 1
+
+    if None in (previous_loader.fetch_file_name(list_type=i, target=previous_loader.target) for i in (ANIMELIST, MANGALIST)):
+        return None
+    return snapshot_store.load(previous_loader.get_source_files(), options=previous_loader.get_options())
 
+
+def warm_user(user: User) -> None:
+    """ Build the cached statistics the displayed data and charts are made of, kept in step by later refreshes """
+    user.anime_list.count('all')
+    user.manga_list.count('all')
+    user.anime_list.summary()
+    user.manga_list.summary()
+    user.anime_list.get_grouped_counts(group_by='series_type', field='my_score')
+
+
+def display_user(user: User) -> None:
+    """ Display user, list and scoring data """
     # Retrieve improper tagged entries
     improper_tagged_anime = ', '.join(get_improper_tagged(user, list_type='anime'))
     improper_tagged_manga = ', '.join(get_improper_tagged(user, list_type='manga'))
@@ -74,13 +203,14 @@ def main() -> None:
         print('Planned: {}'.format(user.anime_list.count('plan to watch')))
         print()
 
-        if sum(user.anime_list.get_scores()) != 0:
+        anime_summary = user.anime_list.summary()
+        if anime_summary.count > 0:
             print('  Scoring Data', end='\n  ')
-            print('Total: {}'.format(len(user.anime_list.get_scores())), end=' | ')
-            print('Range: {}~{}'.format(user.anime_list.get_min(), user.anime_list.get_max()), end=' | ')
-            print('Average: {:.2f}'.format(user.anime_list.get_average()), end=' | ')
-            print('Median: {:g}'.format(user.anime_list.get_median()), end=' | ')
-            print('SD: {:.2f}'.format(user.anime_list.get_sd()))
+            print('Total: {}'.format(anime_summary.count), end=' | ')
+            print('Range: {}~{}'.format(anime_summary.min, anime_summary.max), end=' | ')
+            print('Average: {:.2f}'.format(anime_summary.mean), end=' | ')
+            print('Median: {:g}'.format(anime_summary.median), end=' | ')
+            print('SD: {:.2f}'.format(anime_summary.sd))
             print()
             print('  Improper Tagged')
             if ENABLE_TAG_VALIDATIONS:
@@ -101,13 +231,14 @@ def main() -> None:
         print('Planned: {}'.format(user.manga_list.count('plan to read')))
         print()
 
-        if sum(user.manga_list.get_scores()) != 0:
+        manga_summary = user.manga_list.summary()
+        if manga_summary.count > 0:
             print('  Scoring Data', end='\n  ')
-            print('Total: {}'.format(len(user.manga_list.get_scores())), end=' | ')
-            print('Range: {}~{}'.format(user.manga_list.get_min(), user.manga_list.get_max()), end=' | ')
-            print('Average: {:.2f}'.format(user.manga_list.get_average()), end=' | ')
-            print('Median: {:g}'.format(user.manga_list.get_median()), end=' | ')
-            print('SD: {:.2f}'.format(user.manga_list.get_sd()))
+            print('Total: {}'.format(manga_summary.count), end=' | ')
+            print('Range: {}~{}'.format(manga_summary.min, manga_summary.max), end=' | ')
+            print('Average: {:.2f}'.format(manga_summary.mean), end=' | ')
+            print('Median: {:g}'.format(manga_summary.median), end=' | ')
+            print('SD: {:.2f}'.format(manga_summary.sd))
             print()
             print('  Improper Tagged')
             if ENABLE_TAG_VALIDATIONS:
@@ -116,13 +247,16 @@ def main() -> None:
                 print('  Tags validation is set to off.')
             print()
 
-    # Render machine initiation
-    render_machine = RenderMachine('charts/', style=CHART_STYLE)
+
+def get_chart_jobs(user: User) -> list:
+    """ Get chart rendering jobs of a user """
+    render_jobs = list()
 
     # Render anime charts
-    if sum(user.anime_list.get_scores()) != 0:
+    if user.anime_list.summary().count > 0:
         # Render anime pie chart
-        render_machine.render_pie_chart(
+        render_jobs.append(ChartJob(
+            'pie_chart',
             user.anime_list.get_grouped_list(
                 group_by='series_type',
                 manual_sort=MANUAL_SORT_ANIME,
@@ -130,57 +264,51 @@ def main() -> None:
             ),
             title='{}\'{} Anime Series Types'.format(user.info.user_name, 's' * (user.info.user_name[-1] != 's')),
             file_name='anime_series_types'
-        )
+        ))
 
         # Render anime bar charts
-        render_machine.render_bar_chart(
+        render_jobs.append(ChartJob(
+            'bar_chart',
             user.anime_list.get_summed_scores(),
             title='{}\'{} Scored Anime Titles'.format(user.info.user_name, 's' * (user.info.user_name[-1] != 's')),
             file_name='anime_scored'
-        )
-        render_machine.render_bar_chart(
+        ))
+        render_jobs.append(ChartJob(
+            'bar_chart',
             user.anime_list.get_summed_grouped_scores(
                 group_by='series_type',
                 manual_sort=MANUAL_SORT_ANIME
             ),
             title='{}\'{} Scored Anime Titles (By Series Type)'.format(user.info.user_name, 's' * (user.info.user_name[-1] != 's')),
             file_name='anime_scored_by_series_type'
-        )
+        ))
 
         # Render anime treemap chart
-        render_machine.render_treemap(
+        render_jobs.append(ChartJob(
+            'treemap',
             user.anime_list.get_grouped_list(
                 group_by='series_type',
                 manual_sort=MANUAL_SORT_ANIME,
                 disassemble_key=['my_score', 'series_title']
             ),
             title='{}\'{} Scored Anime Treemap'.format(user.info.user_name, 's' * (user.info.user_name[-1] != 's')),
-            file_name='anime_treemap'
-        )
+            file_name='anime_treemap',
+            node_budget=TREEMAP_NODE_BUDGET,
+            aggregate=TREEMAP_AGGREGATE,
+            drill_down=TREEMAP_DRILL_DOWN
+        ))
 
     # Render manga chart
-    if sum(user.manga_list.get_scores()) != 0:
+    if user.manga_list.summary().count > 0:
         # Render manga bar chart
-        render_machine.render_bar_chart(
+        render_jobs.append(ChartJob(
+            'bar_chart',
             user.manga_list.get_summed_scores(),
             title='{}\'{} Scored Manga Titles'.format(user.info.user_name, 's' * (user.info.user_name[-1] != 's')),
             file_name='manga_scored'
-        )
+        ))
 
-    # Auto-open charts
-    if ENABLE_AUTO_CHART_OPEN:
-        try:
-            if platform.system() == 'Windows':
-                notice('Opening chart files automatically is unsupported on Windows.')
-            else:
-                os.system('open charts/*')
-                notice('Opening chart files.')
-        except (FileNotFoundError, OSError, PermissionError):
-            error('Something unexpected happened, please try again.')
-
-    # Windows' cmd line fix
-    if platform.system() != 'Windows':
-        print()
+    return render_jobs
 
 
 def get_improper_tagged(user, list_type: str='anime') -> list:
@@ -193,25 +321,14 @@ def get_improper_tagged(user, list_type: str='anime') -> list:
     else:
         return None
 
-    # Tagged-untagged validation
-    improper = list()
-    improper += [i for i in entry_list if (not isinstance(i.my_tags, str) or len(i.my_tags) == 0) and i.my_status in MUST_BE_TAGGED]   # not tagged in must tagged
-    improper += [i for i in entry_list if (isinstance(i.my_tags, str) and len(i.my_tags) > 0)     and i.my_status in MUST_BE_UNTAGGED] # tagged in must untagged
-
-    # Loads tag rules
-    tag_rules = [i.replace('\n', str()) for i in open('TAG_RULES.txt')]
-    tag_rules = [tuple(sorted([j.lower().strip() for j in i.split(',')])) for i in tag_rules]
-
-    # Filter entries for tag validation
-    temp = [i for i in entry_list if isinstance(i.my_tags, str) and i.my_status in APPLY_TAG_RULES]
-
-    # Tag rules validation
-    if len(tag_rules) > 0:
-        for i in range(len(temp)):
-            temp[i].my_tags = tuple(sorted([j.lower().strip() for j in temp[i].my_tags.split(',')]))
-
-            if temp[i].my_tags not in tag_rules:
-                improper.append(temp[i])
+    # Tagged-untagged and tag rules validation, with rules compiled once per file change
+    validator = TagValidator(
+        load_tag_rules('TAG_RULES.txt'),
+        must_be_tagged=MUST_BE_TAGGED,
+        must_be_untagged=MUST_BE_UNTAGGED,
+        apply_tag_rules=APPLY_TAG_RULES
+    )
+    improper = [i.entry for i in validator.validate(entry_list)]
 
     # Return
     if list_type == 'anime':
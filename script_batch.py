@@ -0,0 +1,125 @@
+"""
+    script_batch.py
+
+    Generates charts for many users in one process.
+
+        python script_batch.py <usernames file | exports directory> [--workers N] [--processes] [--output DIR]
+
+    A usernames file lists one MyAnimeList.net username per line, fetched through the API.
+    An exports directory holds one subdirectory of XML exports per user.
+"""
+
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from main import get_xml_loader, get_api_loader, load_user, get_chart_jobs
+from settings import CHART_STYLE, ENABLE_INCREMENTAL_RENDER
+from src.render import RenderMachine
+from src.utils import notice, error
+
+import argparse
+import json
+import os
+import platform
+import time
+
+
+def main() -> None:
+    """ Main function """
+    parser = argparse.ArgumentParser(description='Generate charts for many users.')
+    parser.add_argument('source', help='usernames file, or directory of per-user XML export directories')
+    parser.add_argument('--workers', type=int, default=4, help='number of users processed at once')
+    parser.add_argument('--processes', action='store_true', help='use a process pool instead of a thread pool')
+    parser.add_argument('--output', default='charts/', help='output directory, one subdirectory per user')
+    args = parser.parse_args()
+
+    print()
+    notice('Batch started.')
+
+    # Users Retrieval
+    if os.path.isdir(args.source):
+        users = [
+            ('xml', i, os.path.join(args.source, i, '')) for i in sorted(os.listdir(args.source))
+            if os.path.isdir(os.path.join(args.source, i))
+        ]
+    else:
+        with open(args.source, 'r') as file:
+            users = [('api', i.strip(), i.strip()) for i in file if len(i.strip()) > 0 and not i.startswith('#')]
+    notice('Processing {} users with {} {} workers.'.format(len(users), args.workers, 'process' if args.processes else 'thread'))
+
+    # Users Processing
+    start = time.perf_counter()
+    executor_class = ProcessPoolExecutor if args.processes else ThreadPoolExecutor
+
+    with executor_class(max_workers=max(args.workers, 1)) as executor:
+        futures = [executor.submit(process_user, source_type, name, source, args.output) for source_type, name, source in users]
+        results = list()
+
+        for future in futures:
+            result = future.result()
+            results.append(result)
+
+            if result['error'] is None:
+                notice('User \'{}\' done in {:.3f}s.'.format(result['user'], result['total']))
+            else:
+                error('User \'{}\' failed: {}'.format(result['user'], result['error']))
+
+    # Summary Report
+    report = {
+        'source': args.source,
+        'workers': args.workers,
+        'pool': 'process' if args.processes else 'thread',
+        'total': time.perf_counter() - start,
+        'succeeded': len([i for i in results if i['error'] is None]),
+        'failed': len([i for i in results if i['error'] is not None]),
+        'users': results
+    }
+    os.makedirs(args.output, exist_ok=True)
+    with open(os.path.join(args.output, 'batch_report.json'), 'w') as file:
+        json.dump(report, file, indent=4)
+
+    notice('Batch finished in {:.3f}s, {} succeeded, {} failed.'.format(report['total'], report['succeeded'], report['failed']))
+
+    # Windows' cmd fix
+    if platform.system() != 'Windows':
+        print()
+
+
+def process_user(source_type: str, name: str, source: str, output_dir: str) -> dict:
+    """ Load, compute and render the charts of a user, collecting timings and failures """
+    result = {'user': name, 'error': None, 'load': None, 'compute': None, 'render': None, 'total': None, 'charts': 0}
+    start = time.perf_counter()
+
+    try:
+        # Load
+        loader = get_xml_loader(source) if source_type == 'xml' else get_api_loader(source)
+        user = load_user(loader)
+        result['load'] = time.perf_counter() - start
+        if user is None:
+            raise ValueError('data could not be loaded')
+
+        # Compute
+        checkpoint = time.perf_counter()
+        jobs = get_chart_jobs(user)
+        result['compute'] = time.perf_counter() - checkpoint
+
+        # Render
+        checkpoint = time.perf_counter()
+        chart_dir = os.path.join(output_dir, name, '')
+        os.makedirs(chart_dir, exist_ok=True)
+        render_machine = RenderMachine(chart_dir, style=CHART_STYLE, incremental=ENABLE_INCREMENTAL_RENDER, show_notice=False)
+        failures = [i for i in render_machine.render_batch(jobs) if i['error'] is not None]
+        result['render'] = time.perf_counter() - checkpoint
+        result['charts'] = len(jobs) - len(failures)
+
+        if len(failures) > 0:
+            raise RuntimeError(', '.join('{}: {}'.format(i['file_name'], i['error']) for i in failures))
+    except Exception as exception:
+        result['error'] = '{}: {}'.format(type(exception).__name__, exception)
+
+    result['total'] = time.perf_counter() - start
+
+    return result
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,132 @@
+"""
+    script_history.py
+
+    Keeps the history of archived XML exports in a SQLite store, and renders trend charts from it.
+
+        python script_history.py ingest <exports directory>   Ingest every anime list and manga list export, oldest first, compressed ones included
+        python script_history.py charts <username>            Render monthly completion and score drift charts
+"""
+
+from datetime import datetime, timezone
+
+from settings import CHART_STYLE, HISTORY_DB_PATH
+from src.constants import ANIMELIST, MANGALIST
+from src.history import HistoryStore
+from src.loader import XMLStreamLoader
+from src.render import RenderMachine
+from src.utils import notice
+
+import argparse
+import os
+import platform
+import time
+
+
+def main() -> None:
+    """ Main function """
+    parser = argparse.ArgumentParser(description='Keep and chart the history of anime list and manga list exports.')
+    parser.add_argument('--db', default=HISTORY_DB_PATH, help='SQLite history store path')
+    subparsers = parser.add_subparsers(dest='command')
+    subparsers.required = True
+    ingest_parser = subparsers.add_parser('ingest', help='ingest every export of a directory')
+    ingest_parser.add_argument('directory', help='directory of XML exports')
+    charts_parser = subparsers.add_parser('charts', help='render history charts of a user')
+    charts_parser.add_argument('username', help='MyAnimeList.net username as in the exports')
+    charts_parser.add_argument('--output', default='charts/', help='output directory')
+    args = parser.parse_args()
+
+    print()
+    store = HistoryStore(args.db)
+
+    try:
+        if args.command == 'ingest':
+            ingest(store, args.directory)
+        else:
+            render_charts(store, args.username, args.output)
+    finally:
+        store.close()
+
+    # Windows' cmd fix
+    if platform.system() != 'Windows':
+        print()
+
+
+def get_taken_at(file_path: str) -> str:
+    """ Get the export time from an export file name, such as `animelist_1600000000_-_1234.xml.gz`, else its modification time """
+    try:
+        timestamp = int(os.path.basename(file_path).split('_')[1])
+    except (IndexError, ValueError):
+        timestamp = os.path.getmtime(file_path)
+
+    return datetime.fromtimestamp(timestamp, timezone.utc).strftime('%Y-%m-%dT%H:%M:%S')
+
+
+def ingest(store: HistoryStore, directory: str) -> None:
+    """ Ingest every export of a directory, oldest first """
+    start = time.perf_counter()
+    source_loader = XMLStreamLoader(directory)
+    files = sorted(
+        [
+            os.path.join(directory, i) for i in os.listdir(directory)
+            if source_loader.is_source_file(i, list_type=ANIMELIST) or source_loader.is_source_file(i, list_type=MANGALIST)
+        ],
+        key=get_taken_at
+    )
+    ingested = 0
+
+    for file_path in files:
+        loader = XMLStreamLoader(None)
+        loader.anime_document = file_path
+        loader.manga_document = file_path
+        list_type = 'anime' if os.path.basename(file_path).startswith(ANIMELIST) else 'manga'
+        user_name = loader.get_info_object().user_name
+        taken_at = get_taken_at(file_path)
+
+        # Exception Case: Already ingested, skipped before parsing its entries
+        if store.has_snapshot(user_name, list_type, taken_at):
+            notice('Export \'{}\' is already ingested.'.format(os.path.basename(file_path)))
+            continue
+
+        include = {'include_current': True, 'include_onhold': True, 'include_dropped': True, 'include_planned': True}
+        if list_type == 'anime':
+            entry_list = loader.get_anime_list_object(**include)
+        else:
+            entry_list = loader.get_manga_list_object(**include)
+
+        store.ingest_list(user_name, list_type, entry_list, taken_at=taken_at, source=os.path.basename(file_path))
+        ingested += 1
+
+    notice('Ingested {} of {} exports in {:.3f}s.'.format(ingested, len(files), time.perf_counter() - start))
+
+
+def render_charts(store: HistoryStore, username: str, output_dir: str) -> None:
+    """ Render monthly completion and score drift charts of both lists """
+    os.makedirs(output_dir, exist_ok=True)
+    render_machine = RenderMachine(output_dir, style=CHART_STYLE)
+    possessive = '{}\'{}'.format(username, 's' * (username[-1] != 's'))
+
+    for list_type in ('anime', 'manga'):
+        if len(store.get_snapshots(username, list_type)) == 0:
+            notice('No {} history of \'{}\'.'.format(list_type, username))
+            continue
+
+        months, completions = store.get_monthly_completions(username, list_type)
+        if len(months) > 0:
+            render_machine.render_line_chart(
+                completions,
+                x_labels=months,
+                title='{} Monthly {} Completions'.format(possessive, list_type.title()),
+                file_name='{}_monthly_completions'.format(list_type)
+            )
+
+        taken_at, drift = store.get_score_drift(username, list_type)
+        render_machine.render_line_chart(
+            drift,
+            x_labels=[i[:10] for i in taken_at],
+            title='{} {} Score Drift'.format(possessive, list_type.title()),
+            file_name='{}_score_drift'.format(list_type)
+        )
+
+
+if __name__ == '__main__':
+    main()
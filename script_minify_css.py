@@ -1,32 +1,46 @@
 """
     minify_css.py
+
+        python script_minify_css.py [CSS files...]
+
+    Minifies the set CSS file, or every given CSS file, next to its source as `.min.css`.
 """
 
-from settings import CSS_NAME, CSS_PATH, MIN_CSS_PATH
-from src.utils import notice
+from settings import CSS_PATH, MIN_CSS_PATH, CSS_CACHE_DIR
+from src.css import CSSCache
+from src.utils import notice, error
 
+import os
 import platform
-import requests
+import sys
 
 
 def main():
-    data = {'input': open(CSS_PATH, 'rb').read()}
-    response = requests.post('https://cssminifier.com/raw', data=data)
-
-    min_data = open(MIN_CSS_PATH, 'w')
-    min_data.write(response.text)
-    min_data.close()
+    if len(sys.argv) > 1:
+        files = [(i, '{}.min.css'.format(os.path.splitext(i)[0])) for i in sys.argv[1:]]
+    else:
+        files = [(CSS_PATH, MIN_CSS_PATH)]
+    cache = CSSCache(CSS_CACHE_DIR)
 
     print()
-    notice('Minified CSS `{}` has been created, minified from {} to {} characters.'.format(
-        CSS_NAME,
-        len(''.join(list(open(CSS_PATH)))),
-        len(response.text)
-    ))
+    for source_path, target_path in files:
+        try:
+            result = cache.minify_file(source_path, target_path)
+        except (FileNotFoundError, UnicodeDecodeError) as exception:
+            error('CSS `{}` could not be minified: {}'.format(source_path, exception))
+            continue
+
+        notice('Minified CSS `{}` has been created{}, minified from {} to {} characters.'.format(
+            target_path,
+            ' from cache' if result['cached'] else str(),
+            result['input_length'],
+            result['output_length']
+        ))
 
     # Windows' cmd fix
     if platform.system() != 'Windows':
         print()
 
 
-main()
+if __name__ == '__main__':
+    main()
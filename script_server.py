@@ -0,0 +1,241 @@
+"""
+    script_server.py
+
+    Serves rendered charts over HTTP, keeping parsed users, statistics and charts warm in memory.
+
+        GET  /users/{username}/charts             All charts of a user fetched through the API, as JSON
+        GET  /users/{username}/charts/{name}.svg  A single chart
+        GET  /users/{username}/stats              List and scoring statistics, as JSON
+        POST /exports                             Charts of an uploaded XML export (request body), as JSON
+        GET  /metrics                             Request latency and cache hit-rate metrics
+"""
+
+from collections import deque
+from concurrent.futures import Future
+from hashlib import sha1
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from threading import Lock
+from urllib.parse import unquote, urlparse
+
+from main import get_api_loader, load_user, get_chart_jobs
+from settings import CHART_STYLE, SERVER_HOST, SERVER_PORT, SERVER_CACHE_SIZE, SERVER_CACHE_TTL
+from src.cache import LRUCache
+from src.classes.user import User
+from src.loader import XMLStreamLoader
+from src.render import RenderMachine
+from src.utils import notice
+
+import json
+import time
+
+
+class ChartService:
+    """ Chart service class, holding the warm caches and metrics shared by all requests """
+    def __init__(self, cache_size: int=64, cache_ttl: float=None):
+        """ Constructor """
+        self.users = LRUCache(max_items=cache_size, ttl=cache_ttl)
+        self.stats = LRUCache(max_items=cache_size, ttl=cache_ttl)
+        self.charts = LRUCache(max_items=cache_size, ttl=cache_ttl)
+        self.latencies = dict()
+        self.pending = dict()
+        self.lock = Lock()
+
+    def get_user(self, key: str, load) -> User:
+        """ Get a cached user object, loading it on a miss, concurrent misses of a key waiting on the one load in progress """
+        with self.lock:
+            user = self.users.get(key)
+            if user is not None:
+                return user
+
+            future = self.pending.get(key)
+            loading = future is None
+            if loading:
+                future = self.pending[key] = Future()
+
+        # Pending Load: Result or exception of the load in progress
+        if not loading:
+            return future.result()
+
+        try:
+            user = load()
+            if user is not None:
+                self.users.set(key, user)
+            future.set_result(user)
+        except BaseException as exception:
+            future.set_exception(exception)
+            raise
+        finally:
+            with self.lock:
+                del self.pending[key]
+
+        return user
+
+    def get_stats(self, key: str, user: User) -> dict:
+        """ Get cached list and scoring statistics of a user """
+        stats = self.stats.get(key)
+
+        if stats is None:
+            stats = {'user_name': user.info.user_name}
+            for list_type, entry_list in (('anime', user.anime_list), ('manga', user.manga_list)):
+                summary = entry_list.summary()
+                stats[list_type] = {
+                    'total': entry_list.count('all'),
+                    'scored': summary.count,
+                    'min': summary.min,
+                    'max': summary.max,
+                    'mean': summary.mean,
+                    'median': summary.median,
+                    'sd': summary.sd,
+                    'mode': summary.mode
+                }
+            self.stats.set(key, stats)
+
+        return stats
+
+    def get_charts(self, key: str, user: User) -> dict:
+        """ Get cached rendered charts of a user, as chart name to SVG """
+        charts = self.charts.get(key)
+
+        if charts is None:
+            render_machine = RenderMachine(None, style=CHART_STYLE, show_notice=False)
+            render_machine.render_batch(get_chart_jobs(user))
+            charts = render_machine.rendered
+            self.charts.set(key, charts)
+
+        return charts
+
+    def get_export_user(self, export: bytes) -> User:
+        """ Get user object from an uploaded anime list or manga list XML export """
+        loader = XMLStreamLoader(None)
+        loader.anime_document = export
+        loader.manga_document = export
+
+        return User(
+            info=loader.get_info_object(),
+            anime_list=loader.get_anime_list_object(include_current=True, include_onhold=True, include_dropped=True, include_planned=True),
+            manga_list=loader.get_manga_list_object(include_current=True, include_onhold=True, include_dropped=True, include_planned=True)
+        )
+
+    def record_latency(self, route: str, elapsed: float) -> None:
+        """ Record request latency of a route, keeping the latest 1000 """
+        with self.lock:
+            self.latencies.setdefault(route, deque(maxlen=1000)).append(elapsed)
+
+    def get_metrics(self) -> dict:
+        """ Get request latency and cache hit-rate metrics """
+        with self.lock:
+            latencies = {i: sorted(self.latencies[i]) for i in self.latencies}
+
+        return {
+            'latency_ms': {
+                route: {
+                    'count': len(values),
+                    'p50': 1000 * values[len(values) // 2],
+                    'p95': 1000 * values[min(len(values) - 1, len(values) * 95 // 100)],
+                    'max': 1000 * values[-1]
+                }
+                for route, values in latencies.items()
+            },
+            'caches': {
+                'users': self.users.get_metrics(),
+                'stats': self.stats.get_metrics(),
+                'charts': self.charts.get_metrics()
+            }
+        }
+
+
+class ChartRequestHandler(BaseHTTPRequestHandler):
+    """ Chart service request handler class """
+    def do_GET(self):
+        """ Handle GET requests """
+        start = time.perf_counter()
+        path = [unquote(i) for i in urlparse(self.path).path.split('/') if len(i) > 0]
+        service = self.server.service
+        route = 'other'
+
+        if path == ['metrics']:
+            route = 'metrics'
+            self.send_json(200, service.get_metrics())
+        elif len(path) >= 3 and path[0] == 'users' and path[2] in ('charts', 'stats'):
+            key = 'api:{}'.format(path[1].lower())
+
+            try:
+                user = service.get_user(key, lambda: load_user(get_api_loader(path[1])))
+            except Exception as exception:
+                route = 'upstream'
+                self.send_json(502, {'error': 'User \'{}\' could not be retrieved: {}'.format(path[1], exception)})
+                service.record_latency(route, time.perf_counter() - start)
+                return
+
+            if user is None:
+                self.send_json(404, {'error': 'User \'{}\' could not be loaded.'.format(path[1])})
+            elif path[2] == 'stats':
+                route = 'stats'
+                self.send_json(200, service.get_stats(key, user))
+            elif len(path) == 3:
+                route = 'charts'
+                self.send_json(200, service.get_charts(key, user))
+            else:
+                route = 'chart'
+                charts = service.get_charts(key, user)
+                name = path[3].replace('.svg', '')
+                if name in charts:
+                    self.send_body(200, charts[name].encode(), 'image/svg+xml')
+                else:
+                    self.send_json(404, {'error': 'Chart \'{}\' does not exist.'.format(name)})
+        else:
+            self.send_json(404, {'error': 'Not found.'})
+
+        service.record_latency(route, time.perf_counter() - start)
+
+    def do_POST(self):
+        """ Handle POST requests """
+        start = time.perf_counter()
+        service = self.server.service
+
+        if urlparse(self.path).path.rstrip('/') != '/exports':
+            self.send_json(404, {'error': 'Not found.'})
+            return
+
+        export = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        key = 'export:{}'.format(sha1(export).hexdigest())
+
+        try:
+            user = service.get_user(key, lambda: service.get_export_user(export))
+            self.send_json(200, service.get_charts(key, user))
+        except Exception as exception:
+            self.send_json(400, {'error': 'Invalid export: {}'.format(exception)})
+
+        service.record_latency('exports', time.perf_counter() - start)
+
+    def send_json(self, status: int, data: dict) -> None:
+        """ Send a JSON response """
+        self.send_body(status, json.dumps(data).encode(), 'application/json')
+
+    def send_body(self, status: int, body: bytes, content_type: str) -> None:
+        """ Send a response """
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def main() -> None:
+    """ Main function """
+    server = ThreadingHTTPServer((SERVER_HOST, SERVER_PORT), ChartRequestHandler)
+    server.service = ChartService(cache_size=SERVER_CACHE_SIZE, cache_ttl=SERVER_CACHE_TTL)
+
+    print()
+    notice('Chart service listening on http://{}:{}/.'.format(SERVER_HOST, SERVER_PORT))
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        notice('Chart service stopped.')
+    finally:
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main()
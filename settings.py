@@ -1,12 +1,27 @@
 # Settings
 
-from pygal.style import *
-
 
 # Overall
 # - API Usage
 USE_API = True
 MAL_USERNAME = '810Teams'
+API_MAX_WORKERS = 4
+API_PREFETCH_PAGES = 4
+
+# - API Response Caching
+USE_API_CACHE = True
+API_CACHE_DIR = 'cache/api/'
+API_CACHE_TTL = 60 * 60
+API_CACHE_MAX_SIZE = 64 * 1024 ** 2
+
+# - XML Loading
+USE_XML_STREAMING = True
+USE_SNAPSHOTS = True
+SNAPSHOT_DIR = 'cache/snapshots/'
+USE_SNAPSHOT_REFRESH = False
+
+# - List Storage
+USE_COLUMNAR_LIST = False
 
 
 # Main Script
@@ -21,12 +36,29 @@ MUST_BE_UNTAGGED = ('Dropped', 'Planned')
 APPLY_TAG_RULES = ('Watching', 'Completed', 'On-Hold')
 
 # - Chart
-CHART_STYLE = DarkStyle
+CHART_STYLE = 'DarkStyle'
 MANUAL_SORT_ANIME = ['TV', 'Movie', 'Special', 'OVA', 'ONA', 'Music']
+RENDER_WORKERS = 4
+ENABLE_INCREMENTAL_RENDER = True
+TREEMAP_NODE_BUDGET = 500
+TREEMAP_AGGREGATE = 'other'
+TREEMAP_DRILL_DOWN = False
 ENABLE_AUTO_CHART_OPEN = False
 
 
+# History
+HISTORY_DB_PATH = 'cache/history.sqlite3'
+
+
+# Chart Service
+SERVER_HOST = '127.0.0.1'
+SERVER_PORT = 8000
+SERVER_CACHE_SIZE = 64
+SERVER_CACHE_TTL = 10 * 60
+
+
 # CSS Minification
 CSS_NAME = 'brink-1.4.3'
 CSS_PATH = 'css/{}.css'.format(CSS_NAME)
 MIN_CSS_PATH = 'css/{}.min.css'.format(CSS_NAME)
+CSS_CACHE_DIR = 'cache/css/'
@@ -0,0 +1,165 @@
+"""
+    `cache.py`
+"""
+
+from collections import OrderedDict
+from hashlib import sha1
+from threading import Lock
+
+import json
+import os
+import tempfile
+import time
+
+
+class LRUCache:
+    """ In-memory least recently used cache class """
+    def __init__(self, max_items: int=64, ttl: float=None):
+        """ Constructor """
+        self.max_items = max_items
+        self.ttl = ttl
+        self.items = OrderedDict()
+        self.lock = Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        """ Get a cached value, None if missing or expired """
+        with self.lock:
+            item = self.items.get(key)
+
+            if item is None or (self.ttl is not None and time.time() - item[0] >= self.ttl):
+                self.misses += 1
+                return None
+
+            self.items.move_to_end(key)
+            self.hits += 1
+            return item[1]
+
+    def set(self, key, value) -> None:
+        """ Store a value, evicting the least recently used one beyond the size cap """
+        with self.lock:
+            self.items[key] = (time.time(), value)
+            self.items.move_to_end(key)
+
+            while len(self.items) > self.max_items:
+                self.items.popitem(last=False)
+
+    def get_metrics(self) -> dict:
+        """ Get size and hit-rate metrics """
+        with self.lock:
+            total = self.hits + self.misses
+            return {
+                'size': len(self.items),
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / total if total > 0 else None
+            }
+
+
+class ResponseCache:
+    """ On-disk HTTP response cache class """
+    def __init__(self, cache_dir: str, ttl: float=3600, max_size: int=64 * 1024 ** 2):
+        """ Constructor """
+        self.cache_dir = cache_dir
+        self.ttl = ttl
+        self.max_size = max_size
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def get_path(self, list_type: str, username: str, offset: int) -> str:
+        """ Get cache file path without extension from the cache key """
+        key = sha1('{}/{}/{}'.format(list_type, username.lower(), offset).encode()).hexdigest()
+        return os.path.join(self.cache_dir, key)
+
+    def get(self, list_type: str, username: str, offset: int) -> dict:
+        """ Get a cached response, marking it as recently used """
+        path = self.get_path(list_type, username, offset)
+
+        # Exception Case: Missing or partially written entry
+        try:
+            with open(path + '.meta', 'r') as file:
+                entry = json.load(file)
+            with open(path + '.body', 'rb') as file:
+                entry['body'] = file.read()
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+        # Exception Case: Body and metadata of different writes
+        if entry.get('digest') != sha1(entry['body']).hexdigest():
+            return None
+
+        try:
+            os.utime(path + '.body')
+        except OSError:
+            pass
+
+        return entry
+
+    def set(self, list_type: str, username: str, offset: int, body: bytes, etag: str=None, last_modified: str=None) -> None:
+        """ Store a response, its metadata recording the digest of the body it belongs to """
+        path = self.get_path(list_type, username, offset)
+
+        self.write(path + '.body', body)
+        self.write(path + '.meta', json.dumps({
+            'digest': sha1(body).hexdigest(),
+            'etag': etag,
+            'last_modified': last_modified,
+            'stored_at': time.time()
+        }).encode())
+
+    def touch(self, list_type: str, username: str, offset: int) -> None:
+        """ Renew a cached response after a successful revalidation """
+        path = self.get_path(list_type, username, offset)
+
+        with open(path + '.meta', 'r') as file:
+            meta = json.load(file)
+        meta['stored_at'] = time.time()
+        self.write(path + '.meta', json.dumps(meta).encode())
+
+    def is_fresh(self, entry: dict) -> bool:
+        """ Check whether a cached response is still within its time-to-live """
+        return time.time() - entry['stored_at'] < self.ttl
+
+    def write(self, path: str, data: bytes) -> None:
+        """ Atomically write a cache file, through a temporary file unique to the writing thread """
+        descriptor, temp_path = tempfile.mkstemp(dir=os.path.dirname(path) or '.', prefix=os.path.basename(path) + '.', suffix='.tmp')
+
+        try:
+            with os.fdopen(descriptor, 'wb') as file:
+                file.write(data)
+            os.replace(temp_path, path)
+        except BaseException:
+            os.remove(temp_path)
+            raise
+
+    def evict(self) -> int:
+        """ Evict least recently used responses until the cache fits its size cap """
+        entries = list()
+        total = 0
+
+        for i in os.listdir(self.cache_dir):
+            if i.endswith('.body'):
+                path = os.path.join(self.cache_dir, i[:-len('.body')])
+                try:
+                    size = os.path.getsize(path + '.body') + os.path.getsize(path + '.meta')
+                    entries.append((os.path.getmtime(path + '.body'), size, path))
+                except FileNotFoundError:
+                    continue
+                total += size
+
+        entries.sort()
+        evicted = 0
+
+        for _, size, path in entries:
+            if total <= self.max_size:
+                break
+            for extension in ('.body', '.meta'):
+                try:
+                    os.remove(path + extension)
+                except FileNotFoundError:
+                    pass
+            total -= size
+            evicted += 1
+
+        return evicted
@@ -0,0 +1,533 @@
+"""
+    `classes/columnar_list.py`
+"""
+
+from src.classes.entry import Entry, Anime, Manga
+from src.classes.list import List
+from src.constants import ANIME_FIELDS, MANGA_FIELDS
+
+from array import array
+from collections import Counter
+from itertools import compress
+from operator import itemgetter
+
+import sys
+
+
+FULL_BYTES = bytes([0] + [255] * 255)
+BATCH_SIZE = 4096
+
+
+class IntColumn:
+    """ Integer column class, backed by a typed array until a non-integer value is stored """
+    NULL = -2 ** 63
+
+    def __init__(self):
+        """ Constructor """
+        self.values = array('q')
+        self.has_null = False
+        self.byte_codes = None
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def to_object_column(self) -> None:
+        """ Fall back to a plain list of values """
+        self.values = [self.get(i) for i in range(len(self.values))]
+
+    def append(self, value) -> None:
+        """ Append a value """
+        self.byte_codes = None
+        if value is None:
+            self.has_null = True
+
+        try:
+            self.values.append(self.NULL if value is None and isinstance(self.values, array) else value)
+        except (TypeError, OverflowError):
+            self.to_object_column()
+            self.values.append(value)
+
+    def extend(self, values: tuple) -> None:
+        """ Append values """
+        self.byte_codes = None
+        if None in values:
+            self.has_null = True
+
+        try:
+            self.values.extend(array('q', [self.NULL if i is None else i for i in values] if self.has_null else values))
+        except (TypeError, OverflowError):
+            if isinstance(self.values, array):
+                self.to_object_column()
+            self.values.extend(values)
+
+    def get(self, i: int):
+        """ Get a value by row number """
+        value = self.values[i]
+        return None if value == self.NULL and isinstance(self.values, array) else value
+
+    def set(self, i: int, value) -> None:
+        """ Set a value by row number """
+        self.byte_codes = None
+        if value is None:
+            self.has_null = True
+
+        try:
+            self.values[i] = self.NULL if value is None and isinstance(self.values, array) else value
+        except (TypeError, OverflowError):
+            self.to_object_column()
+            self.values[i] = value
+
+    def pop(self) -> None:
+        """ Remove the last value """
+        self.byte_codes = None
+        self.values.pop()
+
+    def iter_values(self):
+        """ Iterate over all values, NULLs are only looked for once one has been stored """
+        if not isinstance(self.values, array) or not self.has_null:
+            return iter(self.values)
+        return (None if i == self.NULL else i for i in self.values)
+
+    def get_byte_codes(self) -> tuple:
+        """ Get one byte per row and the value of each byte, when all values are integers from 0 to 255, else None """
+        if self.byte_codes is None:
+            self.byte_codes = False
+
+            if isinstance(self.values, array) and not self.has_null and len(self.values) > 0:
+                minimum, maximum = min(self.values), max(self.values)
+                if minimum >= 0 and maximum < 256:
+                    # Byte Slicing: The lowest byte of each 8-byte value holds all of it
+                    offset = 0 if sys.byteorder == 'little' else self.values.itemsize - 1
+                    self.byte_codes = (self.values.tobytes()[offset::self.values.itemsize], range(maximum + 1))
+
+        return self.byte_codes or None
+
+
+class DictionaryColumn:
+    """ Dictionary-encoded column class, storing each distinct value once """
+    def __init__(self):
+        """ Constructor """
+        self.codes = array('B')
+        self.values = [None]
+        self.lookup = {None: 0}
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def encode(self, value) -> int:
+        """ Get the code of a value, adding it to the dictionary if new """
+        code = self.lookup.get(value)
+
+        if code is None:
+            code = len(self.values)
+            self.values.append(value)
+            self.lookup[value] = code
+
+            # Code Widening: One byte per code until there are more than 256 distinct values
+            if code == 256:
+                self.codes = array('I', self.codes)
+
+        return code
+
+    def append(self, value) -> None:
+        """ Append a value, encoded first as encoding may widen the codes """
+        code = self.encode(value)
+        self.codes.append(code)
+
+    def extend(self, values: tuple) -> None:
+        """ Append values, encoded first as encoding may widen the codes, only new values are added one by one """
+        codes = list(map(self.lookup.get, values))
+        if None in codes:
+            codes = [self.encode(j) if i is None else i for i, j in zip(codes, values)]
+        self.codes.extend(codes)
+
+    def get(self, i: int):
+        """ Get a value by row number """
+        return self.values[self.codes[i]]
+
+    def set(self, i: int, value) -> None:
+        """ Set a value by row number """
+        code = self.encode(value)
+        self.codes[i] = code
+
+    def pop(self) -> None:
+        """ Remove the last value """
+        self.codes.pop()
+
+    def iter_values(self):
+        """ Iterate over all values """
+        return map(self.values.__getitem__, self.codes)
+
+    def get_byte_codes(self) -> tuple:
+        """ Get one byte per row and the value of each byte, while codes fit in a byte, else None """
+        if self.codes.typecode != 'B':
+            return None
+        return self.codes.tobytes(), self.values
+
+
+class ColumnarList(List):
+    """ Columnar user anime/manga list class, entry objects are only materialized on their first retrieval """
+    FIELDS = {Anime: ANIME_FIELDS, Manga: MANGA_FIELDS}
+    ID_FIELDS = {Anime: 'series_animedb_id', Manga: 'manga_mangadb_id'}
+
+    def __init__(
+        self,
+        data: list=None,
+        include_current: bool=False,
+        include_onhold: bool=False,
+        include_dropped: bool=False,
+        include_planned: bool=False,
+        tag_rules: list=None
+    ):
+        """ Constructor """
+        self.entry_class = None
+        self.columns = dict()
+        self.row_count = 0
+        self.rows = None
+        self.status_counts = None
+        self.masks = dict()
+
+        super().__init__(
+            data=data,
+            include_current=include_current,
+            include_onhold=include_onhold,
+            include_dropped=include_dropped,
+            include_planned=include_planned,
+            tag_rules=tag_rules
+        )
+
+    @classmethod
+    def from_values(
+        cls,
+        entry_class: type,
+        rows,
+        include_current: bool=False,
+        include_onhold: bool=False,
+        include_dropped: bool=False,
+        include_planned: bool=False
+    ):
+        """ Create anime/manga list from rows of anime/manga values in field order, filling the columns without creating objects """
+        entry_list = cls(
+            include_current=include_current,
+            include_onhold=include_onhold,
+            include_dropped=include_dropped,
+            include_planned=include_planned
+        )
+        entry_list.create_columns(entry_class)
+        batch = list()
+
+        # Batching: Rows are gathered as tuples, then stored column by column a batch at a time
+        for values in rows:
+            batch.append(tuple(values))
+            if len(batch) == BATCH_SIZE:
+                entry_list.extend_rows(batch)
+                batch.clear()
+        entry_list.extend_rows(batch)
+        entry_list.reindex()
+
+        return entry_list
+
+    @property
+    def data(self) -> list:
+        """ Get all anime/manga objects, materialized once and kept in step with modifications """
+        return self.get_rows()
+
+    @data.setter
+    def data(self, data: list) -> None:
+        """ Replace all anime/manga objects, `reindex` is required afterwards """
+        self.entry_class = None
+        self.columns = dict()
+        self.row_count = 0
+        self.rows = None
+
+        for i in data:
+            self.append_row(i)
+
+    def __getstate__(self) -> dict:
+        """ Pickle the columns only, materialized objects are rebuilt on retrieval """
+        state = dict(vars(self))
+        state['rows'] = None
+        return state
+
+    def create_columns(self, entry_class: type) -> None:
+        """ Create empty columns for the fields of the anime/manga class """
+        self.entry_class = entry_class
+        self.columns = {
+            i: IntColumn() if field_type is int else DictionaryColumn()
+            for i, field_type in self.FIELDS[entry_class].items()
+        }
+
+    def append_row(self, entry: Entry) -> None:
+        """ Append an anime/manga object's values as a new row """
+        if self.entry_class is None:
+            self.create_columns(type(entry))
+
+        for i in self.columns:
+            self.columns[i].append(getattr(entry, i))
+        self.row_count += 1
+
+    def extend_rows(self, rows: list) -> None:
+        """ Append rows of values in field order """
+        if len(rows) == 0:
+            return
+
+        for column, values in zip(self.columns.values(), zip(*rows)):
+            column.extend(values)
+        self.row_count += len(rows)
+
+    def get_row(self, i: int) -> Entry:
+        """ Get the anime/manga object of a row, materialized from the columns unless all rows are """
+        if self.rows is not None:
+            return self.rows[i]
+        return self.entry_class.from_values([column.get(i) for column in self.columns.values()])
+
+    def get_rows(self) -> list:
+        """ Get the anime/manga objects of all rows, materialized column by column on first use """
+        if self.rows is None:
+            if self.entry_class is None:
+                self.rows = list()
+            else:
+                # Construction: Columns are in `FIELDS` order, the positional order of the constructor
+                self.rows = list(map(self.entry_class, *[column.iter_values() for column in self.columns.values()]))
+
+        return self.rows
+
+    def reindex(self) -> None:
+        """ Rebuild the anime/manga ID to row index """
+        if self.entry_class is None:
+            self.index = dict()
+        else:
+            self.index = {j: i for i, j in enumerate(self.columns[self.ID_FIELDS[self.entry_class]].iter_values())}
+        self.counters.clear()
+        self.summaries.clear()
+        self.groupings.clear()
+        self.members.clear()
+        self.masks.clear()
+        self.status_counts = None
+
+    def entry_added(self, entry: Entry) -> None:
+        """ Hook: Also drop the cached row masks and count the status """
+        self.masks.clear()
+        if self.status_counts is not None:
+            self.status_counts[entry.my_status] += 1
+        super().entry_added(entry)
+
+    def entry_removed(self, entry: Entry) -> None:
+        """ Hook: Also drop the cached row masks and uncount the status """
+        self.masks.clear()
+        if self.status_counts is not None:
+            self.status_counts[entry.my_status] -= 1
+        super().entry_removed(entry)
+
+    def add_entry(self, entry: Entry) -> None:
+        """ Add anime/manga object to the anime/manga list by object """
+        self.index[entry.entry_id] = self.row_count
+        self.append_row(entry)
+        if self.rows is not None:
+            self.rows.append(entry)
+        self.entry_added(entry)
+
+    def upsert_entry(self, entry: Entry) -> Entry:
+        """ Add anime/manga object, or replace the one with the same anime/manga ID, returns the replaced object """
+        position = self.index.get(entry.entry_id)
+
+        if position is None:
+            self.add_entry(entry)
+            return None
+
+        old_entry = self.get_row(position)
+        for i in self.columns:
+            self.columns[i].set(position, getattr(entry, i))
+        if self.rows is not None:
+            self.rows[position] = entry
+        self.entry_removed(old_entry)
+        self.entry_added(entry)
+        return old_entry
+
+    def get_entry(self, entry_id: int) -> Entry:
+        """ Get anime/manga object from the anime/manga list by anime/manga ID """
+        position = self.index.get(entry_id)
+
+        if position is None:
+            return None
+        return self.get_row(position)
+
+    def get_entries_at(self, positions: list) -> list:
+        """ Get anime/manga objects by row numbers """
+        rows = self.get_rows()
+        return [rows[i] for i in positions]
+
+    def build_members(self, field: str) -> dict:
+        """ Build value to anime/manga ID set memberships of a field straight from its column """
+        if field not in self.columns:
+            return super().build_members(field)
+
+        members = dict()
+        for entry_id, value in zip(self.columns[self.ID_FIELDS[self.entry_class]].iter_values(), self.columns[field].iter_values()):
+            if value in members:
+                members[value].add(entry_id)
+            else:
+                members[value] = {entry_id}
+
+        return members
+
+    def delete_entry(self, entry_id: int) -> Entry:
+        """ Delete anime/manga object from the anime/manga list by anime/manga ID, moving the last row into its place """
+        position = self.index.pop(entry_id, None)
+
+        if position is None:
+            return None
+
+        entry = self.get_row(position)
+        last = self.row_count - 1
+
+        if position < last:
+            for column in self.columns.values():
+                column.set(position, column.get(last))
+            self.index[self.columns[self.ID_FIELDS[self.entry_class]].get(position)] = position
+            if self.rows is not None:
+                self.rows[position] = self.rows[last]
+
+        for column in self.columns.values():
+            column.pop()
+        if self.rows is not None:
+            self.rows.pop()
+        self.row_count -= 1
+        self.entry_removed(entry)
+
+        return entry
+
+    def count(self, key: str) -> int:
+        """ Count anime/manga with a specific status, from status counts counted once and kept in step with modifications """
+        if key == 'all':
+            return self.row_count
+        elif self.entry_class is None:
+            return 0
+
+        if self.status_counts is None:
+            self.status_counts = self.count_values(self.columns['my_status'])
+        return self.status_counts[key.title().replace('To', 'to')]
+
+    def get_mask(self, include_unscored: bool=False, apply_status: bool=True) -> bytes:
+        """ Get one inclusion byte (0 or 1) per row for the list settings, cached until the list is modified """
+        key = (include_unscored, apply_status) + self.get_flags()
+
+        if key not in self.masks:
+            mask = None
+
+            if apply_status:
+                excluded = self.get_excluded_statuses()
+                mask = self.get_value_mask(self.columns['my_status'], lambda i: i not in excluded)
+
+            if not include_unscored:
+                scored = self.get_value_mask(self.columns['my_score'], lambda i: i != 0)
+                mask = scored if mask is None else and_bytes(mask, scored)
+
+            self.masks[key] = b'\x01' * self.row_count if mask is None else mask
+
+        return self.masks[key]
+
+    def get_value_mask(self, column, condition) -> bytes:
+        """ Get one byte per row of whether its value meets a condition, translating byte codes in C when the column has them """
+        byte_codes = column.get_byte_codes()
+
+        if byte_codes is None:
+            return bytes(1 if condition(i) else 0 for i in column.iter_values())
+
+        codes, values = byte_codes
+        table = bytes(1 if condition(i) else 0 for i in values).ljust(256, b'\x00')
+        return codes.translate(table)
+
+    def get_list(self, include_unscored: bool=False) -> list:
+        """ Get anime/manga list, the rows in the cached mask """
+        return list(compress(self.get_rows(), self.get_mask(include_unscored=include_unscored)))
+
+    def get_full_list(self, include_unscored: bool=False) -> list:
+        """ Get full anime/manga list """
+        if include_unscored:
+            return list(self.get_rows())
+        return list(compress(self.get_rows(), self.get_mask(include_unscored=False, apply_status=False)))
+
+    def get_field_list(self, fields: list, include_unscored: bool=False) -> tuple:
+        """ Get anime/manga list records holding at least the fields, with a getter factory of their fields, as (tuples of only the fields read straight from their columns, `itemgetter` factory) here """
+        fields = list(dict.fromkeys(fields))
+
+        if self.entry_class is None or any(i not in self.columns for i in fields):
+            return super().get_field_list(fields, include_unscored=include_unscored)
+
+        mask = self.get_mask(include_unscored=include_unscored)
+        rows = list(zip(*[compress(self.columns[i].iter_values(), mask) for i in fields]))
+
+        return rows, lambda *names: itemgetter(*[fields.index(i) for i in names])
+
+    def get_groups(self, group_by: str='series_type', fields: list=None, include_unscored: bool=False) -> dict:
+        """ Get anime/manga objects, or lists of the values of the fields, by category in order of first appearance, with one byte mask per category when grouping by a byte-coded column """
+        byte_codes = self.columns[group_by].get_byte_codes() if isinstance(group_by, str) and group_by in self.columns else None
+        if byte_codes is None or any(i not in self.columns for i in fields or list()):
+            return super().get_groups(group_by=group_by, fields=fields, include_unscored=include_unscored)
+
+        codes, values = byte_codes
+        mask = self.get_mask(include_unscored=include_unscored)
+        sources = [self.get_rows()] if fields is None else [list(self.columns[i].iter_values()) for i in fields]
+
+        # Category Masks: Rows of each present code among the listed rows, categories ordered by their first row
+        category_masks = list()
+        for code in set(compress(codes, mask)):
+            table = bytes(256)[:code] + b'\x01' + bytes(255 - code)
+            category_mask = and_bytes(codes.translate(table), mask)
+            category_masks.append((category_mask.find(1), values[code], category_mask))
+        category_masks.sort(key=itemgetter(0))
+
+        grouped = dict()
+        for _, category, category_mask in category_masks:
+            if fields is None:
+                grouped[category] = list(compress(sources[0], category_mask))
+            else:
+                grouped[category] = list(map(list, zip(*[compress(i, category_mask) for i in sources])))
+
+        return grouped
+
+    def get_scores(self, include_unscored: bool=False) -> list:
+        """ Get anime/manga scores """
+        if self.entry_class is None:
+            return list()
+
+        return list(compress(self.columns['my_score'].iter_values(), self.get_mask(include_unscored=include_unscored)))
+
+    def get_counts(self, field: str, include_unscored: bool=False) -> Counter:
+        """ Get value counts of a field over `get_list`, counted straight from its column """
+        key = (field, include_unscored) + self.get_flags()
+
+        if field not in self.columns:
+            return super().get_counts(field, include_unscored=include_unscored)
+        if key not in self.counters:
+            self.counters[key] = self.count_values(self.columns[field], self.get_mask(include_unscored=include_unscored))
+
+        return self.counters[key]
+
+    def count_values(self, column, mask: bytes=None) -> Counter:
+        """ Count the values of a column over the rows in a mask, or all rows, with one C-level byte count per code when the column has byte codes """
+        byte_codes = column.get_byte_codes()
+
+        if byte_codes is None:
+            return Counter(column.iter_values() if mask is None else compress(column.iter_values(), mask))
+
+        # Masking: Codes of excluded rows become zero, so zero codes are counted by difference
+        codes, values = byte_codes
+        masked = codes if mask is None else and_bytes(codes, mask.translate(FULL_BYTES))
+        counts = Counter()
+        for code in range(1, len(values)):
+            count = masked.count(code)
+            if count > 0:
+                counts[values[code]] = count
+
+        zero_count = (self.row_count if mask is None else mask.count(1)) - sum(counts.values())
+        if zero_count > 0:
+            counts[values[0]] = zero_count
+
+        return counts
+
+
+def and_bytes(first: bytes, second: bytes) -> bytes:
+    """ Bitwise AND two equally long byte strings as big integers """
+    return (int.from_bytes(first, 'little') & int.from_bytes(second, 'little')).to_bytes(len(first), 'little')
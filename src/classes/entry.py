@@ -5,6 +5,19 @@
 
 class Entry:
     """ Entry class """
+    __slots__ = (
+        'my_id',
+        'my_start_date',
+        'my_finish_date',
+        'my_score',
+        'my_storage',
+        'my_status',
+        'my_comments',
+        'my_tags',
+        'update_on_import'
+    )
+    FIELDS = __slots__
+
     def __init__(
         self,
         my_id=None,
@@ -17,6 +30,7 @@ class Entry:
         my_tags=None,
         update_on_import=None
     ):
+        """ Constructor """
         self.my_id = my_id
         self.my_start_date = my_start_date
         self.my_finish_date = my_finish_date
@@ -27,9 +41,54 @@ class Entry:
         self.my_tags = my_tags
         self.update_on_import = update_on_import
 
+    @classmethod
+    def from_values(cls, values):
+        """ Construct from a sequence of values in `FIELDS` order, the positional order of the constructor """
+        return cls(*values)
+
+    def get_values(self) -> tuple:
+        """ Get a tuple of values in `FIELDS` order """
+        return tuple(getattr(self, i) for i in self.FIELDS)
+
 
 class Anime(Entry):
     """ Anime class """
+    __slots__ = (
+        'series_animedb_id',
+        'series_title',
+        'series_type',
+        'series_episodes',
+        'my_watched_episodes',
+        'my_rated',
+        'my_dvd',
+        'my_times_watched',
+        'my_rewatch_value',
+        'my_rewatching',
+        'my_rewatching_ep'
+    )
+    FIELDS = (
+        'series_animedb_id',
+        'series_title',
+        'series_type',
+        'series_episodes',
+        'my_id',
+        'my_watched_episodes',
+        'my_start_date',
+        'my_finish_date',
+        'my_rated',
+        'my_score',
+        'my_dvd',
+        'my_storage',
+        'my_status',
+        'my_comments',
+        'my_times_watched',
+        'my_rewatch_value',
+        'my_tags',
+        'my_rewatching',
+        'my_rewatching_ep',
+        'update_on_import'
+    )
+
     def __init__(
         self,
         series_animedb_id=None,
@@ -54,32 +113,67 @@ class Anime(Entry):
         update_on_import=None
     ):
         """ Constructor """
-        super().__init__(
-            my_id=my_id,
-            my_start_date=my_start_date,
-            my_finish_date=my_finish_date,
-            my_score=my_score,
-            my_storage=my_storage,
-            my_status=my_status,
-            my_comments=my_comments,
-            my_tags=my_tags,
-            update_on_import=update_on_import
-        )
         self.series_animedb_id = series_animedb_id
         self.series_title = series_title
         self.series_type = series_type
         self.series_episodes = series_episodes
+        self.my_id = my_id
         self.my_watched_episodes = my_watched_episodes
+        self.my_start_date = my_start_date
+        self.my_finish_date = my_finish_date
         self.my_rated = my_rated
+        self.my_score = my_score
         self.my_dvd = my_dvd
+        self.my_storage = my_storage
+        self.my_status = my_status
+        self.my_comments = my_comments
         self.my_times_watched = my_times_watched
         self.my_rewatch_value = my_rewatch_value
+        self.my_tags = my_tags
         self.my_rewatching = my_rewatching
         self.my_rewatching_ep = my_rewatching_ep
+        self.update_on_import = update_on_import
+
+    @property
+    def entry_id(self) -> int:
+        """ Anime ID used as the entry key """
+        return self.series_animedb_id
 
 
 class Manga(Entry):
     """ Manga class """
+    __slots__ = (
+        'manga_mangadb_id',
+        'manga_title',
+        'manga_volumes',
+        'manga_chapters',
+        'my_read_volumes',
+        'my_read_chapters',
+        'my_scanalation_group',
+        'my_times_read',
+        'my_reread_value'
+    )
+    FIELDS = (
+        'manga_mangadb_id',
+        'manga_title',
+        'manga_volumes',
+        'manga_chapters',
+        'my_id',
+        'my_read_volumes',
+        'my_read_chapters',
+        'my_start_date',
+        'my_finish_date',
+        'my_scanalation_group',
+        'my_score',
+        'my_storage',
+        'my_status',
+        'my_comments',
+        'my_times_read',
+        'my_tags',
+        'my_reread_value',
+        'update_on_import'
+    )
+
     def __init__(
         self,
         manga_mangadb_id=None,
@@ -102,23 +196,26 @@ class Manga(Entry):
         update_on_import=None
     ):
         """ Constructor """
-        super().__init__(
-            my_id=my_id,
-            my_start_date=my_start_date,
-            my_finish_date=my_finish_date,
-            my_score=my_score,
-            my_storage=my_storage,
-            my_status=my_status,
-            my_comments=my_comments,
-            my_tags=my_tags,
-            update_on_import=update_on_import
-        )
         self.manga_mangadb_id = manga_mangadb_id
         self.manga_title = manga_title
         self.manga_volumes = manga_volumes
         self.manga_chapters = manga_chapters
+        self.my_id = my_id
         self.my_read_volumes = my_read_volumes
         self.my_read_chapters = my_read_chapters
+        self.my_start_date = my_start_date
+        self.my_finish_date = my_finish_date
         self.my_scanalation_group = my_scanalation_group
+        self.my_score = my_score
+        self.my_storage = my_storage
+        self.my_status = my_status
+        self.my_comments = my_comments
         self.my_times_read = my_times_read
+        self.my_tags = my_tags
         self.my_reread_value = my_reread_value
+        self.update_on_import = update_on_import
+
+    @property
+    def entry_id(self) -> int:
+        """ Manga ID used as the entry key """
+        return self.manga_mangadb_id
@@ -3,16 +3,21 @@
 """
 
 from src.utils import error
-from src.classes.entry import Entry, Anime, Manga
+from src.classes.entry import Entry
+from src.classes.query import Query
+from src.classes.summary import Summary
+from src.profiler import profiler
 
-from math import ceil, floor, sqrt
+from collections import Counter
+from math import ceil, floor
+from operator import attrgetter
 
 
 class List:
     """ User anime/manga list class """
     def __init__(
         self,
-        data: list=list(),
+        data: list=None,
         include_current: bool=False,
         include_onhold: bool=False,
         include_dropped: bool=False,
@@ -20,60 +25,232 @@ class List:
         tag_rules: list=None
     ):
         """ Constructor """
-        self.data = data
+        self.data = list() if data is None else data
         self.include_current = include_current
         self.include_onhold = include_onhold
         self.include_dropped = include_dropped
         self.include_planned = include_planned
         self.tag_rules = tag_rules
+        self.index = dict()
+        self.counters = dict()
+        self.summaries = dict()
+        self.groupings = dict()
+        self.members = dict()
+
+        self.reindex()
+
+    @classmethod
+    def from_values(
+        cls,
+        entry_class: type,
+        rows,
+        include_current: bool=False,
+        include_onhold: bool=False,
+        include_dropped: bool=False,
+        include_planned: bool=False
+    ):
+        """ Create anime/manga list from rows of anime/manga values in field order """
+        return cls(
+            data=[entry_class.from_values(i) for i in rows],
+            include_current=include_current,
+            include_onhold=include_onhold,
+            include_dropped=include_dropped,
+            include_planned=include_planned
+        )
+
+    def reindex(self) -> None:
+        """ Rebuild the anime/manga ID to position index, required after modifying `data` directly """
+        self.index = {self.data[i].entry_id: i for i in range(len(self.data))}
+        self.counters.clear()
+        self.summaries.clear()
+        self.groupings.clear()
+        self.members.clear()
+
+    def entry_added(self, entry: Entry) -> None:
+        """ Hook: Keep cached counters and membership sets in step with an added anime/manga object """
+        self.update_counters(entry, 1)
+
+        for field, members in self.members.items():
+            value = getattr(entry, field, None)
+            if value in members:
+                members[value].add(entry.entry_id)
+            else:
+                members[value] = {entry.entry_id}
+
+    def entry_removed(self, entry: Entry) -> None:
+        """ Hook: Keep cached counters and membership sets in step with a removed anime/manga object """
+        self.update_counters(entry, -1)
+
+        for field, members in self.members.items():
+            members.get(getattr(entry, field, None), set()).discard(entry.entry_id)
+
+    def update_counters(self, entry: Entry, step: int) -> None:
+        """ Add a step to the cached counters and grouped counters an anime/manga object is counted in, dropping ones of other include settings """
+        flags = self.get_flags()
+
+        for key in list(self.counters):
+            if key[2:] != flags:
+                del self.counters[key]
+            elif self.is_listed(entry, include_unscored=key[1]):
+                self.counters[key][getattr(entry, key[0])] += step
+
+        for key in list(self.groupings):
+            if key[3:] != flags:
+                del self.groupings[key]
+            elif self.is_listed(entry, include_unscored=key[2]):
+                groups = self.groupings[key]
+                category = tuple(getattr(entry, i) for i in key[0]) if isinstance(key[0], tuple) else getattr(entry, key[0])
+                value = getattr(entry, key[1])
+
+                # Procedure: Drop emptied counts and categories, new categories go last
+                counts = groups.setdefault(category, Counter())
+                counts[value] += step
+                if counts[value] == 0:
+                    del counts[value]
+                    if len(counts) == 0:
+                        del groups[category]
+
+        self.summaries.clear()
 
     def add_entry(self, entry: Entry) -> None:
         """ Add anime/manga object to the anime/manga list by object """
+        self.index[entry.entry_id] = len(self.data)
         self.data.append(entry)
+        self.entry_added(entry)
 
-    def get_entry(self, entry_id: str) -> Entry:
+    def upsert_entry(self, entry: Entry) -> Entry:
+        """ Add anime/manga object, or replace the one with the same anime/manga ID, returns the replaced object """
+        position = self.index.get(entry.entry_id)
+
+        if position is None:
+            self.add_entry(entry)
+            return None
+
+        old_entry = self.data[position]
+        self.data[position] = entry
+        self.entry_removed(old_entry)
+        self.entry_added(entry)
+        return old_entry
+
+    def get_entry(self, entry_id: int) -> Entry:
         """ Get anime/manga object from the anime/manga list by anime/manga ID """
-        for i in range(len(self.data)):
-            if isinstance(self.data[i], Anime) and self.data[i].series_animedb_id == entry_id:
-                return self.data[i]
-            elif isinstance(self.data[i], Manga) and self.data[i].manga_mangadb_id == entry_id:
-                return self.data[i]
+        position = self.index.get(entry_id)
+
+        if position is None:
+            return None
+        return self.data[position]
+
+    def delete_entry(self, entry_id: int) -> Entry:
+        """ Delete anime/manga object from the anime/manga list by anime/manga ID, moving the last object into its place """
+        position = self.index.pop(entry_id, None)
+
+        if position is None:
+            return None
+
+        entry = self.data[position]
+        last_entry = self.data.pop()
+        self.entry_removed(entry)
 
-        return None
+        if position < len(self.data):
+            self.data[position] = last_entry
+            self.index[last_entry.entry_id] = position
 
-    def delete_entry(self, entry_id: str) -> Entry:
-        """ Delete anime/manga object from the anime/manga list by anime/manga ID """
-        for i in range(len(self.data)):
-            if isinstance(self.data[i], Anime) and self.data[i].series_animedb_id == entry_id:
-                return self.data.pop(i)
-            elif isinstance(self.data[i], Manga) and self.data[i].manga_mangadb_id == entry_id:
-                return self.data.pop(i)
+        return entry
 
-        return None
+    def get_entries_at(self, positions: list) -> list:
+        """ Get anime/manga objects by positions """
+        return [self.data[i] for i in positions]
+
+    def get_entries(self, entry_ids: list) -> list:
+        """ Get anime/manga objects by anime/manga IDs, None for missing IDs """
+        return [self.get_entry(i) for i in entry_ids]
+
+    def upsert_entries(self, entries: list) -> list:
+        """ Add or replace anime/manga objects, returns the replaced objects """
+        return [self.upsert_entry(i) for i in entries]
+
+    def delete_entries(self, entry_ids: list) -> list:
+        """ Delete anime/manga objects by anime/manga IDs, returns the deleted objects """
+        return [self.delete_entry(i) for i in entry_ids]
+
+    def get_members(self, field: str) -> dict:
+        """ Get value to anime/manga ID set memberships of a field, built on first use and kept in step with modifications """
+        if field not in self.members:
+            self.members[field] = self.build_members(field)
+
+        return self.members[field]
+
+    def build_members(self, field: str) -> dict:
+        """ Build value to anime/manga ID set memberships of a field """
+        members = dict()
+        for i in self.data:
+            value = getattr(i, field, None)
+            if value in members:
+                members[value].add(i.entry_id)
+            else:
+                members[value] = {i.entry_id}
+
+        return members
+
+    def query(self) -> Query:
+        """ Get a query over the whole anime/manga list, such as `query().status('Completed').type('TV').score(7)` """
+        return Query(self)
 
     def count(self, key: str) -> int:
         """ Count anime/manga with a specific status """
         if key == 'all':
             return len(self.data)
-        elif key.title().replace('To', 'to') in ('Watching', 'Reading', 'Completed', 'On-Hold', 'Dropped', 'Plan to Watch', 'Plan to Read'):
-            return len([i for i in self.data if i.my_status == key.title().replace('To', 'to')])
+
+        status = key.title().replace('To', 'to')
+        if status in ('Watching', 'Reading', 'Completed', 'On-Hold', 'Dropped', 'Plan to Watch', 'Plan to Read'):
+            return len(self.get_members('my_status').get(status, ()))
         return 0
 
+    def get_flags(self) -> tuple:
+        """ Get the include settings of the anime/manga list """
+        return (self.include_current, self.include_onhold, self.include_dropped, self.include_planned)
+
+    def is_listed(self, entry: Entry, include_unscored: bool=False) -> bool:
+        """ Check whether an anime/manga object is included in `get_list` """
+        return (
+            (entry.my_status != 'Watching' or self.include_current)
+            and (entry.my_status != 'On-Hold' or self.include_onhold)
+            and (entry.my_status != 'Dropped' or self.include_dropped)
+            and (entry.my_status != 'Plan to Watch' or self.include_planned)
+            and (entry.my_score != 0 or include_unscored)
+        )
+
+    def get_excluded_statuses(self) -> set:
+        """ Get the statuses left out of `get_list` by the include settings """
+        excluded = set()
+        if not self.include_current:
+            excluded.add('Watching')
+        if not self.include_onhold:
+            excluded.add('On-Hold')
+        if not self.include_dropped:
+            excluded.add('Dropped')
+        if not self.include_planned:
+            excluded.add('Plan to Watch')
+
+        return excluded
+
     def get_list(self, include_unscored: bool=False) -> list:
         """ Get anime/manga list """
-        return [
-            i for i in self.data
-            if (i.my_status != 'Watching' or self.include_current)
-            and (i.my_status != 'On-Hold' or self.include_onhold)
-            and (i.my_status != 'Dropped' or self.include_dropped)
-            and (i.my_status != 'Plan to Watch' or self.include_planned)
-            and (i.my_score != 0 or include_unscored)
-        ]
+        excluded = self.get_excluded_statuses()
+
+        if include_unscored:
+            return [i for i in self.data if i.my_status not in excluded]
+        return [i for i in self.data if i.my_score != 0 and i.my_status not in excluded]
 
     def get_full_list(self, include_unscored: bool=False) -> list:
         """ Get full anime/manga list """
         return [i for i in self.data if i.my_score != 0 or include_unscored]
 
+    def get_field_list(self, fields: list, include_unscored: bool=False) -> tuple:
+        """ Get anime/manga list records holding at least the fields, with a getter factory of their fields, as (anime/manga objects, `attrgetter`) here """
+        return self.get_list(include_unscored=include_unscored), attrgetter
+
+    @profiler.timed()
     def get_grouped_list(
         self,
         include_unscored: bool=False,
@@ -81,72 +258,140 @@ class List:
         sort_method: str='most_common',
         sort_order: str='descending',
         manual_sort: list=None,
-        disassemble_key: str=None
+        disassemble_key: list=None
     ) -> dict:
-        """ Get grouped anime/manga list """
-        grouped_entry_list = dict()
-        categories = list()
-
-        filtered_entry_list = self.get_list(include_unscored=include_unscored)
+        """ Get grouped anime/manga list, grouping by a tuple of values when `group_by` is a list of attributes """
+        # Exception Case: Invalid sort method
+        if sort_method not in ('most_common', 'alphabetical'):
+            error('Invalid sort_method `{}` of get_grouped_list().'.format(sort_method))
+            return None
 
-        # Category Retrieval
-        for _ in filtered_entry_list:
-            if eval('_.{}'.format(group_by)) not in categories:
-                categories.append(eval('_.{}'.format(group_by)))
+        # Category Retrieval and Packing: Only the disassembled fields are needed when disassembling
+        grouped_entry_list = self.get_groups(group_by=group_by, fields=disassemble_key, include_unscored=include_unscored)
 
         # Category Sorting
-        if sort_method == 'most_common':
-            categories.sort(
-                key=lambda i: [eval('j.{}'.format(group_by)) for j in filtered_entry_list].count(i),
-                reverse=sort_order != 'ascending'
-            )
-        elif sort_method == 'alphabetical':
-            categories.sort(
-                reverse=sort_order != 'ascending'
-            )
-        else:
-            error('Invalid sort_method `{}` of get_grouped_list().'.format(sort_method))
+        categories = self.sort_categories(
+            {i: len(grouped_entry_list[i]) for i in grouped_entry_list},
+            group_by=group_by,
+            sort_method=sort_method,
+            sort_order=sort_order,
+            manual_sort=manual_sort
+        )
+        if categories is None:
             return None
 
-        # Manual Sort Override
-        if manual_sort != None:
-            old_categories = [i for i in categories]
-            categories = list()
+        # Return
+        return {i: grouped_entry_list[i] for i in categories}
 
-            for i in manual_sort:
-                if i in old_categories:
-                    categories.append(i)
-                    old_categories.remove(i)
+    def get_groups(self, group_by: str='series_type', fields: list=None, include_unscored: bool=False) -> dict:
+        """ Get anime/manga objects, or lists of the values of the fields, by category in order of first appearance """
+        multi_key = isinstance(group_by, (list, tuple))
 
-            categories += old_categories
+        if fields is None:
+            entry_list, getter = self.get_list(include_unscored=include_unscored), attrgetter
+        else:
+            entry_list, getter = self.get_field_list(list(group_by if multi_key else [group_by]) + list(fields), include_unscored=include_unscored)
 
-        # Packing Categories
-        for i in categories:
-            grouped_entry_list[i] = [j for j in filtered_entry_list if eval('j.{}'.format(group_by)) == i]
+        category_of = getter(*group_by) if multi_key else getter(group_by)
+        if multi_key and len(group_by) == 1:
+            category_of = lambda i, single=category_of: (single(i),)
 
-        # Desired Data Retrieval
-        if disassemble_key != None:
-            for i in grouped_entry_list:
-                for j in range(len(grouped_entry_list[i])):
-                    temp = ['grouped_entry_list[i][j].{}'.format(k) for k in disassemble_key]
-                    for k in range(len(temp)):
-                        temp[k] = eval(temp[k])
-                    grouped_entry_list[i][j] = temp
+        grouped = dict()
+        for i in entry_list:
+            category = category_of(i)
+            if category in grouped:
+                grouped[category].append(i)
+            else:
+                grouped[category] = [i]
+
+        # Projection: Only the values of the fields are kept
+        if fields is not None:
+            project = getter(*fields)
+            if len(fields) == 1:
+                return {i: [[project(j)] for j in grouped[i]] for i in grouped}
+            return {i: [list(project(j)) for j in grouped[i]] for i in grouped}
+
+        return grouped
+
+    def sort_categories(self, sizes: dict, group_by: str='series_type', sort_method: str='most_common', sort_order: str='descending', manual_sort: list=None) -> list:
+        """ Sort categories by their sizes or alphabetically, then by the manual sort, categories of equal keys keep their order """
+        multi_key = isinstance(group_by, (list, tuple))
+
+        # Exception Case: A multiple attribute manual sort needs one order per attribute
+        if manual_sort is not None and multi_key and (
+            not isinstance(manual_sort, (list, tuple))
+            or len(manual_sort) != len(group_by)
+            or any(not isinstance(i, (list, tuple)) for i in manual_sort)
+        ):
+            error('Invalid manual_sort `{}` of sort_categories().'.format(manual_sort))
+            return None
 
-        # Return
-        return grouped_entry_list
+        categories = list(sizes)
+
+        if sort_method == 'most_common':
+            categories.sort(key=lambda i: sizes[i], reverse=sort_order != 'ascending')
+        elif sort_method == 'alphabetical':
+            categories.sort(reverse=sort_order != 'ascending')
+
+        # Manual Sort Override: One order per attribute when grouping by multiple attributes
+        if manual_sort is not None:
+            if multi_key:
+                ranks = [self.get_ranks(i) for i in manual_sort]
+                categories.sort(key=lambda i: tuple(ranks[j].get(i[j], len(ranks[j])) for j in range(len(ranks))))
+            else:
+                rank = self.get_ranks(manual_sort)
+                categories.sort(key=lambda i: rank.get(i, len(rank)))
+
+        return categories
+
+    def get_grouped_counts(self, group_by: str='series_type', field: str='my_score', include_unscored: bool=False) -> dict:
+        """ Get value counts of a field per category of `get_list`, cached and updated in place as the list is modified """
+        multi_key = isinstance(group_by, (list, tuple))
+        key = (tuple(group_by) if multi_key else group_by, field, include_unscored) + self.get_flags()
+
+        if key not in self.groupings:
+            entry_list, getter = self.get_field_list(list(group_by if multi_key else [group_by]) + [field], include_unscored=include_unscored)
+            category_of = getter(*group_by) if multi_key else getter(group_by)
+            if multi_key and len(group_by) == 1:
+                category_of = lambda i, single=category_of: (single(i),)
+            value_of = getter(field)
+
+            groups = dict()
+            for i in entry_list:
+                category = category_of(i)
+                if category in groups:
+                    groups[category][value_of(i)] += 1
+                else:
+                    groups[category] = Counter({value_of(i): 1})
+            self.groupings[key] = groups
+
+        return self.groupings[key]
+
+    def get_ranks(self, order: list) -> dict:
+        """ Get positions of values in a manual sort order, keeping the first position of duplicates """
+        ranks = dict()
+        for i in order or list():
+            ranks.setdefault(i, len(ranks))
+        return ranks
 
     def get_scores(self, include_unscored: bool=False) -> list:
         """ Get anime/manga scores """
         return [i.my_score for i in self.get_list(include_unscored=include_unscored)]
 
+    def get_counts(self, field: str, include_unscored: bool=False) -> Counter:
+        """ Get value counts of a field over `get_list`, cached and updated in place as the list is modified """
+        key = (field, include_unscored) + self.get_flags()
+
+        if key not in self.counters:
+            self.counters[key] = Counter(map(attrgetter(field), self.get_list(include_unscored=include_unscored)))
+
+        return self.counters[key]
+
     def get_summed_scores(self, include_unscored: bool=False) -> list:
         """ Get summed anime/manga scores """
-        return [
-            self.get_scores(include_unscored=include_unscored).count(i)
-            for i in range(1 - include_unscored, 11)
-        ]
+        return self.summary(include_unscored=include_unscored).get_summed_scores(include_unscored=include_unscored)
 
+    @profiler.timed()
     def get_grouped_scores(
         self,
         include_unscored: bool=False,
@@ -170,6 +415,7 @@ class List:
 
         return grouped_entry_list
 
+    @profiler.timed()
     def get_summed_grouped_scores(
         self,
         include_unscored: bool=False,
@@ -178,50 +424,58 @@ class List:
         sort_order: str='descending',
         manual_sort: bool=None
     ) -> dict:
-        """ Get summed grouped anime/manga scores """
-        scores = self.get_grouped_scores(
-            include_unscored=include_unscored,
+        """ Get summed grouped anime/manga scores, from the cached grouped score counts """
+        # Exception Case: Invalid sort method
+        if sort_method not in ('most_common', 'alphabetical'):
+            error('Invalid sort_method `{}` of get_summed_grouped_scores().'.format(sort_method))
+            return None
+
+        groups = self.get_grouped_counts(group_by=group_by, field='my_score', include_unscored=False)
+        categories = self.sort_categories(
+            {i: sum(groups[i].values()) for i in groups},
             group_by=group_by,
             sort_method=sort_method,
             sort_order=sort_order,
             manual_sort=manual_sort
         )
+        if categories is None:
+            return None
 
-        for i in scores:
-            scores[i] = [scores[i].count(j) for j in range(1 - include_unscored, 11)]
+        return {i: [groups[i][j] for j in range(1 - include_unscored, 11)] for i in categories}
 
-        return scores
+    @profiler.timed()
+    def summary(self, include_unscored: bool=False) -> Summary:
+        """ Get anime/manga list score statistics, computed from the cached score counts """
+        key = (include_unscored,) + self.get_flags()
+
+        if key not in self.summaries:
+            self.summaries[key] = Summary(self.get_counts('my_score', include_unscored=include_unscored))
+
+        return self.summaries[key]
 
     def get_min(self) -> int:
         """ Get a minimum of the anime/manga list scores """
-        return min(self.get_scores())
+        return self.summary().min
 
     def get_max(self) -> int:
         """ Get a maximum of the anime/manga list scores """
-        return max(self.get_scores())
+        return self.summary().max
 
     def get_average(self) -> float:
         """ Get an average of the anime/manga list scores """
-        scores = self.get_scores()
-        return sum(scores) / len(scores)
+        return self.summary().mean
 
     def get_median(self) -> int:
         """ Get a median of the anime/manga list scores """
-        scores = sorted(self.get_scores())
-
-        if len(scores) % 2 == 0:
-            return (scores[len(scores) // 2 - 1] + scores[len(scores) // 2]) / 2
-        return scores[len(scores) // 2]
+        return self.summary().median
 
     def get_mode(self) -> int:
         """ Get a mode of the anime/manga list scores """
-        return max(self.get_summed_scores())
+        return self.summary().mode
 
     def get_sd(self) -> float:
         """ Get a standard deviation of the anime/manga list scores """
-        scores = self.get_scores()
-
-        return sqrt(sum([(i - self.get_average()) ** 2 for i in scores]) / len(scores))
+        return self.summary().sd
 
     def get_partial(self, percentage: float, part: str='top', rounding_method: str='roundx', include_unscored: bool=False) -> list:
         """ Get partial anime/manga list """
@@ -0,0 +1,72 @@
+"""
+    `classes/query.py`
+"""
+
+
+class Query:
+    """ Composable anime/manga list query class, resolved against the membership sets of the list """
+    def __init__(self, entry_list, includes: tuple=(), excludes: tuple=()):
+        """ Constructor, `includes` and `excludes` hold (field, values) conditions """
+        self.entry_list = entry_list
+        self.includes = includes
+        self.excludes = excludes
+
+    def where(self, field: str, *values):
+        """ Get a query also requiring the field to be one of the values """
+        return Query(self.entry_list, self.includes + ((field, values),), self.excludes)
+
+    def exclude(self, field: str, *values):
+        """ Get a query also requiring the field to be none of the values """
+        return Query(self.entry_list, self.includes, self.excludes + ((field, values),))
+
+    def status(self, *statuses):
+        """ Get a query also requiring one of the statuses """
+        return self.where('my_status', *statuses)
+
+    def type(self, *series_types):
+        """ Get a query also requiring one of the series types """
+        return self.where('series_type', *series_types)
+
+    def score(self, minimum: int=0, maximum: int=10):
+        """ Get a query also requiring a score within the range, inclusive """
+        return self.where('my_score', *range(minimum, maximum + 1))
+
+    def scored(self):
+        """ Get a query also requiring a score """
+        return self.exclude('my_score', 0)
+
+    def get_ids(self) -> set:
+        """ Get anime/manga IDs of the results, starting from the smallest condition and narrowing it down value by value """
+        conditions = [self.get_sets(field, values) for field, values in self.includes]
+        conditions.sort(key=lambda i: sum(map(len, i)))
+
+        if len(conditions) == 0:
+            ids = set(self.entry_list.index)
+        else:
+            ids = set().union(*conditions[0])
+            for sets in conditions[1:]:
+                ids = set().union(*[ids & i for i in sets])
+
+        for field, values in self.excludes:
+            for i in self.get_sets(field, values):
+                ids = ids.difference(i)
+
+        return ids
+
+    def get_sets(self, field: str, values: tuple) -> list:
+        """ Get anime/manga ID sets of a field being each of the values """
+        members = self.entry_list.get_members(field)
+        return [members[i] for i in values if i in members]
+
+    def get_positions(self) -> list:
+        """ Get positions of the results in the list order """
+        index = self.entry_list.index
+        return sorted([index[i] for i in self.get_ids()])
+
+    def get_list(self) -> list:
+        """ Get anime/manga objects of the results in the list order """
+        return self.entry_list.get_entries_at(self.get_positions())
+
+    def count(self) -> int:
+        """ Count the results """
+        return len(self.get_ids())
@@ -0,0 +1,55 @@
+"""
+    `classes/summary.py`
+"""
+
+from math import sqrt
+
+
+class Summary:
+    """ Score statistics summary class """
+    def __init__(self, histogram: dict):
+        """ Constructor, computes all statistics from a score to count histogram """
+        self.histogram = {i: histogram[i] for i in sorted(histogram) if histogram[i] > 0}
+        self.count = 0
+        self.min = None
+        self.max = None
+        self.mean = None
+        self.median = None
+        self.sd = None
+        self.mode = None
+
+        # Exception Case: No scores
+        if len(self.histogram) == 0:
+            return
+
+        # Weighted Welford Update: One step per distinct score
+        mean = 0
+        m2 = 0
+        for score, count in self.histogram.items():
+            total = self.count + count
+            delta = score - mean
+            mean += delta * count / total
+            m2 += delta * (score - mean) * count
+            self.count = total
+
+        self.min = min(self.histogram)
+        self.max = max(self.histogram)
+        self.mean = mean
+        self.sd = sqrt(m2 / self.count)
+        self.mode = max(self.histogram, key=lambda i: self.histogram[i])
+        self.median = self.get_nth(self.count // 2)
+
+        if self.count % 2 == 0:
+            self.median = (self.get_nth(self.count // 2 - 1) + self.median) / 2
+
+    def get_nth(self, n: int):
+        """ Get the n-th smallest score (zero-based) """
+        for score, count in self.histogram.items():
+            if n < count:
+                return score
+            n -= count
+        return None
+
+    def get_summed_scores(self, include_unscored: bool=False) -> list:
+        """ Get score counts from 1 to 10, or 0 to 10 with unscored """
+        return [self.histogram.get(i, 0) for i in range(1 - include_unscored, 11)]
@@ -4,6 +4,7 @@
 
 
 XML = 'xml'
+COMPRESSED_EXTENSIONS = ('.gz', '.bz2', '.xz')
 
 ANIMELIST = 'animelist'
 MANGALIST = 'mangalist'
@@ -11,4 +12,62 @@ MANGALIST = 'mangalist'
 ANIME_STATUS_LIST = {1: 'Watching', 2: 'Completed', 3: 'On-Hold', 4: 'Dropped', 6: 'Plan to Watch'}
 MANGA_STATUS_LIST = {1: 'Reading', 2: 'Completed', 3: 'On-Hold', 4: 'Dropped', 6: 'Plan to Read'}
 
+INFO_FIELDS = {
+    'user_id': int,
+    'user_name': str,
+    'user_export_type': int
+}
+
+ANIME_FIELDS = {
+    'series_animedb_id': int,
+    'series_title': str,
+    'series_type': str,
+    'series_episodes': int,
+    'my_id': int,
+    'my_watched_episodes': int,
+    'my_start_date': str,
+    'my_finish_date': str,
+    'my_rated': str,
+    'my_score': int,
+    'my_dvd': str,
+    'my_storage': str,
+    'my_status': str,
+    'my_comments': str,
+    'my_times_watched': int,
+    'my_rewatch_value': str,
+    'my_tags': str,
+    'my_rewatching': int,
+    'my_rewatching_ep': int,
+    'update_on_import': int
+}
+
+MANGA_FIELDS = {
+    'manga_mangadb_id': int,
+    'manga_title': str,
+    'manga_volumes': int,
+    'manga_chapters': int,
+    'my_id': int,
+    'my_read_volumes': int,
+    'my_read_chapters': int,
+    'my_start_date': str,
+    'my_finish_date': str,
+    'my_scanalation_group': str,
+    'my_score': int,
+    'my_storage': str,
+    'my_status': str,
+    'my_comments': str,
+    'my_times_read': int,
+    'my_tags': str,
+    'my_reread_value': str,
+    'update_on_import': int
+}
+
+SNAPSHOT_VERSION = 10
+
+MANIFEST_FILE_NAME = '.manifest.json'
+
+RENDER_VERSION = 1
+
+CSS_MINIFIER_VERSION = 1
+
 API_URL = 'https://myanimelist.net/{}/{}/load.json?status=7&offset={}'
@@ -0,0 +1,191 @@
+"""
+    `css.py`
+"""
+
+from hashlib import sha256
+
+from src.constants import CSS_MINIFIER_VERSION
+
+import json
+import os
+import shutil
+import tempfile
+
+
+CHUNK_SIZE = 64 * 1024
+NO_SPACE_BEFORE = frozenset('{};,>~)')
+NO_SPACE_AFTER = frozenset('{};:,>~(')
+
+
+class CSSMinifier:
+    """ Streaming CSS minifier class, fed with text chunks of any size """
+    def __init__(self):
+        """ Constructor """
+        self.state = 'normal'
+        self.quote = None
+        self.escaped = False
+        self.pending_slash = False
+        self.pending_star = False
+        self.pending_space = False
+        self.pending_semicolon = False
+        self.last = None
+
+    def feed(self, chunk: str) -> str:
+        """ Minify a chunk, returning the output that is final so far """
+        out = list()
+
+        for char in chunk:
+            # String: Copied verbatim
+            if self.state == 'string':
+                out.append(char)
+                if self.escaped:
+                    self.escaped = False
+                elif char == '\\':
+                    self.escaped = True
+                elif char == self.quote:
+                    self.state = 'normal'
+                continue
+
+            # Comment: Dropped, separating tokens like whitespace
+            if self.state == 'comment':
+                if self.pending_star and char == '/':
+                    self.state = 'normal'
+                    self.pending_space = True
+                self.pending_star = char == '*'
+                continue
+
+            # Comment Opening
+            if self.pending_slash:
+                self.pending_slash = False
+                if char == '*':
+                    self.state = 'comment'
+                    self.pending_star = False
+                    continue
+                self.emit(out, '/')
+
+            if char == '/':
+                self.pending_slash = True
+            elif char.isspace():
+                self.pending_space = True
+            elif char == ';':
+                self.pending_space = False
+                self.pending_semicolon = True
+            else:
+                self.emit(out, char)
+                if char in ('"', '\''):
+                    self.state = 'string'
+                    self.quote = char
+
+        return str().join(out)
+
+    def finish(self) -> str:
+        """ Flush the remaining output """
+        out = list()
+
+        if self.pending_slash:
+            self.pending_slash = False
+            self.emit(out, '/')
+        if self.pending_semicolon and self.state == 'normal':
+            self.pending_semicolon = False
+            out.append(';')
+
+        return str().join(out)
+
+    def emit(self, out: list, char: str) -> None:
+        """ Emit a significant character, after the pending semicolon and whitespace it still needs """
+        # Last semicolon of a block, and repeated semicolons, are dropped
+        if self.pending_semicolon:
+            self.pending_semicolon = False
+            if char != '}':
+                out.append(';')
+                self.last = ';'
+
+        # Whitespace survives only between two tokens that would otherwise merge
+        if self.pending_space:
+            self.pending_space = False
+            if self.last is not None and self.last not in NO_SPACE_AFTER and char not in NO_SPACE_BEFORE:
+                out.append(' ')
+
+        out.append(char)
+        self.last = char
+
+
+def minify_css(text: str) -> str:
+    """ Minify CSS text """
+    minifier = CSSMinifier()
+    return minifier.feed(text) + minifier.finish()
+
+
+def get_digest(file_path: str) -> str:
+    """ Get content hash of a file, read in chunks """
+    digest = sha256()
+
+    with open(file_path, 'rb') as file:
+        for chunk in iter(lambda: file.read(CHUNK_SIZE), bytes()):
+            digest.update(chunk)
+
+    return digest.hexdigest()
+
+
+class CSSCache:
+    """ On-disk minified CSS cache class, keyed by the content hash of the source """
+    def __init__(self, cache_dir: str):
+        """ Constructor """
+        self.cache_dir = cache_dir
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def get_path(self, digest: str) -> str:
+        """ Get cache file path without extension from the content hash """
+        return os.path.join(self.cache_dir, '{}-{}'.format(digest, CSS_MINIFIER_VERSION))
+
+    def minify_file(self, source_path: str, target_path: str) -> dict:
+        """ Minify a CSS file, reusing the cached result of identical content """
+        path = self.get_path(get_digest(source_path))
+
+        # Exception Case: Missing or partially written entry
+        try:
+            with open(path + '.json', 'r') as file:
+                result = json.load(file)
+            shutil.copyfile(path + '.css', target_path)
+            result['cached'] = True
+            return result
+        except (FileNotFoundError, json.JSONDecodeError):
+            pass
+
+        # Minification, streamed from source to cache
+        minifier = CSSMinifier()
+        result = {'input_length': 0, 'output_length': 0, 'cached': False}
+        descriptor, temp_path = tempfile.mkstemp(dir=self.cache_dir, prefix=os.path.basename(path) + '.', suffix='.tmp')
+
+        try:
+            with os.fdopen(descriptor, 'w', encoding='utf-8') as target, open(source_path, 'r', encoding='utf-8') as source:
+                for chunk in iter(lambda: source.read(CHUNK_SIZE), str()):
+                    minified = minifier.feed(chunk)
+                    target.write(minified)
+                    result['input_length'] += len(chunk)
+                    result['output_length'] += len(minified)
+                minified = minifier.finish()
+                target.write(minified)
+                result['output_length'] += len(minified)
+            os.replace(temp_path, path + '.css')
+        except BaseException:
+            os.remove(temp_path)
+            raise
+
+        self.write(path + '.json', json.dumps({'input_length': result['input_length'], 'output_length': result['output_length']}))
+        shutil.copyfile(path + '.css', target_path)
+
+        return result
+
+    def write(self, path: str, text: str) -> None:
+        """ Atomically write a cache file, through a temporary file unique to the writer """
+        descriptor, temp_path = tempfile.mkstemp(dir=self.cache_dir, prefix=os.path.basename(path) + '.', suffix='.tmp')
+
+        try:
+            with os.fdopen(descriptor, 'w', encoding='utf-8') as file:
+                file.write(text)
+            os.replace(temp_path, path)
+        except BaseException:
+            os.remove(temp_path)
+            raise
@@ -0,0 +1,65 @@
+"""
+    `diff.py`
+"""
+
+from src.classes.list import List
+from src.classes.user import User
+
+
+class ListDiff:
+    """ Anime/manga list difference class, by anime/manga ID """
+    def __init__(self, added: list=None, removed: list=None, changed: list=None):
+        """ Constructor, `changed` holds (old, new) anime/manga object pairs """
+        self.added = list() if added is None else added
+        self.removed = list() if removed is None else removed
+        self.changed = list() if changed is None else changed
+
+    def __len__(self) -> int:
+        return len(self.added) + len(self.removed) + len(self.changed)
+
+    def __repr__(self) -> str:
+        return 'ListDiff(added={}, removed={}, changed={})'.format(len(self.added), len(self.removed), len(self.changed))
+
+
+def diff_entries(entry_list: List, entries) -> ListDiff:
+    """ Compare an anime/manga list against new anime/manga objects, in a single pass over an iterable of them """
+    diff = ListDiff()
+    seen = set()
+
+    for entry in entries:
+        old_entry = entry_list.get_entry(entry.entry_id)
+        seen.add(entry.entry_id)
+
+        if old_entry is None:
+            diff.added.append(entry)
+        elif old_entry.get_values() != entry.get_values():
+            diff.changed.append((old_entry, entry))
+
+    diff.removed = entry_list.get_entries([i for i in entry_list.index if i not in seen])
+
+    return diff
+
+
+def diff_lists(old_list: List, new_list: List) -> ListDiff:
+    """ Compare two anime/manga lists """
+    return diff_entries(old_list, new_list.data)
+
+
+def apply_diff(entry_list: List, diff: ListDiff) -> List:
+    """ Apply a difference to an anime/manga list in place, updating its cached statistics by the changed entries only """
+    entry_list.delete_entries([i.entry_id for i in diff.removed])
+    entry_list.upsert_entries(diff.added + [new for _, new in diff.changed])
+
+    return entry_list
+
+
+def refresh_user(user: User, loader) -> tuple:
+    """ Refresh a user object in place to the documents of a loader, returns the anime list and manga list differences """
+    anime_diff = diff_entries(user.anime_list, loader.iter_anime_objects())
+    manga_diff = diff_entries(user.manga_list, loader.iter_manga_objects())
+
+    user.info = loader.get_info_object()
+    apply_diff(user.anime_list, anime_diff)
+    apply_diff(user.manga_list, manga_diff)
+
+    return anime_diff, manga_diff
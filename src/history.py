@@ -0,0 +1,210 @@
+"""
+    `history.py`
+"""
+
+from datetime import date
+
+from src.classes.entry import Anime
+from src.classes.list import List
+from src.classes.user import User
+
+import os
+import sqlite3
+
+
+SCHEMA = '''
+    CREATE TABLE IF NOT EXISTS snapshots (
+        snapshot_id INTEGER PRIMARY KEY,
+        user_name TEXT NOT NULL,
+        list_type TEXT NOT NULL,
+        taken_at TEXT NOT NULL,
+        source TEXT,
+        UNIQUE (user_name, list_type, taken_at)
+    );
+    CREATE TABLE IF NOT EXISTS entries (
+        snapshot_id INTEGER NOT NULL REFERENCES snapshots (snapshot_id),
+        entry_id INTEGER NOT NULL,
+        title TEXT,
+        media_type TEXT,
+        status TEXT,
+        score INTEGER,
+        progress INTEGER,
+        start_date TEXT,
+        finish_date TEXT,
+        tags TEXT,
+        PRIMARY KEY (snapshot_id, entry_id)
+    ) WITHOUT ROWID;
+    CREATE TABLE IF NOT EXISTS changes (
+        snapshot_id INTEGER NOT NULL REFERENCES snapshots (snapshot_id),
+        entry_id INTEGER NOT NULL,
+        field TEXT NOT NULL,
+        old_value TEXT,
+        new_value TEXT
+    );
+    CREATE INDEX IF NOT EXISTS entries_status_finish_date ON entries (snapshot_id, status, finish_date);
+    CREATE INDEX IF NOT EXISTS changes_snapshot ON changes (snapshot_id, field);
+    CREATE INDEX IF NOT EXISTS changes_entry ON changes (entry_id, field);
+'''
+
+
+def normalize_date(value: str) -> str:
+    """ Normalize an export date ('YYYY-MM-DD', '0000-00-00' when unset) or API date ('MM-DD-YY') to ISO format, None if unset """
+    if not isinstance(value, str) or len(value) == 0 or value.startswith('0000'):
+        return None
+
+    # Exception Case: Unparseable dates, such as '00-00-'
+    parts = value.split('-')
+    if len(parts) != 3 or not all(i.isdigit() for i in parts):
+        return None
+
+    if len(parts[0]) == 4:
+        year, month, day = parts
+    else:
+        month, day, year = parts
+        year = '20' + year if int(year) < 50 else '19' + year
+
+    # Exception Case: Partially known dates, such as '2020-05-00'
+    if month in ('00', '0'):
+        return None
+    return '{}-{}-{}'.format(year, month.zfill(2), day.zfill(2) if day not in ('00', '0') else '01')
+
+
+class HistoryStore:
+    """ SQLite anime/manga list history store class, one snapshot per ingested list """
+    def __init__(self, db_path: str):
+        """ Constructor """
+        if os.path.dirname(db_path):
+            os.makedirs(os.path.dirname(db_path), exist_ok=True)
+
+        self.connection = sqlite3.connect(db_path)
+        self.connection.execute('PRAGMA journal_mode = WAL')
+        self.connection.execute('PRAGMA synchronous = NORMAL')
+        self.connection.executescript(SCHEMA)
+
+    def close(self) -> None:
+        """ Close the database connection """
+        self.connection.close()
+
+    def ingest(self, user: User, taken_at: str=None, source: str=None) -> list:
+        """ Ingest both lists of a user object, returns the created snapshot IDs, None for lists already ingested at that time """
+        return [
+            self.ingest_list(user.info.user_name, 'anime', user.anime_list, taken_at=taken_at, source=source),
+            self.ingest_list(user.info.user_name, 'manga', user.manga_list, taken_at=taken_at, source=source)
+        ]
+
+    def ingest_list(self, user_name: str, list_type: str, entry_list: List, taken_at: str=None, source: str=None) -> int:
+        """ Ingest an anime/manga list in a single transaction, recording score and status changes since the previous snapshot, lists are expected in time order """
+        taken_at = taken_at or date.today().isoformat()
+        rows = [
+            (
+                entry.entry_id,
+                entry.series_title if isinstance(entry, Anime) else entry.manga_title,
+                entry.series_type if isinstance(entry, Anime) else None,
+                entry.my_status,
+                entry.my_score,
+                entry.my_watched_episodes if isinstance(entry, Anime) else entry.my_read_chapters,
+                normalize_date(entry.my_start_date),
+                normalize_date(entry.my_finish_date),
+                entry.my_tags if isinstance(entry.my_tags, str) else None
+            )
+            for entry in entry_list.get_full_list(include_unscored=True)
+        ]
+
+        with self.connection:
+            cursor = self.connection.execute(
+                'INSERT OR IGNORE INTO snapshots (user_name, list_type, taken_at, source) VALUES (?, ?, ?, ?)',
+                (user_name, list_type, taken_at, source)
+            )
+
+            # Exception Case: Already ingested
+            if cursor.rowcount == 0:
+                return None
+
+            snapshot_id = cursor.lastrowid
+            self.connection.executemany(
+                'INSERT INTO entries VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                [(snapshot_id,) + i for i in rows]
+            )
+
+            previous = self.connection.execute(
+                'SELECT snapshot_id FROM snapshots WHERE user_name = ? AND list_type = ? AND taken_at < ? ORDER BY taken_at DESC LIMIT 1',
+                (user_name, list_type, taken_at)
+            ).fetchone()
+
+            if previous is not None:
+                for field in ('score', 'status'):
+                    self.connection.execute(
+                        'INSERT INTO changes '
+                        'SELECT new.snapshot_id, new.entry_id, ?, old.{0}, new.{0} FROM entries new '
+                        'JOIN entries old ON old.snapshot_id = ? AND old.entry_id = new.entry_id '
+                        'WHERE new.snapshot_id = ? AND old.{0} IS NOT new.{0}'.format(field),
+                        (field, previous[0], snapshot_id)
+                    )
+
+        return snapshot_id
+
+    def has_snapshot(self, user_name: str, list_type: str, taken_at: str) -> bool:
+        """ Check whether a list is already ingested at a time """
+        return self.connection.execute(
+            'SELECT 1 FROM snapshots WHERE user_name = ? AND list_type = ? AND taken_at = ?',
+            (user_name, list_type, taken_at)
+        ).fetchone() is not None
+
+    def get_snapshots(self, user_name: str, list_type: str) -> list:
+        """ Get (snapshot ID, time taken) pairs of a list in time order """
+        return self.connection.execute(
+            'SELECT snapshot_id, taken_at FROM snapshots WHERE user_name = ? AND list_type = ? ORDER BY taken_at',
+            (user_name, list_type)
+        ).fetchall()
+
+    def get_monthly_completions(self, user_name: str, list_type: str) -> tuple:
+        """ Get completed title counts per finish month in the latest snapshot, as (month labels, chart data) """
+        snapshots = self.get_snapshots(user_name, list_type)
+        if len(snapshots) == 0:
+            return list(), {'Completed': list()}
+
+        counts = dict(self.connection.execute(
+            'SELECT substr(finish_date, 1, 7) AS month, count(*) FROM entries '
+            'WHERE snapshot_id = ? AND status = \'Completed\' AND finish_date IS NOT NULL GROUP BY month ORDER BY month',
+            (snapshots[-1][0],)
+        ).fetchall())
+        if len(counts) == 0:
+            return list(), {'Completed': list()}
+
+        # Month Filling: Months without completions are counted as zero
+        first, last = min(counts), max(counts)
+        year, month = int(first[:4]), int(first[5:])
+        months = list()
+        while '{:04}-{:02}'.format(year, month) <= last:
+            months.append('{:04}-{:02}'.format(year, month))
+            year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+
+        return months, {'Completed': [counts.get(i, 0) for i in months]}
+
+    def get_score_drift(self, user_name: str, list_type: str) -> tuple:
+        """ Get mean score of the scored titles of every snapshot, as (snapshot labels, chart data) """
+        rows = self.connection.execute(
+            'SELECT s.taken_at, avg(e.score) FROM snapshots s '
+            'JOIN entries e ON e.snapshot_id = s.snapshot_id AND e.score > 0 '
+            'WHERE s.user_name = ? AND s.list_type = ? GROUP BY s.snapshot_id ORDER BY s.taken_at',
+            (user_name, list_type)
+        ).fetchall()
+
+        return [i[0] for i in rows], {'Mean Score': [round(i[1], 2) for i in rows]}
+
+    def get_changes(self, user_name: str, list_type: str, field: str=None, entry_id: int=None) -> list:
+        """ Get (time taken, anime/manga ID, field, old value, new value) changes of a list in time order """
+        query = (
+            'SELECT s.taken_at, c.entry_id, c.field, c.old_value, c.new_value FROM changes c '
+            'JOIN snapshots s ON s.snapshot_id = c.snapshot_id WHERE s.user_name = ? AND s.list_type = ?'
+        )
+        parameters = [user_name, list_type]
+
+        if field is not None:
+            query += ' AND c.field = ?'
+            parameters.append(field)
+        if entry_id is not None:
+            query += ' AND c.entry_id = ?'
+            parameters.append(entry_id)
+
+        return self.connection.execute(query + ' ORDER BY s.taken_at, c.entry_id', parameters).fetchall()
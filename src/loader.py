@@ -2,18 +2,25 @@
     `loader.py`
 """
 
-from xml.dom import minidom
-from xml.dom.minidom import Document
+from xml.dom import Node
+from xml.etree.ElementTree import Element, iterparse
 
+from src.cache import ResponseCache
 from src.classes.entry import Anime, Manga
 from src.classes.list import List
 from src.classes.info import Info
 from src.classes.user import User
-from src.constants import XML, API_URL, ANIMELIST, MANGALIST, ANIME_STATUS_LIST, MANGA_STATUS_LIST
+from src.constants import XML, COMPRESSED_EXTENSIONS, API_URL, ANIMELIST, MANGALIST, ANIME_STATUS_LIST, MANGA_STATUS_LIST
+from src.constants import INFO_FIELDS, ANIME_FIELDS, MANGA_FIELDS
+from src.profiler import profiler
+from src.stream import CHUNK_SIZE, CountingReader, decode_array, open_decompressed
+from src.utils import notice
+
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
 
 import os
-import json
-import requests
+import time
 
 
 class Loader:
@@ -22,50 +29,111 @@ class Loader:
         """ Constructor """
         self.anime_document = None
         self.manga_document = None
+        self.list_class = List
+
+    def report_throughput(self, list_type: str, count: int, elapsed: float):
+        """ Display entry construction throughput """
+        profiler.count('{}_entries_parsed'.format(list_type), count)
+        notice('Loaded {} {} entries in {:.3f}s ({:.0f} entries/sec).'.format(
+            count,
+            list_type,
+            elapsed,
+            count / elapsed if elapsed > 0 else 0
+        ))
 
 
 class XMLLoader(Loader):
     """ XML Loader class """
-    def __init__(self, data_dir: str):
-        """ Constructor """
+    def __init__(self, data_dir: str, fast_extract: bool=True, target: int=-1):
+        """ Constructor, `target` picks the export among the matching files, -2 being the one before the latest """
         super().__init__()
         self.data_dir = data_dir
+        self.fast_extract = fast_extract
+        self.target = target
 
     def fetch_file_name(self, file_format: str=XML, list_type: str=ANIMELIST, target: int=-1):
-        """ Fetch file names from the specified directory """
+        """ Fetch file names from the specified directory, ordered by name, which starts with the export timestamp """
         try:
             return [
-                i for i in os.listdir(self.data_dir)
-                if i.startswith(list_type) and i.endswith(file_format)
+                i for i in sorted(os.listdir(self.data_dir))
+                if self.is_source_file(i, list_type=list_type, file_format=file_format)
             ][target]
         except IndexError:
             return None
 
+    def is_source_file(self, file_name: str, list_type: str=ANIMELIST, file_format: str=XML) -> bool:
+        """ Check whether a file name is an export of the list type, either plain or gzip, bzip2 or xz compressed """
+        return file_name.startswith(list_type) and file_name.endswith((file_format,) + tuple(file_format + i for i in COMPRESSED_EXTENSIONS))
+
+    def open_file(self, file_path: str) -> CountingReader:
+        """ Open an export file, compressed exports being decompressed as they are read """
+        return CountingReader(open_decompressed(file_path))
+
+    def report_decompression(self, file_path: str, file: CountingReader, elapsed: float) -> None:
+        """ Display decompression and parse throughput of a compressed export, `elapsed` being the time spent on both """
+        if not file_path.endswith(COMPRESSED_EXTENSIONS):
+            return
+
+        size = file.bytes_read / 1024 ** 2
+        parse_elapsed = max(elapsed - file.elapsed, 0)
+        profiler.count('compressed_bytes', os.path.getsize(file_path))
+        profiler.count('decompressed_bytes', file.bytes_read)
+        notice('Decompressed {:.1f} MB of \'{}\' in {:.3f}s ({:.1f} MB/s), parsed in {:.3f}s ({:.1f} MB/s).'.format(
+            size,
+            os.path.basename(file_path),
+            file.elapsed,
+            size / file.elapsed if file.elapsed > 0 else 0,
+            parse_elapsed,
+            size / parse_elapsed if parse_elapsed > 0 else 0
+        ))
+
+    def get_options(self) -> dict:
+        """ Get the loader settings the parsed objects depend on """
+        return {'loader': type(self).__name__, 'list_class': self.list_class.__name__, 'fast_extract': self.fast_extract}
+
+    def get_source_files(self) -> list:
+        """ Get paths of the anime list and manga list files to be loaded """
+        return [
+            '{}{}'.format(self.data_dir, self.fetch_file_name(file_format=XML, list_type=ANIMELIST, target=self.target)),
+            '{}{}'.format(self.data_dir, self.fetch_file_name(file_format=XML, list_type=MANGALIST, target=self.target))
+        ]
+
+    @profiler.timed()
     def create_document(self):
         """ Create document object notation (DOM) object """
-        anime_list_file_name = self.fetch_file_name(file_format=XML, list_type=ANIMELIST, target=-1)
-        manga_list_file_name = self.fetch_file_name(file_format=XML, list_type=MANGALIST, target=-1)
+        anime_list_file_path, manga_list_file_path = self.get_source_files()
+
+        self.anime_document = self.parse_file(anime_list_file_path)
+        self.manga_document = self.parse_file(manga_list_file_path)
 
-        self.anime_document = minidom.parse('{}{}'.format(self.data_dir, anime_list_file_name))
-        self.manga_document = minidom.parse('{}{}'.format(self.data_dir, manga_list_file_name))
+    def parse_file(self, file_path: str):
+        """ Parse an export file into a document object notation (DOM) object """
+        from xml.dom import minidom
 
-    def get_element(self, document: Document, element_name: str, convert_type: bool=True, get_data: bool=False, get_single: bool=False):
+        start = time.perf_counter()
+        with self.open_file(file_path) as file:
+            document = minidom.parse(file)
+        self.report_decompression(file_path, file, time.perf_counter() - start)
+
+        return document
+
+    def get_element(self, document: Node, element_name: str, convert_type: bool=True, get_data: bool=False, get_single: bool=False):
         """ Retrieve elements or data from the specified element name """
         items = document.getElementsByTagName(element_name)
 
         # Procedure: Retrieve non-element data
         if get_data:
-            # Exception Case: Null or composite element data retrieval attempt
+            # Exception Case: Composite element data retrieval attempt, empty elements being None
             try:
-                items = [i.firstChild.data for i in items]
+                items = [i.firstChild.data if i.firstChild is not None and len(i.firstChild.data) > 0 else None for i in items]
 
                 # Prodecure: Convert type attempt
                 if convert_type:
                     try:
-                        items = [int(i) for i in items]
+                        items = [int(i) if i is not None else None for i in items]
                     except ValueError:
                         try:
-                            items = [float(i) for i in items]
+                            items = [float(i) if i is not None else None for i in items]
                         except ValueError:
                             pass
             except AttributeError:
@@ -81,6 +149,18 @@ class XMLLoader(Loader):
 
         return items
 
+    def get_values(self, element: Node, fields: dict) -> dict:
+        """ Retrieve data of the declared fields in a single walk over the element's children """
+        values = dict.fromkeys(fields)
+
+        for node in element.childNodes:
+            if node.nodeType == node.ELEMENT_NODE and node.tagName in fields and node.firstChild is not None:
+                text = node.firstChild.data
+                values[node.tagName] = fields[node.tagName](text) if len(text) > 0 else None
+
+        return values
+
+    @profiler.timed()
     def get_user_object(self, include_current: bool=False, include_onhold: bool=False, include_dropped: bool=False, include_planned: bool=False):
         """ Retrieve user object """
         return User(
@@ -103,24 +183,49 @@ class XMLLoader(Loader):
         """ Retrieve user information object """
         my_info = self.get_element(self.anime_document, 'myinfo', get_single=True)
 
+        if self.fast_extract:
+            return Info(**self.get_values(my_info, INFO_FIELDS))
+
         return Info(
             user_id=               self.get_element(my_info, 'user_id',                get_data=True, get_single=True),
             user_name=             self.get_element(my_info, 'user_name',              get_data=True, get_single=True),
             user_export_type=      self.get_element(my_info, 'user_export_type',       get_data=True, get_single=True)
         )
 
+    @profiler.timed()
     def get_anime_list_object(self, include_current: bool=False, include_onhold: bool=False, include_dropped: bool=False, include_planned: bool=False):
         """ Retrieve user anime list object """
-        return List(
-            data=[self.get_anime_object(i) for i in self.get_element(self.anime_document, 'anime')],
+        start = time.perf_counter()
+        anime_list = self.list_class.from_values(
+            Anime,
+            self.iter_anime_values(),
             include_current=include_current,
             include_onhold=include_onhold,
             include_dropped=include_dropped,
             include_planned=include_planned
         )
+        self.report_throughput('anime', anime_list.count('all'), time.perf_counter() - start)
+
+        return anime_list
+
+    def iter_anime_objects(self):
+        """ Yield anime objects of the anime list document """
+        for anime_element in self.get_element(self.anime_document, 'anime'):
+            yield self.get_anime_object(anime_element)
+
+    def iter_anime_values(self):
+        """ Yield the values of each anime of the anime list document, in `ANIME_FIELDS` order """
+        for anime_element in self.get_element(self.anime_document, 'anime'):
+            if self.fast_extract:
+                yield self.get_values(anime_element, ANIME_FIELDS).values()
+            else:
+                yield self.get_anime_object(anime_element).get_values()
 
-    def get_anime_object(self, anime_element: Document):
+    def get_anime_object(self, anime_element: Node):
         """ Retrieve anime object """
+        if self.fast_extract:
+            return Anime.from_values(self.get_values(anime_element, ANIME_FIELDS).values())
+
         return Anime(
             series_animedb_id=  self.get_element(anime_element, 'series_animedb_id',   get_data=True, get_single=True),
             series_title=       self.get_element(anime_element, 'series_title',        get_data=True, get_single=True),
@@ -144,18 +249,40 @@ class XMLLoader(Loader):
             update_on_import=   self.get_element(anime_element, 'update_on_import',    get_data=True, get_single=True)
         )
 
+    @profiler.timed()
     def get_manga_list_object(self, include_current: bool=False, include_onhold: bool=False, include_dropped: bool=False, include_planned: bool=False):
         """ Retrieve user manga list object """
-        return List(
-            data=[self.get_manga_object(i) for i in self.get_element(self.manga_document, 'manga')],
+        start = time.perf_counter()
+        manga_list = self.list_class.from_values(
+            Manga,
+            self.iter_manga_values(),
             include_current=include_current,
             include_onhold=include_onhold,
             include_dropped=include_dropped,
             include_planned=include_planned
         )
+        self.report_throughput('manga', manga_list.count('all'), time.perf_counter() - start)
+
+        return manga_list
+
+    def iter_manga_objects(self):
+        """ Yield manga objects of the manga list document """
+        for manga_element in self.get_element(self.manga_document, 'manga'):
+            yield self.get_manga_object(manga_element)
 
-    def get_manga_object(self, manga_element: Document):
+    def iter_manga_values(self):
+        """ Yield the values of each manga of the manga list document, in `MANGA_FIELDS` order """
+        for manga_element in self.get_element(self.manga_document, 'manga'):
+            if self.fast_extract:
+                yield self.get_values(manga_element, MANGA_FIELDS).values()
+            else:
+                yield self.get_manga_object(manga_element).get_values()
+
+    def get_manga_object(self, manga_element: Node):
         """ Retrieve manga object """
+        if self.fast_extract:
+            return Manga.from_values(self.get_values(manga_element, MANGA_FIELDS).values())
+
         return Manga(
             manga_mangadb_id=    self.get_element(manga_element, 'manga_mangadb_id',     get_data=True, get_single=True),
             manga_title=         self.get_element(manga_element, 'manga_title',          get_data=True, get_single=True),
@@ -178,40 +305,210 @@ class XMLLoader(Loader):
         )
 
 
+class XMLStreamLoader(XMLLoader):
+    """ Streaming XML Loader class """
+    @profiler.timed()
+    def create_document(self):
+        """ Locate export files, parsing is deferred to the object retrieval """
+        self.anime_document, self.manga_document = self.get_source_files()
+
+    def iter_elements(self, document, tag: str):
+        """ Incrementally parse a file path or in-memory export bytes, yielding each element of the specified tag then clearing it """
+        with BytesIO(document) if isinstance(document, bytes) else self.open_file(document) as file:
+            start = time.perf_counter()
+            context = iterparse(file, events=('start', 'end'))
+            _, root = next(context)
+
+            for event, element in context:
+                if event == 'end' and element.tag == tag:
+                    yield element
+                    element.clear()
+                    root.clear()
+
+            if isinstance(document, str):
+                self.report_decompression(document, file, time.perf_counter() - start)
+
+    def get_values(self, element: Element, fields: dict) -> dict:
+        """ Retrieve data of the declared fields in a single walk over the element's children """
+        values = dict.fromkeys(fields)
+
+        for child in element:
+            if child.tag in fields and child.text:
+                values[child.tag] = fields[child.tag](child.text)
+
+        return values
+
+    def get_info_object(self):
+        """ Retrieve user information object """
+        return Info(**self.get_values(next(self.iter_elements(self.anime_document, 'myinfo')), INFO_FIELDS))
+
+    def iter_anime_objects(self):
+        """ Yield anime objects in a single pass over the anime list file """
+        for anime_element in self.iter_elements(self.anime_document, 'anime'):
+            yield self.get_anime_object(anime_element)
+
+    def iter_anime_values(self):
+        """ Yield the values of each anime in a single pass over the anime list file, in `ANIME_FIELDS` order """
+        for anime_element in self.iter_elements(self.anime_document, 'anime'):
+            yield self.get_values(anime_element, ANIME_FIELDS).values()
+
+    def get_anime_object(self, anime_element: Element):
+        """ Retrieve anime object """
+        return Anime.from_values(self.get_values(anime_element, ANIME_FIELDS).values())
+
+    def iter_manga_objects(self):
+        """ Yield manga objects in a single pass over the manga list file """
+        for manga_element in self.iter_elements(self.manga_document, 'manga'):
+            yield self.get_manga_object(manga_element)
+
+    def iter_manga_values(self):
+        """ Yield the values of each manga in a single pass over the manga list file, in `MANGA_FIELDS` order """
+        for manga_element in self.iter_elements(self.manga_document, 'manga'):
+            yield self.get_values(manga_element, MANGA_FIELDS).values()
+
+    def get_manga_object(self, manga_element: Element):
+        """ Retrieve manga object """
+        return Manga.from_values(self.get_values(manga_element, MANGA_FIELDS).values())
+
+
 class APILoader(Loader):
     """ API Loader class """
-    def __init__(self, username: str):
+    def __init__(self, username: str, api_url: str=API_URL, max_workers: int=4, prefetch_pages: int=4, cache: ResponseCache=None):
         """ Constructor """
         super().__init__()
         self.username = username
+        self.api_url = api_url
+        self.max_workers = max(max_workers, 1)
+        self.prefetch_pages = max(prefetch_pages, 1)
+        self.cache = cache
+        self.session = None
+
+    def create_session(self):
+        """ Create a session sharing one connection pool among all page requests """
+        import requests
+
+        session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_connections=2, pool_maxsize=self.max_workers)
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
 
+        return session
+
+    @profiler.timed()
     def create_document(self):
         """ Create document """
-        # Documents Initiation
-        self.anime_document = list()
-        self.manga_document = list()
-
-        # Lambda function
-        api_url = lambda list_type, username, offset: API_URL.format(list_type, username, offset)
+        self.session = self.create_session()
 
-        # Anime Document
+        try:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as page_executor:
+                with ThreadPoolExecutor(max_workers=2) as list_executor:
+                    anime_future = list_executor.submit(self.fetch_list, page_executor, ANIMELIST)
+                    manga_future = list_executor.submit(self.fetch_list, page_executor, MANGALIST)
+
+                    self.anime_document = anime_future.result()
+                    self.manga_document = manga_future.result()
+        finally:
+            self.session.close()
+
+        if self.cache is not None:
+            self.cache.evict()
+
+    @profiler.timed()
+    def fetch_page(self, list_type: str, offset: int) -> list:
+        """ Fetch a single page of the list starting at the specified offset, as anime/manga objects converted while its body streams in """
+        url = self.api_url.format(list_type, self.username, offset)
+
+        # Procedure: Fetch without caching
+        if self.cache is None:
+            with self.session.get(url, stream=True) as response:
+                return self.decode_page(list_type, self.iter_response(response))
+
+        # Procedure: Serve fresh cached response
+        cached = self.cache.get(list_type, self.username, offset)
+        if cached is not None and self.cache.is_fresh(cached):
+            profiler.count('cache_hits')
+            return self.decode_page(list_type, (cached['body'],))
+
+        # Procedure: Conditional revalidation of stale cached response
+        headers = dict()
+        if cached is not None and cached['etag'] is not None:
+            headers['If-None-Match'] = cached['etag']
+        if cached is not None and cached['last_modified'] is not None:
+            headers['If-Modified-Since'] = cached['last_modified']
+
+        with self.session.get(url, headers=headers, stream=True) as response:
+            if response.status_code == 304 and cached is not None:
+                profiler.count('http_requests')
+                profiler.count('cache_revalidations')
+                self.cache.touch(list_type, self.username, offset)
+                return self.decode_page(list_type, (cached['body'],))
+
+            chunks = list()
+            page = self.decode_page(list_type, self.iter_response(response, chunks=chunks))
+
+            if response.status_code == 200:
+                self.cache.set(
+                    list_type,
+                    self.username,
+                    offset,
+                    b''.join(chunks),
+                    etag=response.headers.get('ETag'),
+                    last_modified=response.headers.get('Last-Modified')
+                )
+
+        return page
+
+    def iter_response(self, response, chunks: list=None):
+        """ Iterate over the body chunks of a streamed response, keeping them in `chunks` if given """
+        profiler.count('http_requests')
+        response.raise_for_status()
+
+        for chunk in response.iter_content(chunk_size=CHUNK_SIZE):
+            profiler.count('http_bytes', len(chunk))
+            if chunks is not None:
+                chunks.append(chunk)
+            yield chunk
+
+    def decode_page(self, list_type: str, chunks) -> list:
+        """ Decode a page from its body chunks, converting each record into an anime/manga object as soon as it is complete """
+        return decode_array(chunks, convert=self.get_anime_object if list_type == ANIMELIST else self.get_manga_object)
+
+    @profiler.timed()
+    def fetch_list(self, executor: ThreadPoolExecutor, list_type: str) -> list:
+        """ Fetch all pages of the list, speculatively prefetching the following offsets in parallel """
+        document = list()
         offset = 0
-        response = json.loads(requests.get(api_url(ANIMELIST, self.username, offset)).text)
+        page_size = None
+        aligned = False
 
-        while len(response) > 0:
-            self.anime_document += response
-            offset += len(response)
-            response = json.loads(requests.get(api_url(ANIMELIST, self.username, offset)).text)
+        while True:
+            # Speculative Prefetch: Only once the page size is known and the offset is on a page boundary
+            count = self.prefetch_pages if aligned else 1
+            futures = [executor.submit(self.fetch_page, list_type, offset + i * (page_size or 0)) for i in range(count)]
 
-        # Manga Document
-        offset = 0
-        response = json.loads(requests.get(api_url(MANGALIST, self.username, offset)).text)
+            for i in range(len(futures)):
+                page = futures[i].result()
+
+                # End Case: Empty page
+                if len(page) == 0:
+                    for j in futures[i + 1:]:
+                        j.cancel()
+                    return document
+
+                if page_size is None:
+                    page_size = len(page)
 
-        while len(response) > 0:
-            self.manga_document += response
-            offset += len(response)
-            response = json.loads(requests.get(api_url(MANGALIST, self.username, offset)).text)
+                document += page
+                offset += len(page)
+                aligned = len(page) == page_size
 
+                # Exception Case: Short page, remaining prefetched offsets are misaligned
+                if not aligned:
+                    for j in futures[i + 1:]:
+                        j.cancel()
+                    break
+
+    @profiler.timed()
     def get_user_object(self, include_current: bool=False, include_onhold: bool=False, include_dropped: bool=False, include_planned: bool=False):
         """ Retrieve user object """
         return User(
@@ -238,10 +535,13 @@ class APILoader(Loader):
             user_export_type=None
         )
 
+    @profiler.timed()
     def get_anime_list_object(self, include_current: bool=False, include_onhold: bool=False, include_dropped: bool=False, include_planned: bool=False):
         """ Retrieve user anime list object """
-        return List(
-            data=[self.get_anime_object(i) for i in self.anime_document],
+        profiler.count('anime_entries_parsed', len(self.anime_document))
+
+        return self.list_class(
+            data=list(self.anime_document),
             include_current=include_current,
             include_onhold=include_onhold,
             include_dropped=include_dropped,
@@ -273,10 +573,13 @@ class APILoader(Loader):
             update_on_import=   None
         )
 
+    @profiler.timed()
     def get_manga_list_object(self, include_current: bool=False, include_onhold: bool=False, include_dropped: bool=False, include_planned: bool=False):
         """ Retrieve user manga list object """
-        return List(
-            data=[self.get_manga_object(i) for i in self.manga_document],
+        profiler.count('manga_entries_parsed', len(self.manga_document))
+
+        return self.list_class(
+            data=list(self.manga_document),
             include_current=include_current,
             include_onhold=include_onhold,
             include_dropped=include_dropped,
@@ -0,0 +1,151 @@
+"""
+    `profiler.py`
+"""
+
+from collections import defaultdict
+from functools import wraps
+from threading import Lock, get_ident
+
+import json
+import os
+import time
+
+
+class Timer:
+    """ Timer context manager class, records a profiler event on exit """
+    __slots__ = ('profiler', 'name', 'start', 'wall_start')
+
+    def __init__(self, profiler, name: str):
+        """ Constructor """
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.wall_start = time.time()
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exception):
+        self.profiler.record(self.name, self.wall_start, time.perf_counter() - self.start)
+        return False
+
+
+class NullTimer:
+    """ No-op timer context manager class, used while the profiler is disabled """
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exception):
+        return False
+
+
+NULL_TIMER = NullTimer()
+
+
+class Profiler:
+    """ Profiler class, collecting timed events and counters, costing a single check while disabled """
+    def __init__(self):
+        """ Constructor """
+        self.enabled = False
+        self.events = list()
+        self.counters = defaultdict(int)
+        self.lock = Lock()
+
+    def enable(self) -> None:
+        """ Start collecting events and counters """
+        self.enabled = True
+
+    def disable(self) -> None:
+        """ Stop collecting events and counters """
+        self.enabled = False
+
+    def reset(self) -> None:
+        """ Discard collected events and counters """
+        with self.lock:
+            self.events = list()
+            self.counters = defaultdict(int)
+
+    def timer(self, name: str):
+        """ Get a context manager timing its block as an event """
+        if not self.enabled:
+            return NULL_TIMER
+        return Timer(self, name)
+
+    def timed(self, name: str=None):
+        """ Get a decorator timing every call of a function as an event, named after it by default """
+        def decorator(function):
+            event_name = name or function.__qualname__
+
+            @wraps(function)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return function(*args, **kwargs)
+                with Timer(self, event_name):
+                    return function(*args, **kwargs)
+
+            return wrapper
+
+        return decorator
+
+    def count(self, name: str, value: int=1) -> None:
+        """ Increase a counter """
+        if self.enabled:
+            with self.lock:
+                self.counters[name] += value
+
+    def record(self, name: str, wall_start: float, elapsed: float, pid: int=None, tid: int=None) -> None:
+        """ Record a timed event, `wall_start` being a `time.time()` timestamp """
+        if self.enabled:
+            with self.lock:
+                self.events.append((name, wall_start, elapsed, pid or os.getpid(), tid or get_ident()))
+
+    def get_breakdown(self) -> list:
+        """ Get calls, total and maximum time of each event name, by total time """
+        breakdown = dict()
+
+        with self.lock:
+            for name, _, elapsed, _, _ in self.events:
+                calls, total, maximum = breakdown.get(name, (0, 0, 0))
+                breakdown[name] = (calls + 1, total + elapsed, max(maximum, elapsed))
+
+        return sorted([(name,) + breakdown[name] for name in breakdown], key=lambda x: -x[2])
+
+    def report(self) -> None:
+        """ Display the breakdown and counters """
+        print('- Profile -')
+        print('  {:<48}{:>8}{:>12}{:>12}{:>12}'.format('Stage', 'Calls', 'Total (s)', 'Mean (ms)', 'Max (ms)'))
+        for name, calls, total, maximum in self.get_breakdown():
+            print('  {:<48}{:>8}{:>12.3f}{:>12.2f}{:>12.2f}'.format(name, calls, total, 1000 * total / calls, 1000 * maximum))
+        print()
+
+        if len(self.counters) > 0:
+            print('  Counters', end='\n  ')
+            print(' | '.join('{}: {}'.format(i, self.counters[i]) for i in sorted(self.counters)))
+            print()
+
+    def write_trace(self, path: str) -> None:
+        """ Write events and counters in the Chrome trace event format, viewable in `chrome://tracing` or Perfetto """
+        with self.lock:
+            events = list(self.events)
+            counters = dict(self.counters)
+
+        origin = min([i[1] for i in events], default=time.time())
+        trace = [
+            {
+                'name': name,
+                'ph': 'X',
+                'ts': 1e6 * (wall_start - origin),
+                'dur': 1e6 * elapsed,
+                'pid': pid,
+                'tid': tid
+            }
+            for name, wall_start, elapsed, pid, tid in events
+        ]
+
+        with open(path, 'w') as file:
+            json.dump({'traceEvents': trace, 'otherData': {'counters': counters}}, file)
+
+
+profiler = Profiler()
@@ -2,25 +2,48 @@
     render.py
 """
 
+from copy import copy
+from hashlib import sha256
+from itertools import repeat
 from math import ceil, floor
-from pygal.style import Style, DefaultStyle
-from pygal import Graph
+from uuid import NAMESPACE_URL, uuid5
 
-from src.utils import notice
+from src.constants import MANIFEST_FILE_NAME, RENDER_VERSION
+from src.profiler import profiler
+from src.utils import notice, error
 
-import pygal
+import json
+import os
+import time
+
+
+class ChartJob:
+    """ Chart rendering job class """
+    def __init__(self, chart_type: str, data, file_name: str='untitled_chart', title: str=str(), **options):
+        """ Constructor, `chart_type` is one of 'pie_chart', 'bar_chart', 'line_chart' and 'treemap' """
+        self.chart_type = chart_type
+        self.data = data
+        self.file_name = file_name
+        self.title = title
+        self.options = options
 
 
 class RenderMachine:
+    """ Chart render machine class, keeps rendered charts in `rendered` instead of writing them when `chart_dir` is None
+
+        `style` is a pygal style object or the name of one in `pygal.style`, pygal itself is only imported on rendering.
+    """
     def __init__(
         self,
         chart_dir: str,
         legend_at_bottom: bool=False,
         legend_box_size: int=15,
         max_y_labels: int=15,
-        style: Style=DefaultStyle,
+        style='DefaultStyle',
         y_labels_preset: tuple=(1, 2, 5),
-        y_labels_skip: bool=False
+        y_labels_skip: bool=False,
+        show_notice: bool=True,
+        incremental: bool=False
     ):
         self.chart_dir = chart_dir
         self.legend_at_bottom = legend_at_bottom
@@ -29,10 +52,153 @@ class RenderMachine:
         self.style = style
         self.y_labels_preset = y_labels_preset
         self.y_labels_skip = y_labels_skip
+        self.show_notice = show_notice
+        self.incremental = incremental
+        self.manifest = None
+        self.pending = dict()
+        self.rebuilt = 0
+        self.reused = 0
+        self.rendered = dict()
+
+    def get_file_path(self, file_name: str) -> str:
+        """ Function: Get the output path of a chart """
+        return '{}{}{}.svg'.format(
+            self.chart_dir,
+            '/' * (self.chart_dir[-1] != '/'),
+            file_name.replace('.svg', '')
+        )
+
+    def get_manifest(self) -> dict:
+        """ Function: Load the chart fingerprint manifest of the chart directory """
+        if self.manifest is None:
+            try:
+                with open(os.path.join(self.chart_dir, MANIFEST_FILE_NAME), 'r') as file:
+                    self.manifest = json.load(file)
+            except (FileNotFoundError, json.JSONDecodeError):
+                self.manifest = dict()
+
+        return self.manifest
+
+    def save_manifest(self) -> None:
+        """ Function: Save the chart fingerprint manifest to the chart directory """
+        with open(os.path.join(self.chart_dir, MANIFEST_FILE_NAME), 'w') as file:
+            json.dump(self.get_manifest(), file, indent=4, sort_keys=True)
+
+    def get_fingerprint(self, job: ChartJob) -> str:
+        """ Function: Fingerprint everything a chart's output depends on, including the version of the rendering code """
+        style = self.style if isinstance(self.style, str) else [
+            (i, repr(getattr(self.style, i))) for i in dir(self.style)
+            if not i.startswith('_') and not callable(getattr(self.style, i))
+        ]
+
+        return sha256(repr((
+            RENDER_VERSION,
+            job.chart_type,
+            job.file_name,
+            job.title,
+            job.data,
+            sorted(job.options.items()),
+            style,
+            self.legend_at_bottom,
+            self.legend_box_size,
+            self.max_y_labels,
+            self.y_labels_preset,
+            self.y_labels_skip
+        )).encode()).hexdigest()
+
+    def is_unchanged(self, job: ChartJob) -> bool:
+        """ Function: Check whether a chart is already rendered from identical input, otherwise hold its fingerprint """
+        if not self.incremental or self.chart_dir is None:
+            return False
+
+        fingerprint = self.get_fingerprint(job)
+
+        if self.get_manifest().get(job.file_name) == fingerprint and os.path.exists(self.get_file_path(job.file_name)):
+            self.reused += 1
+            return True
+
+        self.pending[job.file_name] = fingerprint
+        return False
+
+    def record(self, file_name: str, save: bool=True) -> None:
+        """ Function: Record the held fingerprint of a rendered chart, only incremental machines record, not their worker copies """
+        self.rebuilt += 1
+
+        if self.incremental and file_name in self.pending:
+            self.get_manifest()[file_name] = self.pending.pop(file_name)
+            if save:
+                self.save_manifest()
+
+    def report(self) -> None:
+        """ Function: Display rebuilt and reused chart counts """
+        notice('{} chart(s) rebuilt, {} chart(s) reused.'.format(self.rebuilt, self.reused), show=self.show_notice)
+
+    def render(self, job: ChartJob):
+        """ Function: Render a chart job """
+        getattr(self, 'render_{}'.format(job.chart_type))(job.data, file_name=job.file_name, title=job.title, **job.options)
+
+    @profiler.timed()
+    def render_batch(self, jobs: list, workers: int=1) -> list:
+        """ Function: Render chart jobs on a process pool, returns per-chart results in job order """
+        start = time.perf_counter()
+        worker_machine = copy(self)
+        worker_machine.show_notice = False
+        worker_machine.incremental = False
+        worker_machine.manifest = dict()
+        worker_machine.pending = dict()
+        worker_machine.rendered = dict()
+
+        # Unchanged Charts Skipping: Decided here, worker copies do not share the manifest
+        results = {i: {'file_name': jobs[i].file_name, 'elapsed': 0, 'error': None, 'reused': True} for i in range(len(jobs)) if self.is_unchanged(jobs[i])}
+        pending_jobs = [i for i in range(len(jobs)) if i not in results]
 
+        # Procedure: Render in-process when there is nothing to parallelize
+        if workers <= 1 or len(pending_jobs) <= 1:
+            outcomes = [render_job(worker_machine, jobs[i]) for i in pending_jobs]
+        else:
+            from concurrent.futures import ProcessPoolExecutor
+
+            with ProcessPoolExecutor(max_workers=min(workers, len(pending_jobs))) as executor:
+                outcomes = list(executor.map(render_job, repeat(worker_machine), [jobs[i] for i in pending_jobs]))
+
+        for i, result in zip(pending_jobs, outcomes):
+            self.rendered.update(result.pop('rendered'))
+            started, pid = result.pop('started'), result.pop('pid')
+            if pid != os.getpid():
+                # Pool Profiling: Worker processes do not share the profiler, their jobs are recorded here
+                profiler.record('render_job:{}'.format(result['file_name']), started, result['elapsed'], pid=pid, tid=pid)
+                profiler.count('charts_written', int(result['error'] is None))
+            result['reused'] = False
+            results[i] = result
+            if result['error'] is None:
+                self.record(result['file_name'], save=False)
+            else:
+                self.pending.pop(result['file_name'], None)
+        if self.incremental and self.chart_dir is not None and len(pending_jobs) > 0:
+            self.save_manifest()
+        results = [results[i] for i in range(len(jobs))]
+
+        # Notice
+        for result in results:
+            if result['reused']:
+                notice('Chart \'{}\' is unchanged.'.format(result['file_name']), show=self.show_notice)
+            elif result['error'] is None:
+                notice('Chart \'{}\' successfully exported in {:.3f}s.'.format(result['file_name'], result['elapsed']), show=self.show_notice)
+            else:
+                error('Chart \'{}\' failed: {}'.format(result['file_name'], result['error']))
+        notice('Rendered {} charts in {:.3f}s.'.format(len(pending_jobs), time.perf_counter() - start), show=self.show_notice)
+
+        return results
+
+    @profiler.timed()
     def render_pie_chart(self, data: list, file_name: str='untitled_chart', title: str=str()):
         """ Function: Render pie chart """
+        if self.is_unchanged(ChartJob('pie_chart', data, file_name=file_name, title=title)):
+            return
+
         # Chart Initialization
+        import pygal
+
         chart = pygal.Pie()
 
         # Chart Data
@@ -47,9 +213,15 @@ class RenderMachine:
         # Finish Chart
         self.finish_chart(chart, file_name=file_name, show_legend=True, title=title)
 
+    @profiler.timed()
     def render_bar_chart(self, data, file_name: str='untitled_chart', title: str=str()):
         """ Function: Render bar chart """
+        if self.is_unchanged(ChartJob('bar_chart', data, file_name=file_name, title=title)):
+            return
+
         # Chart Initialization
+        import pygal
+
         chart = pygal.HorizontalStackedBar()
 
         # Chart Data
@@ -81,22 +253,187 @@ class RenderMachine:
         # Finish Chart
         self.finish_chart(chart, file_name=file_name, show_legend=isinstance(data, dict), title=title)
 
-    def render_treemap(self, data, value: int=0, label: int=1, ignore_value: bool=False, file_name: str='untitled_chart', title: str=str()):
-        """ Function: renders Treemap chart """
+    @profiler.timed()
+    def render_line_chart(self, data: dict, x_labels: list=None, file_name: str='untitled_chart', title: str=str()):
+        """ Function: Render line chart of series name to value list, such as `HistoryStore` time series """
+        if self.is_unchanged(ChartJob('line_chart', data, file_name=file_name, title=title, x_labels=x_labels)):
+            return
+
         # Chart Initialization
+        import pygal
+
+        chart = pygal.Line()
+
+        # Chart Data
+        for series in data:
+            chart.add(str(series), data[series])
+
+        # Chart Labels: At most 12 major x-labels
+        values = [i for series in data for i in data[series] if i is not None]
+        if x_labels is not None:
+            chart.x_labels = x_labels
+            chart.x_label_rotation = 45
+            chart.show_minor_x_labels = False
+            chart.x_labels_major_every = max(ceil(len(x_labels) / 12), 1)
+        if len(values) > 0:
+            chart.y_labels = self.get_y_labels(min(min(values), 0), max(values))
+
+        # Finish Chart
+        self.finish_chart(chart, file_name=file_name, show_legend=len(data) > 1, title=title)
+
+    @profiler.timed()
+    def render_treemap(
+        self,
+        data,
+        value: int=0,
+        label: int=1,
+        ignore_value: bool=False,
+        file_name: str='untitled_chart',
+        title: str=str(),
+        node_budget: int=None,
+        aggregate: str='other',
+        drill_down: bool=False
+    ):
+        """ Function: renders Treemap chart, aggregating small entries once the node budget is exceeded """
+        if aggregate not in ('other', 'score_band'):
+            error('Invalid aggregate `{}` of render_treemap().'.format(aggregate))
+            return None
+
+        if self.is_unchanged(ChartJob(
+            'treemap',
+            data,
+            file_name=file_name,
+            title=title,
+            value=value,
+            label=label,
+            ignore_value=ignore_value,
+            node_budget=node_budget,
+            aggregate=aggregate,
+            drill_down=drill_down
+        )):
+            return
+
+        # Chart Initialization
+        import pygal
+
         chart = pygal.Treemap()
 
         # Chart Data
-        if isinstance(data, list):
-            chart.add('Anime', [{'value': i[value] * (not ignore_value) + ignore_value, 'label': str(i[label])} for i in data])
-        elif isinstance(data, dict):
-            for category in data:
-                chart.add(str(category), [{'value': i[value] * (not ignore_value) + ignore_value, 'label': str(i[label])} for i in data[category]])
+        series = self.get_treemap_series(
+            {'Anime': data} if isinstance(data, list) else data,
+            value=value,
+            label=label,
+            ignore_value=ignore_value,
+            node_budget=node_budget,
+            aggregate=aggregate
+        )
+
+        for category in series:
+            chart.add(category, [{'value': i['value'], 'label': i['label']} for i in series[category]])
 
         # Finish Chart
         self.finish_chart(chart, file_name=file_name, show_legend=isinstance(data, dict), title=title)
 
-    def finish_chart(self, chart: Graph, file_name: str='untitled_chart', show_legend: bool=True, title: str=str()):
+        # Drill-down Charts: One per category
+        if drill_down and isinstance(data, dict):
+            for category in data:
+                self.render_treemap(
+                    data[category],
+                    value=value,
+                    label=label,
+                    ignore_value=ignore_value,
+                    file_name='{}_{}'.format(file_name, ''.join(i for i in str(category).lower().replace(' ', '_') if i.isalnum() or i == '_')),
+                    title='{} ({})'.format(title, category),
+                    node_budget=node_budget,
+                    aggregate=aggregate
+                )
+
+    def get_treemap_series(
+        self,
+        categories: dict,
+        value: int=0,
+        label: int=1,
+        ignore_value: bool=False,
+        node_budget: int=None,
+        aggregate: str='other'
+    ) -> dict:
+        """ Function: Get treemap nodes by category name, at most a node budget of nodes in total """
+        series = {
+            str(category): [{'value': i[value] * (not ignore_value) + ignore_value, 'label': str(i[label]), 'score': i[value]} for i in categories[category]]
+            for category in categories
+        }
+
+        if node_budget is None or sum([len(series[i]) for i in series]) <= node_budget:
+            return series
+
+        # Category Aggregation: Smallest categories merged once there are more categories than the budget
+        if len(series) > node_budget:
+            names = sorted(series, key=lambda i: len(series[i]), reverse=True)
+            rest = [j for i in names[node_budget - 1:] for j in series[i]]
+            series = {i: series[i] for i in names[:node_budget - 1]}
+            series.setdefault('Other', []).extend(rest)
+
+        # Node Aggregation: Budget split among categories by their sizes
+        quotas = self.split_treemap_budget({i: len(series[i]) for i in series}, node_budget)
+
+        return {i: self.aggregate_treemap_nodes(series[i], quotas[i], aggregate) for i in series}
+
+    def split_treemap_budget(self, sizes: dict, node_budget: int) -> dict:
+        """ Function: Split a node budget among categories by their sizes, one node each and the rest by the largest remainders """
+        total = sum(sizes.values())
+        rest = node_budget - len(sizes)
+        quotas = {i: 1 + rest * sizes[i] // total for i in sizes}
+
+        for i in sorted(sizes, key=lambda i: rest * sizes[i] % total, reverse=True)[:node_budget - sum(quotas.values())]:
+            quotas[i] += 1
+
+        return quotas
+
+    def aggregate_treemap_nodes(self, nodes: list, quota: int, aggregate: str='other') -> list:
+        """ Function: Reduce treemap nodes to at most a quota of nodes """
+        if len(nodes) <= quota:
+            return nodes
+
+        # Score Bands: One node per score, adjacent bands of the fewest titles merged while over the quota
+        if aggregate == 'score_band':
+            bands = dict()
+            for i in nodes:
+                if i['score'] not in bands:
+                    bands[i['score']] = {'value': 0, 'count': 0, 'low': i['score'], 'high': i['score']}
+                bands[i['score']]['value'] += i['value']
+                bands[i['score']]['count'] += 1
+
+            bands = [bands[i] for i in sorted(bands)]
+            while len(bands) > quota:
+                i = min(range(len(bands) - 1), key=lambda i: bands[i]['count'] + bands[i + 1]['count'])
+                bands[i:i + 2] = [{
+                    'value': bands[i]['value'] + bands[i + 1]['value'],
+                    'count': bands[i]['count'] + bands[i + 1]['count'],
+                    'low': bands[i]['low'],
+                    'high': bands[i + 1]['high']
+                }]
+
+            return [
+                {
+                    'value': i['value'],
+                    'label': 'Score {} ({} titles)'.format(i['low'] if i['low'] == i['high'] else '{}~{}'.format(i['low'], i['high']), i['count']),
+                    'score': i['low']
+                }
+                for i in sorted(bands, key=lambda i: i['value'], reverse=True)
+            ]
+
+        # Other Bucket: Largest nodes kept, the rest summed
+        nodes = sorted(nodes, key=lambda i: i['value'], reverse=True)
+        kept, rest = nodes[:quota - 1], nodes[quota - 1:]
+
+        return kept + [{
+            'value': sum([i['value'] for i in rest]),
+            'label': 'Other ({} titles)'.format(len(rest)),
+            'score': None
+        }]
+
+    @profiler.timed()
+    def finish_chart(self, chart, file_name: str='untitled_chart', show_legend: bool=True, title: str=str()):
         """ Function: Common chart setup and rendering steps """
         # Chart Titles
         chart.title = title
@@ -106,18 +443,27 @@ class RenderMachine:
         chart.legend_at_bottom = self.legend_at_bottom
         chart.legend_box_size = self.legend_box_size
 
-        # Chart Render
-        chart.style = self.style
-        chart.render_to_file(
-            '{}{}{}.svg'.format(
-                self.chart_dir,
-                '/' * (self.chart_dir[-1] != '/'),
-                file_name.replace('.svg', '')
-            )
-        )
+        # Chart Render: Fixed chart ID keeps the output deterministic
+        chart.style = self.get_style()
+        chart.uuid = str(uuid5(NAMESPACE_URL, file_name))
+        if self.chart_dir is None:
+            self.rendered[file_name] = chart.render(is_unicode=True)
+        else:
+            chart.render_to_file(self.get_file_path(file_name))
+
+        # Fingerprint Recording
+        self.record(file_name)
+        profiler.count('charts_written')
 
         # Notice
-        notice('Chart \'{}\' successfully exported.'.format(file_name))
+        notice('Chart \'{}\' successfully exported.'.format(file_name), show=self.show_notice)
+
+    def get_style(self):
+        """ Function: Get the chart style object, resolving a style name from `pygal.style` """
+        if isinstance(self.style, str):
+            import pygal.style
+            return getattr(pygal.style, self.style)
+        return self.style
 
     def get_y_labels(self, data_min: float, data_max: float):
         """ Function: Calculates y-labels of the chart """
@@ -145,3 +491,25 @@ class RenderMachine:
         data_range.sort()
 
         return data_range
+
+
+def render_job(render_machine: RenderMachine, job: ChartJob) -> dict:
+    """ Render a chart job, collecting its timing, error and in-memory rendered charts """
+    started = time.time()
+    start = time.perf_counter()
+    previous = set(render_machine.rendered)
+
+    try:
+        render_machine.render(job)
+        message = None
+    except Exception as exception:
+        message = '{}: {}'.format(type(exception).__name__, exception)
+
+    return {
+        'file_name': job.file_name,
+        'elapsed': time.perf_counter() - start,
+        'error': message,
+        'started': started,
+        'pid': os.getpid(),
+        'rendered': {i: render_machine.rendered[i] for i in render_machine.rendered if i not in previous}
+    }
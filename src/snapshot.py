@@ -0,0 +1,93 @@
+"""
+    `snapshot.py`
+"""
+
+from hashlib import blake2b, sha1
+
+from src.classes.user import User
+from src.constants import SNAPSHOT_VERSION
+
+import os
+import pickle
+import tempfile
+
+
+class SnapshotStore:
+    """ Parsed user object snapshot store class """
+    def __init__(self, snapshot_dir: str):
+        """ Constructor """
+        self.snapshot_dir = snapshot_dir
+
+        os.makedirs(self.snapshot_dir, exist_ok=True)
+
+    def get_path(self, source_files: list, options: dict=None) -> str:
+        """ Get snapshot file path from its source file paths and the loader options it was parsed with """
+        key = sha1('\n'.join(sorted(os.path.abspath(i) for i in source_files) + [repr(sorted((options or dict()).items()))]).encode()).hexdigest()
+        return os.path.join(self.snapshot_dir, '{}.snapshot'.format(key))
+
+    def get_source_state(self, file_path: str, with_digest: bool=True) -> dict:
+        """ Get size, modification time and content digest of a source file """
+        stat = os.stat(file_path)
+        state = {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'digest': None}
+
+        if with_digest:
+            digest = blake2b(digest_size=16)
+            with open(file_path, 'rb') as file:
+                for chunk in iter(lambda: file.read(1024 ** 2), b''):
+                    digest.update(chunk)
+            state['digest'] = digest.hexdigest()
+
+        return state
+
+    def is_valid(self, header: dict, source_files: list, options: dict=None) -> bool:
+        """ Check whether a snapshot header matches the format version, the loader options and the current source files """
+        if header.get('version') != SNAPSHOT_VERSION:
+            return False
+        if header['options'] != (options or dict()):
+            return False
+        if sorted(header['sources']) != sorted(os.path.abspath(i) for i in source_files):
+            return False
+
+        for file_path in source_files:
+            stored = header['sources'][os.path.abspath(file_path)]
+            current = self.get_source_state(file_path, with_digest=False)
+
+            # Procedure: Unchanged file stats, skip hashing
+            if current['size'] == stored['size'] and current['mtime_ns'] == stored['mtime_ns']:
+                continue
+            # Procedure: Touched but identical content
+            if current['size'] == stored['size'] and self.get_source_state(file_path)['digest'] == stored['digest']:
+                continue
+            return False
+
+        return True
+
+    def load(self, source_files: list, options: dict=None) -> User:
+        """ Load a user object snapshot, returns None if missing, stale, version-mismatched or parsed with other loader options """
+        try:
+            with open(self.get_path(source_files, options=options), 'rb') as file:
+                if not self.is_valid(pickle.load(file), source_files, options=options):
+                    return None
+                return pickle.load(file)
+        except (FileNotFoundError, KeyError, EOFError, AttributeError, ImportError, pickle.UnpicklingError):
+            return None
+
+    def save(self, user: User, source_files: list, options: dict=None) -> None:
+        """ Save a user object snapshot, headed by its format version, loader options and source file states """
+        path = self.get_path(source_files, options=options)
+        header = {
+            'version': SNAPSHOT_VERSION,
+            'options': options or dict(),
+            'sources': {os.path.abspath(i): self.get_source_state(i) for i in source_files}
+        }
+
+        descriptor, temp_path = tempfile.mkstemp(dir=self.snapshot_dir, prefix=os.path.basename(path) + '.', suffix='.tmp')
+
+        try:
+            with os.fdopen(descriptor, 'wb') as file:
+                pickle.dump(header, file, protocol=pickle.HIGHEST_PROTOCOL)
+                pickle.dump(user, file, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temp_path, path)
+        except BaseException:
+            os.remove(temp_path)
+            raise
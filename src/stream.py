@@ -0,0 +1,170 @@
+"""
+    `stream.py`
+"""
+
+from json import JSONDecoder, JSONDecodeError
+
+import codecs
+import re
+import time
+
+
+CHUNK_SIZE = 16 * 1024
+WHITESPACE = re.compile(r'[ \t\n\r]*')
+DELIMITERS = frozenset(' \t\n\r,]')
+SEPARATOR = re.compile(r'[ \t\n\r]*,[ \t\n\r]*')
+
+
+class JSONArrayDecoder:
+    """ Streaming JSON array decoder class, fed with byte chunks of any size, returning each record once its bytes are complete """
+    def __init__(self, encoding: str='utf-8'):
+        """ Constructor """
+        self.decoder = JSONDecoder()
+        self.text_decoder = codecs.getincrementaldecoder(encoding)()
+        self.buffer = ''
+        self.state = 'open'
+
+    def feed(self, chunk: bytes) -> list:
+        """ Decode a chunk, returning the records completed by it """
+        self.buffer += self.text_decoder.decode(chunk)
+        records = list()
+        position = 0
+
+        while self.state != 'closed':
+            position = WHITESPACE.match(self.buffer, position).end()
+            if position == len(self.buffer):
+                break
+            char = self.buffer[position]
+
+            # Array Start
+            if self.state == 'open':
+                if char != '[':
+                    raise JSONDecodeError('Expecting \'[\'', self.buffer, position)
+                self.state = 'first'
+                position += 1
+
+            # Array End or Next Record
+            elif char == ']' and self.state in ('first', 'separator'):
+                self.state = 'closed'
+                position += 1
+            elif self.state == 'separator':
+                if char != ',':
+                    raise JSONDecodeError('Expecting \',\' delimiter', self.buffer, position)
+                self.state = 'record'
+                position += 1
+
+            # Records: Left in the buffer until their closing bytes arrive
+            else:
+                end = self.decode_records(records, position)
+                if end == position:
+                    break
+                position = end
+
+        # Trailing Data: Only whitespace may follow the closed array
+        if self.state == 'closed':
+            self.check_trailing(position)
+            position = len(self.buffer)
+
+        self.buffer = self.buffer[position:]
+
+        return records
+
+    def decode_records(self, records: list, position: int) -> int:
+        """ Decode consecutive complete records starting at a position into `records`, returns the position after the last one """
+        buffer = self.buffer
+        raw_decode = self.decoder.raw_decode
+
+        while True:
+            try:
+                record, end = raw_decode(buffer, position)
+            except JSONDecodeError:
+                return position
+
+            # Exception Case: A number is only complete once followed by a delimiter, it may continue in the next chunk
+            if type(record) is not dict and isinstance(record, (int, float)) and buffer[end:end + 1] not in DELIMITERS:
+                return position
+
+            records.append(record)
+            self.state = 'separator'
+
+            match = SEPARATOR.match(buffer, end)
+            if match is None:
+                return end
+            position = match.end()
+            self.state = 'record'
+
+    def check_trailing(self, position: int) -> None:
+        """ Check that only whitespace follows a position of the buffer, raising a decoding error otherwise """
+        position = WHITESPACE.match(self.buffer, position).end()
+        if position < len(self.buffer):
+            raise JSONDecodeError('Extra data', self.buffer, position)
+
+    def finish(self) -> None:
+        """ Check that the array is complete and followed by whitespace only, raising the decoding error of its incomplete or invalid record otherwise """
+        self.buffer += self.text_decoder.decode(b'', final=True)
+
+        if self.state == 'closed':
+            self.check_trailing(0)
+        else:
+            position = WHITESPACE.match(self.buffer).end()
+            if self.state in ('first', 'record') and position < len(self.buffer):
+                self.decoder.raw_decode(self.buffer, position)
+            raise JSONDecodeError('Unterminated array', self.buffer, len(self.buffer))
+
+
+def decode_array(chunks, convert=None) -> list:
+    """ Decode a JSON array from an iterable of byte chunks, converting each record as soon as it is decoded """
+    decoder = JSONArrayDecoder()
+    records = list()
+
+    for chunk in chunks:
+        if convert is None:
+            records += decoder.feed(chunk)
+        else:
+            records += map(convert, decoder.feed(chunk))
+    decoder.finish()
+
+    return records
+
+
+class CountingReader:
+    """ Readable binary file wrapper class, counting the bytes read and the time spent reading them """
+    def __init__(self, file):
+        """ Constructor """
+        self.file = file
+        self.bytes_read = 0
+        self.elapsed = 0.0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def read(self, size: int=-1) -> bytes:
+        """ Read up to `size` bytes """
+        start = time.perf_counter()
+        data = self.file.read(size)
+        self.elapsed += time.perf_counter() - start
+        self.bytes_read += len(data)
+
+        return data
+
+    def close(self) -> None:
+        """ Close the wrapped file """
+        self.file.close()
+
+
+def open_decompressed(file_path: str):
+    """ Open a file for binary reading, decompressing gzip, bzip2 and xz files by their extension as they are read """
+    if file_path.endswith('.gz'):
+        import gzip
+        return gzip.open(file_path, 'rb')
+    elif file_path.endswith('.bz2'):
+        import bz2
+        return bz2.open(file_path, 'rb')
+    elif file_path.endswith('.xz'):
+        import lzma
+        return lzma.open(file_path, 'rb')
+
+    return open(file_path, 'rb')
@@ -0,0 +1,107 @@
+"""
+    `tags.py`
+"""
+
+from src.classes.entry import Entry
+
+import os
+
+
+compiled_tag_rules = dict()
+
+
+def normalize_tags(tags: str) -> tuple:
+    """ Normalize comma-separated tags into a sorted tuple of lowercase tags """
+    return tuple(sorted([i.lower().strip() for i in tags.split(',')]))
+
+
+def load_tag_rules(file_path: str):
+    """ Load compiled tag rules from a file, recompiling only when the file has changed """
+    stat = os.stat(file_path)
+    key = os.path.abspath(file_path)
+    cached = compiled_tag_rules.get(key)
+
+    if cached is None or cached[0] != (stat.st_mtime_ns, stat.st_size):
+        with open(file_path, 'r') as file:
+            cached = ((stat.st_mtime_ns, stat.st_size), TagRules([normalize_tags(i.replace('\n', str())) for i in file]))
+        compiled_tag_rules[key] = cached
+
+    return cached[1]
+
+
+class TagRules:
+    """ Compiled tag rules class, a hashed set for validation and a trie for explanation """
+    def __init__(self, rules: list):
+        """ Constructor """
+        self.rules = frozenset(rules)
+        self.trie = dict()
+
+        for rule in self.rules:
+            node = self.trie
+            for tag in rule:
+                node = node.setdefault(tag, dict())
+            node[None] = rule
+
+    def __len__(self) -> int:
+        return len(self.rules)
+
+    def __contains__(self, tags: tuple) -> bool:
+        return tags in self.rules
+
+    def explain(self, tags: tuple) -> str:
+        """ Explain why normalized tags match no rule """
+        node = self.trie
+        matched = list()
+
+        for tag in tags:
+            if tag not in node:
+                break
+            node = node[tag]
+            matched.append(tag)
+
+        # Example Rule: First rule continuing the matched prefix
+        example = node
+        while None not in example:
+            example = example[next(iter(example))]
+
+        if len(matched) == 0:
+            return 'no rule starts with \'{}\''.format(tags[0])
+        elif len(matched) == len(tags):
+            return '\'{}\' is only part of rules such as \'{}\''.format(', '.join(tags), ', '.join(example[None]))
+        return 'rules with \'{}\' do not continue with \'{}\', such as \'{}\''.format(', '.join(matched), tags[len(matched)], ', '.join(example[None]))
+
+
+class TagViolation:
+    """ Tag validation violation class """
+    def __init__(self, entry: Entry, reason: str):
+        """ Constructor """
+        self.entry = entry
+        self.reason = reason
+
+
+class TagValidator:
+    """ Tag validator class """
+    def __init__(self, tag_rules: TagRules, must_be_tagged: tuple=(), must_be_untagged: tuple=(), apply_tag_rules: tuple=()):
+        """ Constructor """
+        self.tag_rules = tag_rules
+        self.must_be_tagged = frozenset(must_be_tagged)
+        self.must_be_untagged = frozenset(must_be_untagged)
+        self.apply_tag_rules = frozenset(apply_tag_rules)
+
+    def validate(self, entries: list) -> list:
+        """ Validate entries in a single pass without modifying them, at most one violation per entry """
+        violations = list()
+
+        for entry in entries:
+            tagged = isinstance(entry.my_tags, str) and len(entry.my_tags) > 0
+
+            if not tagged and entry.my_status in self.must_be_tagged:
+                violations.append(TagViolation(entry, 'untagged, but \'{}\' must be tagged'.format(entry.my_status)))
+            elif tagged and entry.my_status in self.must_be_untagged:
+                violations.append(TagViolation(entry, 'tagged, but \'{}\' must be untagged'.format(entry.my_status)))
+            elif isinstance(entry.my_tags, str) and entry.my_status in self.apply_tag_rules and len(self.tag_rules) > 0:
+                tags = normalize_tags(entry.my_tags)
+                if tags not in self.tag_rules:
+                    violations.append(TagViolation(entry, self.tag_rules.explain(tags)))
+
+        return violations
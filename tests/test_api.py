@@ -0,0 +1,109 @@
+"""
+    `tests/test_api.py`
+"""
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from threading import Lock, Thread
+from urllib.parse import parse_qs, urlparse
+
+from requests import HTTPError
+
+from src.loader import APILoader
+
+import json
+import unittest
+
+
+def get_record(list_type: str, i: int) -> dict:
+    """ Get an API record of an anime/manga of an ID """
+    if list_type == 'animelist':
+        return {
+            'anime_id': i, 'anime_title': 'Anime {}'.format(i), 'anime_media_type_string': 'TV', 'anime_num_episodes': 12,
+            'num_watched_episodes': 12, 'start_date_string': None, 'finish_date_string': None, 'score': i % 11,
+            'storage_string': '', 'status': 2, 'tags': '', 'is_rewatching': 0
+        }
+
+    return {
+        'manga_id': i, 'manga_title': 'Manga {}'.format(i), 'manga_num_volumes': 1, 'manga_num_chapters': 9, 'id': i,
+        'num_read_volumes': 1, 'num_read_chapters': 9, 'start_date_string': None, 'finish_date_string': None,
+        'score': i % 11, 'status': 2, 'tags': ''
+    }
+
+
+class PageRequestHandler(BaseHTTPRequestHandler):
+    """ Stub `load.json` request handler class, serving the page sizes or error statuses of the server by offset """
+    def do_GET(self):
+        """ Handle GET requests """
+        url = urlparse(self.path)
+        list_type = url.path.strip('/').split('/')[0]
+        offset = int(parse_qs(url.query)['offset'][0])
+
+        with self.server.lock:
+            self.server.offsets.append((list_type, offset))
+
+        page = self.server.pages.get(offset, 0)
+        if page < 0:
+            self.send_response(-page)
+            self.end_headers()
+            return
+
+        body = json.dumps([get_record(list_type, i) for i in range(offset + 1, offset + page + 1)]).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        """ Silence request logging """
+
+
+class APILoaderTest(unittest.TestCase):
+    """ API loader paging test class """
+    def setUp(self):
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), PageRequestHandler)
+        self.server.pages = dict()
+        self.server.offsets = list()
+        self.server.lock = Lock()
+        Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def load(self, pages: dict) -> APILoader:
+        """ Load both lists from the stub serving the page sizes by offset, negative sizes being error statuses """
+        self.server.pages = pages
+        loader = APILoader('someone', api_url='http://127.0.0.1:{}/{{}}/{{}}/load.json?status=7&offset={{}}'.format(self.server.server_port))
+        loader.create_document()
+
+        return loader
+
+    def test_pages_in_order(self):
+        loader = self.load({0: 300, 300: 300, 600: 300, 900: 300, 1200: 34})
+
+        self.assertEqual([i.series_animedb_id for i in loader.anime_document], list(range(1, 1235)))
+        self.assertEqual([i.manga_mangadb_id for i in loader.manga_document], list(range(1, 1235)))
+
+    def test_stop_at_empty_page(self):
+        loader = self.load({0: 300, 300: 300, 600: 0, 900: 300})
+
+        self.assertEqual([i.series_animedb_id for i in loader.anime_document], list(range(1, 601)))
+        self.assertEqual([i.manga_mangadb_id for i in loader.manga_document], list(range(1, 601)))
+
+    def test_short_page_realigns_offset(self):
+        loader = self.load({0: 300, 300: 150, 450: 300, 750: 300, 1050: 10})
+
+        self.assertEqual([i.series_animedb_id for i in loader.anime_document], list(range(1, 1061)))
+        self.assertIn(('animelist', 450), self.server.offsets)
+        self.assertIn(('animelist', 750), self.server.offsets)
+
+    def test_http_error(self):
+        with self.assertRaises(HTTPError) as context:
+            self.load({0: 300, 300: -500, 600: 300})
+
+        self.assertEqual(context.exception.response.status_code, 500)
+
+
+if __name__ == '__main__':
+    unittest.main()
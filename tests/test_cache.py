@@ -0,0 +1,47 @@
+"""
+    `tests/test_cache.py`
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+
+from src.cache import ResponseCache
+
+import os
+import tempfile
+import unittest
+
+
+class ResponseCacheTest(unittest.TestCase):
+    """ On-disk response cache test class """
+    def test_concurrent_writes(self):
+        with tempfile.TemporaryDirectory() as cache_dir:
+            cache = ResponseCache(cache_dir)
+
+            def store(i):
+                cache.set('animelist', 'someone', 0, body=b'x' * (1000 + i), etag=str(i))
+
+            with ThreadPoolExecutor(max_workers=8) as executor:
+                list(executor.map(store, range(200)))
+
+            entry = cache.get('animelist', 'someone', 0)
+            if entry is not None:
+                self.assertEqual(entry['body'], b'x' * (1000 + int(entry['etag'])))
+            self.assertEqual([i for i in os.listdir(cache_dir) if i.endswith('.tmp')], list())
+
+    def test_mismatched_body(self):
+        with tempfile.TemporaryDirectory() as cache_dir:
+            cache = ResponseCache(cache_dir)
+            cache.set('animelist', 'someone', 0, body=b'first', etag='"first"')
+            self.assertEqual(cache.get('animelist', 'someone', 0)['etag'], '"first"')
+
+            cache.write(cache.get_path('animelist', 'someone', 0) + '.body', b'second')
+            self.assertIsNone(cache.get('animelist', 'someone', 0))
+
+            cache.set('animelist', 'someone', 0, body=b'second', etag='"second"')
+            cache.touch('animelist', 'someone', 0)
+            entry = cache.get('animelist', 'someone', 0)
+            self.assertEqual((entry['body'], entry['etag']), (b'second', '"second"'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,127 @@
+"""
+    `tests/test_columnar_list.py`
+"""
+
+from src.classes.columnar_list import ColumnarList, DictionaryColumn, IntColumn
+from src.classes.entry import Anime
+from src.classes.list import List
+from src.constants import ANIME_FIELDS
+
+import random
+import unittest
+
+
+def get_anime(entry_id: int, generator: random.Random) -> Anime:
+    """ Get a random anime object """
+    values = dict.fromkeys(ANIME_FIELDS)
+    values.update({
+        'series_animedb_id': entry_id,
+        'series_title': 'Title {}'.format(entry_id),
+        'series_type': generator.choice(['TV', 'Movie', 'OVA', None]),
+        'my_score': generator.choice([0, 0, 1, 5, 7, 10]),
+        'my_status': generator.choice(['Watching', 'Completed', 'On-Hold', 'Dropped', 'Plan to Watch']),
+        'my_watched_episodes': generator.choice([None, 0, 3, 300])
+    })
+    return Anime.from_values(values.values())
+
+
+class ColumnarListTest(unittest.TestCase):
+    """ Columnar list against list test class """
+    def setUp(self):
+        generator = random.Random(0)
+        entries = [get_anime(i, generator) for i in range(1, 601)]
+        self.entry_list = List(list(entries), include_current=True, include_dropped=True)
+        self.columnar_list = ColumnarList(list(entries), include_current=True, include_dropped=True)
+
+    def assert_same(self):
+        for include_unscored in (False, True):
+            self.assertEqual(
+                [i.get_values() for i in self.columnar_list.get_list(include_unscored=include_unscored)],
+                [i.get_values() for i in self.entry_list.get_list(include_unscored=include_unscored)]
+            )
+            self.assertEqual(
+                [i.get_values() for i in self.columnar_list.get_full_list(include_unscored=include_unscored)],
+                [i.get_values() for i in self.entry_list.get_full_list(include_unscored=include_unscored)]
+            )
+            self.assertEqual(self.columnar_list.get_scores(include_unscored), self.entry_list.get_scores(include_unscored))
+            for field in ('my_score', 'series_type', 'my_status', 'my_watched_episodes'):
+                self.assertEqual(
+                    self.columnar_list.get_counts(field, include_unscored=include_unscored),
+                    self.entry_list.get_counts(field, include_unscored=include_unscored)
+                )
+
+        for status in ('all', 'completed', 'plan to watch', 'reading'):
+            self.assertEqual(self.columnar_list.count(status), self.entry_list.count(status))
+        self.assertEqual(
+            self.columnar_list.get_grouped_list(disassemble_key=['my_score', 'series_title']),
+            self.entry_list.get_grouped_list(disassemble_key=['my_score', 'series_title'])
+        )
+        self.assertEqual(
+            self.columnar_list.get_grouped_list(group_by=['series_type', 'my_status'], disassemble_key=['series_title']),
+            self.entry_list.get_grouped_list(group_by=['series_type', 'my_status'], disassemble_key=['series_title'])
+        )
+        self.assertEqual(vars(self.columnar_list.summary()), vars(self.entry_list.summary()))
+        for group_by in ('series_type', ['series_type', 'my_status']):
+            self.assertEqual(
+                self.columnar_list.get_summed_grouped_scores(group_by=group_by),
+                self.entry_list.get_summed_grouped_scores(group_by=group_by)
+            )
+
+    def test_aggregations(self):
+        self.assert_same()
+
+    def test_aggregations_after_modifications(self):
+        self.assert_same()
+        generator = random.Random(1)
+
+        for entry_id in generator.sample(range(1, 601), 50):
+            self.entry_list.delete_entry(entry_id)
+            self.columnar_list.delete_entry(entry_id)
+        for entry_id in generator.sample(range(1, 700), 80):
+            entry = get_anime(entry_id, generator)
+            self.entry_list.upsert_entry(entry)
+            self.columnar_list.upsert_entry(entry)
+
+        rebuilt_list = List(list(self.entry_list.data), include_current=True, include_dropped=True)
+        self.assertEqual(
+            self.entry_list.get_grouped_counts(group_by='series_type'),
+            rebuilt_list.get_grouped_counts(group_by='series_type')
+        )
+
+        self.columnar_list.include_onhold = self.entry_list.include_onhold = True
+        self.assert_same()
+
+    def test_from_values(self):
+        generator = random.Random(2)
+        entries = [get_anime(i, generator) for i in range(1, 10001)]
+        columnar_list = ColumnarList.from_values(Anime, (i.get_values() for i in entries), include_current=True)
+        entry_list = List.from_values(Anime, (i.get_values() for i in entries), include_current=True)
+
+        self.assertEqual(columnar_list.count('all'), 10000)
+        self.assertEqual([i.get_values() for i in columnar_list.data], [i.get_values() for i in entries])
+        self.assertEqual([i.get_values() for i in columnar_list.get_list()], [i.get_values() for i in entry_list.get_list()])
+        self.assertEqual(columnar_list.get_entry(5000).get_values(), entries[4999].get_values())
+
+    def test_dictionary_column_widening(self):
+        column = DictionaryColumn()
+        for i in range(600):
+            column.append('value {}'.format(i % 300))
+        column.set(0, 'value 999')
+
+        self.assertEqual(column.codes.typecode, 'I')
+        self.assertIsNone(column.get_byte_codes())
+        self.assertEqual(list(column.iter_values()), ['value 999'] + ['value {}'.format(i % 300) for i in range(1, 600)])
+
+    def test_int_column_nulls(self):
+        column = IntColumn()
+        for i in (1, 2, 3):
+            column.append(i)
+        self.assertEqual(list(column.get_byte_codes()[0]), [1, 2, 3])
+
+        column.append(None)
+        self.assertIsNone(column.get_byte_codes())
+        self.assertEqual(list(column.iter_values()), [1, 2, 3, None])
+
+
+if __name__ == '__main__':
+    unittest.main()
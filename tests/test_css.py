@@ -0,0 +1,47 @@
+"""
+    `tests/test_css.py`
+"""
+
+from src.css import CSSCache
+
+import os
+import tempfile
+import unittest
+
+
+class CSSCacheTest(unittest.TestCase):
+    """ On-disk minified CSS cache test class """
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.cache = CSSCache(os.path.join(self.directory.name, 'cache'))
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def write(self, name: str, data: bytes) -> str:
+        """ Write a source file, returns its path """
+        path = os.path.join(self.directory.name, name)
+        with open(path, 'wb') as file:
+            file.write(data)
+        return path
+
+    def test_reuse(self):
+        source_path = self.write('style.css', b'a {\n    color: red;\n}\n')
+        target_path = os.path.join(self.directory.name, 'style.min.css')
+
+        self.assertFalse(self.cache.minify_file(source_path, target_path)['cached'])
+        self.assertTrue(self.cache.minify_file(source_path, target_path)['cached'])
+        with open(target_path, 'r') as file:
+            self.assertEqual(file.read(), 'a{color:red}')
+        self.assertEqual(sorted(i.rsplit('.', 1)[1] for i in os.listdir(self.cache.cache_dir)), ['css', 'json'])
+
+    def test_failed_minification(self):
+        source_path = self.write('broken.css', b'a { content: "\xff"; }')
+
+        with self.assertRaises(UnicodeDecodeError):
+            self.cache.minify_file(source_path, os.path.join(self.directory.name, 'broken.min.css'))
+        self.assertEqual(os.listdir(self.cache.cache_dir), list())
+
+
+if __name__ == '__main__':
+    unittest.main()
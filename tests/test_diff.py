@@ -0,0 +1,93 @@
+"""
+    `tests/test_diff.py`
+"""
+
+from contextlib import redirect_stdout
+from io import StringIO
+from unittest import mock
+
+from benchmarks.synthetic import get_entries, write_xml_export
+from settings import MANUAL_SORT_ANIME
+from src.classes.columnar_list import ColumnarList
+from src.classes.list import List
+from src.constants import ANIMELIST, MANGALIST
+from src.loader import XMLStreamLoader
+
+import os
+import tempfile
+import unittest
+
+import main
+
+
+def write_exports(data_dir: str, timestamp: int, anime_entries: list, manga_entries: list) -> None:
+    """ Write anime list and manga list XML exports named after a timestamp """
+    with tempfile.TemporaryDirectory() as staging_dir:
+        for list_type, entries in ((ANIMELIST, anime_entries), (MANGALIST, manga_entries)):
+            path = write_xml_export(staging_dir, list_type, entries)
+            os.replace(path, os.path.join(data_dir, os.path.basename(path).replace('1600000000', str(timestamp))))
+
+
+def change_entries(entries: list) -> list:
+    """ Get entries with some removed, some rescored or retyped, and some added """
+    changed = [dict(i) for i in entries[20:]]
+    for i in changed[::7]:
+        i['score'] = 10 - i['score']
+    for i in changed[::11]:
+        i['type'] = 'Music'
+
+    return changed + [dict(i, id=i['id'] + 10000) for i in entries[:5]]
+
+
+class RefreshTest(unittest.TestCase):
+    """ Snapshot refresh by export differences test class """
+    def get_statistics(self, user) -> tuple:
+        """ Get the statistics charts are made of """
+        return (
+            user.info.user_name,
+            sorted(i.get_values() for i in user.anime_list.data),
+            user.anime_list.count('completed'),
+            vars(user.anime_list.summary()),
+            vars(user.manga_list.summary()),
+            user.anime_list.get_summed_grouped_scores(group_by='series_type', manual_sort=MANUAL_SORT_ANIME),
+            user.anime_list.get_summed_grouped_scores(group_by=['series_type', 'my_status'], sort_method='alphabetical')
+        )
+
+    def refresh(self, list_class: type) -> None:
+        with tempfile.TemporaryDirectory() as directory:
+            data_dir = os.path.join(directory, 'data', '')
+            os.makedirs(data_dir)
+            anime_entries, manga_entries = get_entries(ANIMELIST, 300), get_entries(MANGALIST, 100)
+
+            def load(loader):
+                loader.list_class = list_class
+                output = StringIO()
+                with redirect_stdout(output), mock.patch.object(main, 'SNAPSHOT_DIR', os.path.join(directory, 'snapshots')), \
+                        mock.patch.object(main, 'USE_SNAPSHOT_REFRESH', True):
+                    user = main.load_user(loader)
+                return user, output.getvalue()
+
+            write_exports(data_dir, 1600000000, anime_entries, manga_entries)
+            _, output = load(XMLStreamLoader(data_dir))
+            self.assertIn('Data retrieved successfully.', output)
+
+            write_exports(data_dir, 1700000000, change_entries(anime_entries), manga_entries[10:])
+            refreshed, output = load(XMLStreamLoader(data_dir))
+            self.assertIn('Data refreshed from snapshot of the previous exports', output)
+            self.assertGreater(len(refreshed.anime_list.groupings), 0)
+
+            with mock.patch.object(main, 'USE_SNAPSHOTS', False):
+                parsed, output = load(XMLStreamLoader(data_dir))
+            self.assertIn('Data retrieved successfully.', output)
+
+        self.assertEqual(self.get_statistics(refreshed), self.get_statistics(parsed))
+
+    def test_refresh_list(self):
+        self.refresh(List)
+
+    def test_refresh_columnar_list(self):
+        self.refresh(ColumnarList)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,58 @@
+"""
+    `tests/test_history.py`
+"""
+
+from src.classes.entry import Anime
+from src.classes.info import Info
+from src.classes.list import List
+from src.classes.user import User
+from src.constants import ANIME_FIELDS
+from src.history import HistoryStore, normalize_date
+
+import unittest
+
+
+def get_user(scores: list, finish_date: str) -> User:
+    """ Get a user object of an anime list of completed anime of some scores """
+    entries = list()
+    for i, score in enumerate(scores):
+        values = dict.fromkeys(ANIME_FIELDS)
+        values.update({'series_animedb_id': i + 1, 'series_title': 'Title {}'.format(i + 1), 'my_status': 'Completed', 'my_score': score, 'my_finish_date': finish_date})
+        entries.append(Anime.from_values(values.values()))
+
+    return User(info=Info(user_id=1, user_name='someone', user_export_type=1), anime_list=List(entries), manga_list=List(list()))
+
+
+class NormalizeDateTest(unittest.TestCase):
+    """ Export and API date normalization test class """
+    def test_dates(self):
+        self.assertEqual(normalize_date('2020-05-17'), '2020-05-17')
+        self.assertEqual(normalize_date('2020-05-00'), '2020-05-01')
+        self.assertEqual(normalize_date('05-17-20'), '2020-05-17')
+        self.assertEqual(normalize_date('05-17-98'), '1998-05-17')
+
+    def test_unset_dates(self):
+        for value in (None, '', '0000-00-00', '2020-00-00', '00-00-', '-', '2020-05', 'unknown', '05-17-2a'):
+            self.assertIsNone(normalize_date(value), value)
+
+
+class HistoryStoreTest(unittest.TestCase):
+    """ SQLite anime/manga list history store test class """
+    def setUp(self):
+        self.store = HistoryStore(':memory:')
+
+    def tearDown(self):
+        self.store.close()
+
+    def test_ingest_changes(self):
+        first = self.store.ingest(get_user([7, 8], '00-00-'), taken_at='2024-01-01')
+        second = self.store.ingest(get_user([7, 9], '2024-02-03'), taken_at='2024-02-01')
+
+        self.assertEqual(self.store.ingest(get_user([7, 9], '2024-02-03'), taken_at='2024-02-01'), [None, None])
+        self.assertEqual([i[0] for i in self.store.get_snapshots('someone', 'anime')], [first[0], second[0]])
+        self.assertEqual(self.store.get_changes('someone', 'anime'), [('2024-02-01', 2, 'score', '8', '9')])
+        self.assertEqual(self.store.get_monthly_completions('someone', 'anime'), (['2024-02'], {'Completed': [2]}))
+
+
+if __name__ == '__main__':
+    unittest.main()
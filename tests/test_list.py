@@ -0,0 +1,71 @@
+"""
+    `tests/test_list.py`
+"""
+
+from contextlib import redirect_stdout
+
+from settings import MANUAL_SORT_ANIME
+from src.classes.entry import Anime
+from src.classes.list import List
+from src.constants import ANIME_FIELDS
+
+import io
+import unittest
+
+
+def get_anime(entry_id: int, series_type: str, my_status: str, my_score: int) -> Anime:
+    """ Get an anime object of some values """
+    values = dict.fromkeys(ANIME_FIELDS)
+    values.update({'series_animedb_id': entry_id, 'series_type': series_type, 'my_status': my_status, 'my_score': my_score})
+    return Anime.from_values(values.values())
+
+
+class GroupedListTest(unittest.TestCase):
+    """ Grouped anime/manga list test class """
+    def setUp(self):
+        self.entry_list = List([
+            get_anime(1, 'TV', 'Completed', 8),
+            get_anime(2, 'Movie', 'Completed', 7),
+            get_anime(3, 'TV', 'Dropped', 3),
+            get_anime(4, 'OVA', 'Completed', 9),
+            get_anime(5, 'TV', 'Completed', 6)
+        ], include_dropped=True)
+
+    def test_multi_key_manual_sort(self):
+        grouped = self.entry_list.get_summed_grouped_scores(
+            group_by=['series_type', 'my_status'],
+            manual_sort=[MANUAL_SORT_ANIME, ['Dropped', 'Completed']]
+        )
+        self.assertEqual(list(grouped), [('TV', 'Dropped'), ('TV', 'Completed'), ('Movie', 'Completed'), ('OVA', 'Completed')])
+
+    def test_multi_key_flat_manual_sort(self):
+        for manual_sort in (MANUAL_SORT_ANIME, [MANUAL_SORT_ANIME], [MANUAL_SORT_ANIME, 'Completed']):
+            with redirect_stdout(io.StringIO()) as output:
+                self.assertIsNone(self.entry_list.get_grouped_list(group_by=['series_type', 'my_status'], manual_sort=manual_sort))
+                self.assertIsNone(self.entry_list.get_summed_grouped_scores(group_by=['series_type', 'my_status'], manual_sort=manual_sort))
+            self.assertEqual(output.getvalue().count('[ERROR] Invalid manual_sort'), 2)
+
+    def test_single_key_manual_sort(self):
+        grouped = self.entry_list.get_grouped_list(group_by='series_type', manual_sort=MANUAL_SORT_ANIME)
+        self.assertEqual(list(grouped), ['TV', 'Movie', 'OVA'])
+
+
+class ScoreStatisticsTest(unittest.TestCase):
+    """ Anime/manga list score statistics test class """
+    def setUp(self):
+        scores = [7] * 4 + [8] * 6 + [9] * 2 + [10] * 1 + [0] * 3
+        self.entry_list = List([get_anime(i + 1, 'TV', 'Completed', j) for i, j in enumerate(scores)])
+
+    def test_mode(self):
+        self.assertEqual(self.entry_list.get_mode(), 8)
+
+    def test_summary(self):
+        self.assertEqual(self.entry_list.get_summed_scores(), [0, 0, 0, 0, 0, 0, 4, 6, 2, 1])
+        self.assertEqual(self.entry_list.get_min(), 7)
+        self.assertEqual(self.entry_list.get_max(), 10)
+        self.assertEqual(self.entry_list.get_median(), 8)
+        self.assertAlmostEqual(self.entry_list.get_average(), 104 / 13)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,132 @@
+"""
+    `tests/test_loader.py`
+"""
+
+from contextlib import redirect_stdout
+from io import StringIO
+
+from benchmarks.synthetic import write_exports
+from src.constants import ANIME_FIELDS, INFO_FIELDS, MANGA_FIELDS
+from src.loader import XMLLoader, XMLStreamLoader
+
+import bz2
+import gzip
+import lzma
+import os
+import shutil
+import tempfile
+import unittest
+
+
+def load(loader: XMLLoader) -> tuple:
+    """ Load all entries of both exports of a loader, as the user information and the values of every entry """
+    with redirect_stdout(StringIO()):
+        loader.create_document()
+        user = loader.get_user_object(include_current=True, include_onhold=True, include_dropped=True, include_planned=True)
+
+    return vars(user.info), [i.get_values() for i in user.anime_list.data], [i.get_values() for i in user.manga_list.data]
+
+ANIME_EXPORT = """<?xml version="1.0" encoding="UTF-8" ?>
+<myanimelist>
+    <myinfo><user_id>7</user_id><user_name>someone</user_name><user_export_type>1</user_export_type></myinfo>
+    <anime>
+        <series_animedb_id>32281</series_animedb_id><series_title><![CDATA[86]]></series_title><series_type>TV</series_type>
+        <series_episodes>11</series_episodes><my_id>0</my_id><my_watched_episodes>11</my_watched_episodes>
+        <my_start_date>2021-04-11</my_start_date><my_finish_date>0000-00-00</my_finish_date><my_rated></my_rated>
+        <my_score>9</my_score><my_dvd></my_dvd><my_storage></my_storage><my_status>Completed</my_status>
+        <my_comments><![CDATA[]]></my_comments><my_times_watched>0</my_times_watched><my_rewatch_value></my_rewatch_value>
+        <my_tags><![CDATA[action, drama]]></my_tags><my_rewatching>0</my_rewatching><my_rewatching_ep>0</my_rewatching_ep>
+        <update_on_import>0</update_on_import>
+    </anime>
+</myanimelist>
+"""
+
+MANGA_EXPORT = """<?xml version="1.0" encoding="UTF-8" ?>
+<myanimelist>
+    <myinfo><user_id>7</user_id><user_name>someone</user_name><user_export_type>2</user_export_type></myinfo>
+    <manga>
+        <manga_mangadb_id>2</manga_mangadb_id><manga_title><![CDATA[Berserk]]></manga_title><manga_volumes>0</manga_volumes>
+        <manga_chapters>0</manga_chapters><my_id>0</my_id><my_read_volumes>41</my_read_volumes><my_read_chapters>364</my_read_chapters>
+        <my_start_date>2019-01-05</my_start_date><my_finish_date>2020-12-31</my_finish_date>
+        <my_scanalation_group><![CDATA[]]></my_scanalation_group><my_score>10</my_score><my_storage></my_storage>
+        <my_status>Reading</my_status><my_comments><![CDATA[]]></my_comments><my_times_read>0</my_times_read>
+        <my_tags><![CDATA[]]></my_tags><my_reread_value></my_reread_value><update_on_import>1</update_on_import>
+    </manga>
+</myanimelist>
+"""
+
+
+class XMLLoaderTest(unittest.TestCase):
+    """ XML export loader test class """
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.data_dir = write_exports(self.directory.name, 200, 60)['data_dir']
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_dom_and_stream_loaders(self):
+        slow = load(XMLLoader(self.data_dir, fast_extract=False))
+        fast = load(XMLLoader(self.data_dir))
+        stream = load(XMLStreamLoader(self.data_dir))
+
+        self.assertEqual((len(stream[1]), len(stream[2])), (200, 60))
+        self.assertEqual(slow, stream)
+        self.assertEqual(fast, stream)
+
+    def test_compressed_exports(self):
+        expected = load(XMLStreamLoader(self.data_dir))
+
+        for extension, compressed_open in (('.gz', gzip.open), ('.bz2', bz2.open), ('.xz', lzma.open)):
+            compressed_dir = os.path.join(self.directory.name, extension[1:], '')
+            os.makedirs(compressed_dir)
+            for i in os.listdir(self.data_dir):
+                with open(os.path.join(self.data_dir, i), 'rb') as source, compressed_open(os.path.join(compressed_dir, i + extension), 'wb') as target:
+                    shutil.copyfileobj(source, target)
+
+            self.assertEqual(load(XMLLoader(compressed_dir)), expected, extension)
+            self.assertEqual(load(XMLStreamLoader(compressed_dir)), expected, extension)
+
+
+class FieldTypeTest(unittest.TestCase):
+    """ Export field type coercion test class """
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.data_dir = os.path.join(self.directory.name, '')
+        for name, export in (('animelist_1600000000_-_7.xml', ANIME_EXPORT), ('mangalist_1600000000_-_7.xml', MANGA_EXPORT)):
+            with open(os.path.join(self.data_dir, name), 'w', encoding='utf-8') as file:
+                file.write(export)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def assert_types(self, values: dict, fields: dict) -> None:
+        """ Assert the values are of the types of the fields, or None """
+        self.assertEqual(list(values), list(fields))
+        for i in fields:
+            if values[i] is not None:
+                self.assertIs(type(values[i]), fields[i], i)
+
+    def test_field_types(self):
+        for loader in (XMLLoader(self.data_dir), XMLStreamLoader(self.data_dir)):
+            info, (anime,), (manga,) = load(loader)
+            anime = dict(zip(ANIME_FIELDS, anime))
+            manga = dict(zip(MANGA_FIELDS, manga))
+
+            self.assert_types(info, INFO_FIELDS)
+            self.assert_types(anime, ANIME_FIELDS)
+            self.assert_types(manga, MANGA_FIELDS)
+            self.assertEqual(info, {'user_id': 7, 'user_name': 'someone', 'user_export_type': 1})
+
+            self.assertEqual((anime['series_animedb_id'], anime['series_title'], anime['my_score']), (32281, '86', 9))
+            self.assertEqual((anime['my_start_date'], anime['my_finish_date']), ('2021-04-11', '0000-00-00'))
+            self.assertEqual((anime['my_rated'], anime['my_comments'], anime['my_rewatch_value']), (None, None, None))
+            self.assertEqual(anime['my_tags'], 'action, drama')
+
+            self.assertEqual((manga['manga_volumes'], manga['my_read_chapters'], manga['update_on_import']), (0, 364, 1))
+            self.assertEqual((manga['my_start_date'], manga['my_finish_date']), ('2019-01-05', '2020-12-31'))
+            self.assertEqual((manga['my_scanalation_group'], manga['my_tags'], manga['my_reread_value']), (None, None, None))
+
+
+if __name__ == '__main__':
+    unittest.main()
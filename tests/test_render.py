@@ -0,0 +1,88 @@
+"""
+    `tests/test_render.py`
+"""
+
+from unittest import mock
+
+from src.constants import MANIFEST_FILE_NAME, RENDER_VERSION
+from src.render import ChartJob, RenderMachine
+
+import json
+import os
+import tempfile
+import unittest
+
+
+class RenderBatchTest(unittest.TestCase):
+    """ Incremental batch rendering test class """
+    def get_jobs(self) -> list:
+        """ Get chart jobs of two line charts """
+        return [
+            ChartJob('line_chart', {'Completed': [1, 2, 3]}, file_name='first', title='First', x_labels=['a', 'b', 'c']),
+            ChartJob('line_chart', {'Completed': [3, 2, 1]}, file_name='second', title='Second', x_labels=['a', 'b', 'c'])
+        ]
+
+    def render_twice(self, workers: int) -> tuple:
+        """ Render the same jobs on two fresh machines over one chart directory """
+        with tempfile.TemporaryDirectory() as chart_dir:
+            first = RenderMachine(chart_dir, show_notice=False, incremental=True).render_batch(self.get_jobs(), workers=workers)
+            with open(os.path.join(chart_dir, MANIFEST_FILE_NAME), 'r') as file:
+                manifest = json.load(file)
+            second = RenderMachine(chart_dir, show_notice=False, incremental=True).render_batch(self.get_jobs(), workers=workers)
+
+        return first, manifest, second
+
+    def test_reuse_in_process(self):
+        first, manifest, second = self.render_twice(workers=1)
+        self.assertEqual([i['reused'] for i in first], [False, False])
+        self.assertEqual(sorted(manifest), ['first', 'second'])
+        self.assertEqual([i['reused'] for i in second], [True, True])
+
+    def test_reuse_on_pool(self):
+        first, manifest, second = self.render_twice(workers=2)
+        self.assertEqual(sorted(manifest), ['first', 'second'])
+        self.assertEqual([i['reused'] for i in second], [True, True])
+
+    def test_single_changed_chart_on_pool(self):
+        with tempfile.TemporaryDirectory() as chart_dir:
+            RenderMachine(chart_dir, show_notice=False, incremental=True).render_batch(self.get_jobs(), workers=2)
+            jobs = self.get_jobs()
+            jobs[0].data = {'Completed': [5, 5, 5]}
+            RenderMachine(chart_dir, show_notice=False, incremental=True).render_batch(jobs, workers=2)
+            results = RenderMachine(chart_dir, show_notice=False, incremental=True).render_batch(jobs, workers=2)
+
+        self.assertEqual([i['reused'] for i in results], [True, True])
+
+    def test_render_version_change(self):
+        with tempfile.TemporaryDirectory() as chart_dir:
+            RenderMachine(chart_dir, show_notice=False, incremental=True).render_batch(self.get_jobs())
+            with mock.patch('src.render.RENDER_VERSION', RENDER_VERSION + 1):
+                results = RenderMachine(chart_dir, show_notice=False, incremental=True).render_batch(self.get_jobs())
+
+        self.assertEqual([i['reused'] for i in results], [False, False])
+
+
+class TreemapBudgetTest(unittest.TestCase):
+    """ Treemap node budget test class """
+    def setUp(self):
+        self.render_machine = RenderMachine(None, show_notice=False)
+        self.categories = {'Category {}'.format(i): [(j % 10 + 1, 'Title {} {}'.format(i, j)) for j in range(i + 1)] for i in range(60)}
+
+    def test_many_categories(self):
+        for aggregate in ('other', 'score_band'):
+            for node_budget in (1, 7, 40, 59, 60, 61, 500):
+                series = self.render_machine.get_treemap_series(self.categories, node_budget=node_budget, aggregate=aggregate)
+                self.assertLessEqual(sum([len(i) for i in series.values()]), node_budget)
+                self.assertEqual(sum([i['value'] for j in series.values() for i in j]), sum([i[0] for j in self.categories.values() for i in j]))
+
+    def test_score_bands_within_quota(self):
+        nodes = [{'value': i % 10 + 1, 'label': str(i), 'score': i % 10 + 1} for i in range(100)]
+        bands = self.render_machine.aggregate_treemap_nodes(nodes, 4, 'score_band')
+
+        self.assertEqual(len(bands), 4)
+        self.assertEqual(sum([i['value'] for i in bands]), sum([i['value'] for i in nodes]))
+        self.assertTrue(all(i['label'].startswith('Score ') for i in bands))
+
+
+if __name__ == '__main__':
+    unittest.main()
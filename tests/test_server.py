@@ -0,0 +1,121 @@
+"""
+    `tests/test_server.py`
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from http.server import ThreadingHTTPServer
+from threading import Barrier, Thread
+from unittest import mock
+from urllib.error import HTTPError
+from urllib.request import urlopen
+
+from src.loader import APILoader
+
+import json
+import socket
+import time
+import unittest
+
+import script_server
+
+
+def get_closed_url() -> str:
+    """ Get an API URL of a local port nothing listens on """
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        port = sock.getsockname()[1]
+
+    return 'http://127.0.0.1:' + str(port) + '/{}/{}/load.json?offset={}&status=7'
+
+
+class ChartServerTest(unittest.TestCase):
+    """ Chart service request handler test class """
+    def setUp(self):
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), script_server.ChartRequestHandler)
+        self.server.service = script_server.ChartService()
+        Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def get(self, path: str) -> tuple:
+        """ Get the status and JSON body of a request """
+        try:
+            with urlopen('http://127.0.0.1:{}{}'.format(self.server.server_port, path)) as response:
+                return response.status, json.load(response)
+        except HTTPError as exception:
+            return exception.code, json.load(exception)
+
+    def get_latency_count(self, route: str) -> int:
+        """ Get the recorded request count of a route, which is recorded after the response is sent """
+        for _ in range(100):
+            latencies = self.server.service.get_metrics()['latency_ms']
+            if route in latencies:
+                return latencies[route]['count']
+            time.sleep(0.01)
+
+        return 0
+
+    def test_unreachable_api(self):
+        url = get_closed_url()
+        with mock.patch.object(script_server, 'get_api_loader', lambda username: APILoader(username, api_url=url, max_workers=1)):
+            status, body = self.get('/users/someone/stats')
+
+        self.assertEqual(status, 502)
+        self.assertIn('someone', body['error'])
+        self.assertEqual(self.get_latency_count('upstream'), 1)
+
+    def test_not_found(self):
+        status, body = self.get('/nothing')
+        self.assertEqual(status, 404)
+        self.assertEqual(self.get_latency_count('other'), 1)
+
+
+class ChartServiceTest(unittest.TestCase):
+    """ Chart service cache test class """
+    def load_concurrently(self, load) -> list:
+        """ Get one user key from 8 threads at once, as the results or exceptions of every thread """
+        service = script_server.ChartService()
+        barrier = Barrier(8)
+
+        def get():
+            barrier.wait()
+            try:
+                return service.get_user('api:someone', load)
+            except Exception as exception:
+                return exception
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(executor.map(lambda i: get(), range(8)))
+
+        self.assertEqual(service.pending, dict())
+        return results
+
+    def test_single_load(self):
+        calls = list()
+
+        def load():
+            calls.append(None)
+            time.sleep(0.2)
+            return object()
+
+        results = self.load_concurrently(load)
+        self.assertEqual(len(calls), 1)
+        self.assertTrue(all(i is results[0] for i in results))
+
+    def test_failed_load(self):
+        calls = list()
+
+        def load():
+            calls.append(None)
+            time.sleep(0.2)
+            raise ConnectionError('unreachable')
+
+        results = self.load_concurrently(load)
+        self.assertEqual(len(calls), 1)
+        self.assertTrue(all(isinstance(i, ConnectionError) for i in results))
+
+
+if __name__ == '__main__':
+    unittest.main()
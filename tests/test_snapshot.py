@@ -0,0 +1,38 @@
+"""
+    `tests/test_snapshot.py`
+"""
+
+from src.classes.columnar_list import ColumnarList
+from src.classes.list import List
+from src.loader import XMLStreamLoader
+from src.snapshot import SnapshotStore
+
+import os
+import tempfile
+import unittest
+
+
+class SnapshotStoreTest(unittest.TestCase):
+    """ Snapshot store test class """
+    def test_options_mismatch(self):
+        with tempfile.TemporaryDirectory() as directory:
+            source = os.path.join(directory, 'animelist_1_-_1.xml')
+            with open(source, 'w') as file:
+                file.write('<myanimelist></myanimelist>')
+
+            loader = XMLStreamLoader(directory)
+            store = SnapshotStore(os.path.join(directory, 'snapshots'))
+            store.save({'user': 'list'}, [source], options=loader.get_options())
+
+            self.assertEqual(store.load([source], options=loader.get_options()), {'user': 'list'})
+
+            loader.list_class = ColumnarList
+            self.assertIsNone(store.load([source], options=loader.get_options()))
+
+            loader.list_class = List
+            loader.fast_extract = False
+            self.assertIsNone(store.load([source], options=loader.get_options()))
+
+
+if __name__ == '__main__':
+    unittest.main()
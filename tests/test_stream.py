@@ -0,0 +1,34 @@
+"""
+    `tests/test_stream.py`
+"""
+
+from json import JSONDecodeError
+
+from src.stream import decode_array
+
+import json
+import unittest
+
+
+def get_chunks(text: str, size: int) -> list:
+    """ Get the encoded text in chunks of a size """
+    data = text.encode()
+    return [data[i:i + size] for i in range(0, len(data), size)]
+
+
+class DecodeArrayTest(unittest.TestCase):
+    """ Streaming JSON array decoding test class """
+    def test_valid(self):
+        for text in ('[]', ' [ ] \n', '[1, 2.5, -3]', '[{"a": [1, {"b": "]"}]}, "é", null]\r\n'):
+            for size in (1, 2, 7, 1024):
+                self.assertEqual(decode_array(get_chunks(text, size)), json.loads(text))
+
+    def test_invalid(self):
+        for text in ('', '[', '[1,', '[1 2]', '{}', '[1]x', '[1] ]', '[]  [', '[{"a": 1}] 0'):
+            for size in (1, 2, 1024):
+                with self.assertRaises(JSONDecodeError, msg=repr(text)):
+                    decode_array(get_chunks(text, size))
+
+
+if __name__ == '__main__':
+    unittest.main()